@@ -13,6 +13,7 @@ import tempfile
 from pathlib import Path
 
 from gi.repository import Gio
+from src.core import startup_trace
 from src.ipc.server import EventServer
 from src.core.compositor.ipc import IPC
 from src.core.log_setup import setup_logging
@@ -414,8 +415,10 @@ def main():
             except Exception:
                 pass
         check_config_path()
-        ipc_server = start_ipc_server(logger)
-        panel = load_panel(ipc_server)
+        with startup_trace.span("start_ipc_server"):
+            ipc_server = start_ipc_server(logger)
+        with startup_trace.span("load_panel"):
+            panel = load_panel(ipc_server)
         if hasattr(panel, "run_gc_cleanup"):
             panel.run_gc_cleanup()
         return panel.run(["org.waypanel"])
@@ -1,7 +1,10 @@
 import logging
 import os
 import socket
+import threading
+import time
 import typing
+import weakref
 
 from typing import (
     Any,
@@ -15,7 +18,8 @@ from typing import (
 
 from functools import wraps
 
-from gi.repository import GLib  # pyright: ignore
+from src.core.compositor.view_store import ViewStore
+from src.shared.env_helpers import env_number
 
 logger = logging.getLogger(__name__)
 
@@ -23,34 +27,32 @@ logger = logging.getLogger(__name__)
 TypeInput: TypeAlias = Type | list[Type] | tuple[Type, ...]
 
 
-def validate_type(
-    value: Any,
-    expected_type: TypeInput,
-    name: str = "value",
-    allow_none: bool = False,
-    optional: bool = False,
-) -> bool:
+# Set WAYPANEL_IPC_TYPECHECK=0 to skip argument validation of IPC methods.
+TYPE_CHECKING_ENABLED = os.environ.get("WAYPANEL_IPC_TYPECHECK", "1") != "0"
+
+Validator: TypeAlias = Callable[[Any, str], bool]
+
+
+def _accept(value: Any, name: str) -> bool:
+    return True
+
+
+def compile_validator(expected_type: TypeInput, allow_none: bool = False) -> Validator:
     """
-    Validate that the provided value matches the expected type.
+    Build a validator closure for a type hint.
 
-    This implementation uses typing introspection (get_origin, get_args) to
-    robustly handle generic types and unions, ensuring Python 3.14+ compatibility.
+    The hint is inspected once here, so the returned callable only performs
+    the isinstance checks that the hint requires. It raises the same errors
+    as validate_type.
 
     Args:
-        value: The value to validate.
         expected_type: Expected type(s) (e.g., int, list[str], str | None).
-        name: Name/description of the value for error messages.
         allow_none: If True, allows None even if not in Optional.
-        optional: If True, treats as Optional[expected_type].
 
     Returns:
-        bool: True if valid, raises TypeError otherwise.
+        A callable taking (value, name) that returns True or raises TypeError.
     """
     current_type = expected_type
-
-    if optional:
-        allow_none = True
-
     origin = get_origin(current_type)
     args = get_args(current_type)
 
@@ -68,112 +70,204 @@ def validate_type(
         origin = get_origin(current_type)
         args = get_args(current_type)
 
-    if allow_none and value is None:
-        return True
-    if value is None:
-        raise TypeError(f"Invalid {name}: Expected {expected_type}, got None.")
+    check = _compile_checks(expected_type, current_type, origin, args)
 
+    def validator(value: Any, name: str = "value") -> bool:
+        if value is None:
+            if allow_none:
+                return True
+            raise TypeError(f"Invalid {name}: Expected {expected_type}, got None.")
+        return check(value, name)
+
+    return validator
+
+
+def _compile_checks(
+    expected_type: TypeInput, current_type: Any, origin: Any, args: tuple
+) -> Validator:
     if current_type is Any:
-        return True
+        return _accept
 
     if origin is Union:
-        for t in args:
-            try:
-                if validate_type(value, t, name=name, allow_none=False, optional=False):
-                    return True
-            except TypeError:
-                continue
-
+        members = [compile_validator(t) for t in args]
         type_names = ", ".join(t.__name__ for t in args if hasattr(t, "__name__"))
-        raise TypeError(
-            f"Invalid {name}: Expected one of ({type_names}), got {type(value).__name__}"
-        )
 
-    if origin is list or origin is list:
-        if not isinstance(value, list):
+        def check_union(value: Any, name: str) -> bool:
+            for member in members:
+                try:
+                    if member(value, name):
+                        return True
+                except TypeError:
+                    continue
             raise TypeError(
-                f"Invalid {name}: Expected list, got {type(value).__name__}"
+                f"Invalid {name}: Expected one of ({type_names}), got {type(value).__name__}"
             )
 
-        if args:
-            element_type = args[0]
-            for idx, item in enumerate(value):
-                validate_type(item, element_type, name=f"{name}[{idx}]")
-        return True
+        return check_union
 
-    if origin is tuple or origin is tuple:
-        if not isinstance(value, tuple):
-            raise TypeError(
-                f"Invalid {name}: Expected tuple, got {type(value).__name__}"
-            )
+    if origin is list:
+        element = compile_validator(args[0]) if args else None
 
-        if args:
-            if len(args) == 2 and args[1] is Ellipsis:
-                element_type = args[0]
+        def check_list(value: Any, name: str) -> bool:
+            if not isinstance(value, list):
+                raise TypeError(
+                    f"Invalid {name}: Expected list, got {type(value).__name__}"
+                )
+            if element is not None:
                 for idx, item in enumerate(value):
-                    validate_type(item, element_type, name=f"{name}[{idx}]")
-                return True
+                    element(item, f"{name}[{idx}]")
+            return True
+
+        return check_list
+
+    if origin is tuple:
+        if not args:
+            variadic = None
+            members = None
+        elif len(args) == 2 and args[1] is Ellipsis:
+            variadic = compile_validator(args[0])
+            members = None
+        else:
+            variadic = None
+            members = [compile_validator(t) for t in args]
 
-            if len(args) != len(value):
+        def check_tuple(value: Any, name: str) -> bool:
+            if not isinstance(value, tuple):
                 raise TypeError(
-                    f"Length mismatch in {name}: Expected {len(args)} elements, "
-                    f"got {len(value)}"
+                    f"Invalid {name}: Expected tuple, got {type(value).__name__}"
                 )
-            for idx, (item, typ) in enumerate(zip(value, args)):
-                validate_type(item, typ, name=f"{name}[{idx}]")
+            if variadic is not None:
+                for idx, item in enumerate(value):
+                    variadic(item, f"{name}[{idx}]")
+            elif members is not None:
+                if len(members) != len(value):
+                    raise TypeError(
+                        f"Length mismatch in {name}: Expected {len(members)} elements, "
+                        f"got {len(value)}"
+                    )
+                for idx, (item, member) in enumerate(zip(value, members)):
+                    member(item, f"{name}[{idx}]")
             return True
 
-        return True
+        return check_tuple
 
     if isinstance(current_type, list):
-        if not any(isinstance(value, t) for t in current_type):
-            type_names = ", ".join(t.__name__ for t in current_type)
-            raise TypeError(
-                f"Invalid {name}: Expected one of ({type_names}), got {type(value).__name__}"
-            )
-        return True
+        accepted = tuple(current_type)
+        type_names = ", ".join(t.__name__ for t in current_type)
+
+        def check_any_of(value: Any, name: str) -> bool:
+            if not isinstance(value, accepted):
+                raise TypeError(
+                    f"Invalid {name}: Expected one of ({type_names}), got {type(value).__name__}"
+                )
+            return True
+
+        return check_any_of
 
     if isinstance(current_type, tuple):
-        if not isinstance(value, tuple):
+        members = [compile_validator(t) for t in current_type]
+
+        def check_fixed_tuple(value: Any, name: str) -> bool:
+            if not isinstance(value, tuple):
+                raise TypeError(
+                    f"Invalid {name}: Expected tuple, got {type(value).__name__}"
+                )
+            if len(members) != len(value):
+                raise TypeError(
+                    f"Length mismatch in {name}: Expected {len(members)} elements, "
+                    f"got {len(value)}"
+                )
+            for idx, (item, member) in enumerate(zip(value, members)):
+                member(item, f"{name}[{idx}]")
+            return True
+
+        return check_fixed_tuple
+
+    if not isinstance(current_type, type):
+
+        def check_unresolved(value: Any, name: str) -> bool:
             raise TypeError(
-                f"Invalid {name}: Expected tuple, got {type(value).__name__}"
+                f"Invalid type hint: Could not resolve expected type {expected_type} for {name}"
             )
-        if len(current_type) != len(value):
+
+        return check_unresolved
+
+    def check_instance(value: Any, name: str) -> bool:
+        if not isinstance(value, current_type):
             raise TypeError(
-                f"Length mismatch in {name}: Expected {len(current_type)} elements, "
-                f"got {len(value)}"
+                f"Invalid {name}: Expected type {current_type.__name__}, "
+                f"got {type(value).__name__}"
             )
-        for idx, (item, typ) in enumerate(zip(value, current_type)):
-            validate_type(item, typ, name=f"{name}[{idx}]")
         return True
 
-    if not isinstance(current_type, type):
-        raise TypeError(
-            f"Invalid type hint: Could not resolve expected type {expected_type} for {name}"
-        )
+    return check_instance
 
-    if not isinstance(value, current_type):
-        raise TypeError(
-            f"Invalid {name}: Expected type {current_type.__name__}, "
-            f"got {type(value).__name__}"
-        )
 
-    return True
+def validate_type(
+    value: Any,
+    expected_type: TypeInput,
+    name: str = "value",
+    allow_none: bool = False,
+    optional: bool = False,
+) -> bool:
+    """
+    Validate that the provided value matches the expected type.
+
+    This implementation uses typing introspection (get_origin, get_args) to
+    robustly handle generic types and unions, ensuring Python 3.14+ compatibility.
+    For repeated checks against the same hint, use compile_validator instead.
+
+    Args:
+        value: The value to validate.
+        expected_type: Expected type(s) (e.g., int, list[str], str | None).
+        name: Name/description of the value for error messages.
+        allow_none: If True, allows None even if not in Optional.
+        optional: If True, treats as Optional[expected_type].
+
+    Returns:
+        bool: True if valid, raises TypeError otherwise.
+    """
+    return compile_validator(expected_type, allow_none or optional)(value, name)
+
+
+def _compile_signature(func: Callable) -> dict[str, Validator]:
+    try:
+        annotations = typing.get_type_hints(func)
+    except NameError as e:
+        raise RuntimeError(
+            f"Type hints failed to resolve in {func.__name__}: {e}. Ensure type hints are importable or quoted/evaluated."
+        )
+    annotations.pop("return", None)
+    return {
+        name: compile_validator(hint) for name, hint in annotations.items() if hint
+    }
 
 
 def type_checked(func: Callable) -> Callable:
+    """
+    Validate keyword arguments against the annotations of func.
+
+    Validators are compiled once: at decoration time when the hints resolve,
+    otherwise on the first call (e.g. hints naming the class being defined).
+    When TYPE_CHECKING_ENABLED is off, func is returned unwrapped.
+    """
+    if not TYPE_CHECKING_ENABLED:
+        return func
+    try:
+        validators: dict[str, Validator] | None = _compile_signature(func)
+    except RuntimeError:
+        validators = None
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        try:
-            annotations = typing.get_type_hints(func)
-        except NameError as e:
-            raise RuntimeError(
-                f"Type hints failed to resolve in {func.__name__}: {e}. Ensure type hints are importable or quoted/evaluated."
-            )
-        for arg_name, arg_value in kwargs.items():
-            expected_type = annotations.get(arg_name)
-            if expected_type:
-                validate_type(arg_value, expected_type, name=arg_name)
+        nonlocal validators
+        if kwargs:
+            if validators is None:
+                validators = _compile_signature(func)
+            for arg_name, arg_value in kwargs.items():
+                validator = validators.get(arg_name)
+                if validator is not None:
+                    validator(arg_value, arg_name)
         return func(*args, **kwargs)
 
     return wrapper
@@ -191,6 +285,424 @@ def apply_type_checked(cls: type) -> type:
     return cls
 
 
+class _LockedProxy:
+    """
+    Forwards attribute access to a compositor handle, serializing every method
+    call on the owning connection's lock so a request and its response are
+    never interleaved with another thread's traffic on the same socket.
+    """
+
+    def __init__(self, target: Any, lock: threading.RLock):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_lock", lock)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        lock = self._lock
+
+        @wraps(attr)
+        def locked(*args, **kwargs):
+            with lock:
+                return attr(*args, **kwargs)
+
+        # cache the wrapper so later lookups skip __getattr__
+        object.__setattr__(self, name, locked)
+        return locked
+
+    def __bool__(self) -> bool:
+        return self._target is not None
+
+
+class _PooledConnection:
+    """One compositor socket plus the helper objects bound to it."""
+
+    def __init__(self, handles: dict[str, Any]):
+        self.lock = threading.RLock()
+        self.handles = handles
+        self.proxies = {
+            name: _LockedProxy(handle, self.lock) for name, handle in handles.items()
+        }
+        self.users = 0
+        self.dead = False
+        self.last_used = time.monotonic()
+
+    def is_healthy(self) -> bool:
+        sock = self.handles.get("sock")
+        if self.dead or sock is None:
+            return False
+        if not hasattr(sock, "is_connected"):
+            return True
+        # never block a health check behind an in-flight request
+        if not self.lock.acquire(blocking=False):
+            return True
+        try:
+            return bool(sock.is_connected())
+        except Exception:
+            return False
+        finally:
+            self.lock.release()
+
+    def close(self) -> None:
+        self.dead = True
+        sock = self.handles.get("sock")
+        try:
+            if sock is not None and hasattr(sock, "close"):
+                sock.close()
+        except Exception:
+            pass
+
+
+class IPCConnectionPool:
+    """
+    Thread-affine pool of compositor connections.
+
+    Each thread is bound to its own connection while fewer than max_size
+    exist; further threads share the least used connection, with calls
+    serialized on that connection's lock. Connections marked dead by an
+    error or a failed health check are replaced on the next checkout.
+
+    A connection not checked out for idle_ttl seconds, because its threads
+    exited or stopped using IPC, is closed by the next checkout from any
+    thread; a thread still holding it simply opens a new one when it comes
+    back.
+    """
+
+    # seconds between idle sweeps done on checkout
+    SWEEP_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        factory: Callable[[], dict[str, Any] | None],
+        max_size: int,
+        idle_ttl: float = 300.0,
+    ):
+        self._factory = factory
+        self.max_size = max(1, max_size)
+        self.idle_ttl = idle_ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[_PooledConnection] = []
+        self._next_sweep = time.monotonic() + self.SWEEP_INTERVAL
+
+    def acquire(self) -> _PooledConnection | None:
+        """Return the calling thread's connection, opening one if needed."""
+        now = time.monotonic()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and not conn.dead:
+            conn.last_used = now
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.SWEEP_INTERVAL
+            self.evict_idle(now)
+        if conn is not None and not conn.dead:
+            return conn
+        with self._lock:
+            if conn is not None:
+                self._local.finalizer.detach()
+                self._release_locked(conn)
+                self._local.conn = None
+            self._connections = [c for c in self._connections if not c.dead]
+            if len(self._connections) < self.max_size:
+                handles = self._factory()
+                if handles is None:
+                    return None
+                conn = _PooledConnection(handles)
+                self._connections.append(conn)
+            else:
+                conn = min(self._connections, key=lambda c: c.users)
+            conn.users += 1
+            conn.last_used = now
+        self._local.conn = conn
+        # give the slot back once the thread object goes away
+        self._local.finalizer = weakref.finalize(
+            threading.current_thread(), self._release, conn
+        )
+        return conn
+
+    def _release(self, conn: _PooledConnection) -> None:
+        with self._lock:
+            self._release_locked(conn)
+
+    def _release_locked(self, conn: _PooledConnection) -> None:
+        conn.users = max(0, conn.users - 1)
+        if conn.dead and conn.users == 0 and conn in self._connections:
+            self._connections.remove(conn)
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """
+        Close connections not checked out within idle_ttl and return how
+        many were closed. A connection busy with a request is left alone.
+        """
+        if self.idle_ttl <= 0:
+            return 0
+        deadline = (now or time.monotonic()) - self.idle_ttl
+        with self._lock:
+            idle = [c for c in self._connections if c.last_used < deadline]
+        closed = 0
+        for conn in idle:
+            if not conn.lock.acquire(blocking=False):
+                continue
+            try:
+                if conn.last_used < deadline and not conn.dead:
+                    conn.close()
+                    closed += 1
+            finally:
+                conn.lock.release()
+        if closed:
+            logger.debug(f"Closed {closed} idle compositor IPC connection(s).")
+        with self._lock:
+            self._connections = [c for c in self._connections if not c.dead]
+        return closed
+
+    def discard_current(self) -> None:
+        """Mark the calling thread's connection broken so it gets replaced."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+
+    def health_check(self) -> int:
+        """Close unhealthy connections and return how many remain."""
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            if not conn.is_healthy():
+                logger.warning("Dropping unhealthy compositor IPC connection.")
+                conn.close()
+        with self._lock:
+            self._connections = [
+                c for c in self._connections if not c.dead or c.users
+            ]
+            return sum(1 for c in self._connections if not c.dead)
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            conn.close()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "connections": len(self._connections),
+                "users": [c.users for c in self._connections],
+            }
+
+
+# Wayfire requests that can be sent without going through WayfireSocket,
+# keyed by socket method name. Each builder returns the IPC method, its data
+# and the response key the socket helper unwraps (None for the whole reply).
+_WAYFIRE_REQUESTS: dict[str, Callable[..., tuple[str, dict[str, Any], str | None]]] = {
+    "list_views": lambda: ("window-rules/list-views", {}, None),
+    "list_outputs": lambda: ("window-rules/list-outputs", {}, None),
+    "get_view": lambda id: ("window-rules/view-info", {"id": id}, "info"),
+    "get_output": lambda id: ("window-rules/output-info", {"id": id}, None),
+    "get_focused_view": lambda: ("window-rules/get-focused-view", {}, "info"),
+    "get_focused_output": lambda: ("window-rules/get-focused-output", {}, "info"),
+    "get_view_property": lambda view_id, property: (
+        "window-rules/get-view-property",
+        {"id": view_id, "property": property},
+        None,
+    ),
+}
+
+
+def _unwrap(response: Any, key: str | None) -> Any:
+    """Apply a _WAYFIRE_REQUESTS response key to a raw compositor reply."""
+    if isinstance(response, dict) and "error" in response:
+        raise RuntimeError(response["error"])
+    if key is None or not isinstance(response, dict):
+        return response
+    return response.get(key, response)
+
+
+class BatchReply:
+    """Result slot of one batched request, filled in when the batch is flushed."""
+
+    __slots__ = ("_value", "error", "done")
+
+    def __init__(self):
+        self._value: Any = None
+        self.error: Exception | None = None
+        self.done = False
+
+    @property
+    def value(self) -> Any:
+        """The response, or None if the request failed."""
+        if not self.done:
+            raise RuntimeError("Batch reply read before the batch was flushed")
+        return self._value
+
+    def _set(self, value: Any = None, error: Exception | None = None) -> None:
+        self._value = value
+        self.error = error
+        self.done = True
+
+
+class IPCBatch:
+    """
+    Pipelines several compositor requests over the calling thread's pooled
+    connection.
+
+    Requests queued inside the ``with`` block are written to the socket in a
+    single send when the block exits, then the responses are read back in
+    order, so N queries cost one round trip instead of N. The connection lock
+    is held for the whole block, keeping other threads sharing the connection
+    from interleaving with the pipeline.
+
+    Example::
+
+        with ipc.batch() as b:
+            replies = {view_id: b.get_view(view_id) for view_id in ids}
+        views = {view_id: r.value for view_id, r in replies.items()}
+
+    Methods listed in _WAYFIRE_REQUESTS are pipelined; any other socket
+    method, and every method under Sway, runs as an ordinary call at its place
+    in the queue, so results always come back in queue order.
+    """
+
+    _HEADER = 4
+
+    def __init__(self, ipc: "IPC"):
+        self._ipc = ipc
+        self._conn: _PooledConnection | None = None
+        # (reply, message or None, response key or direct call, transform)
+        self._queue: list[tuple[BatchReply, Any, Any, Callable | None]] = []
+
+    def __enter__(self) -> "IPCBatch":
+        self._conn = self._ipc._pool.acquire()
+        if self._conn is not None:
+            self._conn.lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            if self._conn is not None:
+                self._conn.lock.release()
+                self._conn = None
+
+    def call(
+        self, name: str, *args, transform: Callable[[Any], Any] | None = None
+    ) -> BatchReply:
+        """
+        Queue a call to a compositor socket method.
+
+        Args:
+            name: The socket method, e.g. "get_view".
+            *args: Arguments for the method.
+            transform: Optional function applied to the method's result.
+
+        Returns:
+            BatchReply: Holds the result once the batch has been flushed.
+        """
+        reply = BatchReply()
+        sock = self._conn.handles.get("sock") if self._conn is not None else None
+        if sock is None:
+            reply._set(error=ConnectionError("compositor IPC not connected"))
+            return reply
+        request = _WAYFIRE_REQUESTS.get(name)
+        if request is not None and self._ipc.compositor_name == "wayfire":
+            method, data, key = request(*args)
+            message = {"method": method, "data": data}
+            self._queue.append((reply, message, key, transform))
+            return reply
+        self._queue.append((reply, None, lambda: getattr(sock, name)(*args), transform))
+        return reply
+
+    def get_view(self, id: int) -> BatchReply:
+        """Queue a request for the view with the given id."""
+        return self.call("get_view", id)
+
+    def get_view_property(self, view_id: int, property: Any) -> BatchReply:
+        """Queue a request for a view property value."""
+        return self.call(
+            "get_view_property", view_id, property, transform=lambda r: r["value"]
+        )
+
+    def get_output(self, output_id: int) -> BatchReply:
+        """Queue a request for the output with the given id."""
+        return self.call("get_output", output_id)
+
+    def flush(self) -> None:
+        """
+        Send every queued request and read the responses in queue order.
+
+        Each run of consecutive pipelined requests goes out in one write; a
+        direct call in the queue ends the run, so it executes only after the
+        requests queued before it have been answered.
+        """
+        queue, self._queue = self._queue, []
+        run: list[tuple[BatchReply, Any, Any, Callable | None]] = []
+        for entry in queue:
+            if entry[1] is not None:
+                run.append(entry)
+                continue
+            self._send_run(run)
+            run = []
+            reply, _, direct, transform = entry
+            try:
+                value = direct()
+                reply._set(transform(value) if transform else value)
+            except Exception as e:
+                logger.debug(f"Batched IPC request failed: {e}")
+                reply._set(error=e)
+        self._send_run(run)
+
+    def _send_run(self, run: list[tuple[BatchReply, Any, Any, Callable | None]]) -> None:
+        if not run:
+            return
+        import orjson
+
+        client = self._conn.handles["sock"].client  # pyright: ignore
+        try:
+            frames = []
+            for _, message, _, _ in run:
+                body = orjson.dumps(message)
+                frames.append(len(body).to_bytes(self._HEADER, "little") + body)
+            client.sendall(b"".join(frames))
+            responses = self._read_responses(client, len(run))
+        except (OSError, ValueError) as e:
+            logger.error(f"IPC batch of {len(run)} requests failed: {e}")
+            self._ipc.is_compositor_socket_set_up = False
+            self._ipc._pool.discard_current()
+            for reply, _, _, _ in run:
+                reply._set(error=e)
+            return
+        for (reply, _, key, transform), response in zip(run, responses):
+            try:
+                value = _unwrap(response, key)
+                reply._set(transform(value) if transform else value)
+            except Exception as e:
+                logger.debug(f"Batched IPC request failed: {e}")
+                reply._set(error=e)
+
+    def _read_responses(self, client: socket.socket, count: int) -> list[Any]:
+        import orjson
+
+        buffer = bytearray()
+        responses = []
+        offset = 0
+        while len(responses) < count:
+            if len(buffer) - offset >= self._HEADER:
+                size = int.from_bytes(
+                    buffer[offset : offset + self._HEADER], "little"
+                )
+                start = offset + self._HEADER
+                if len(buffer) - start >= size:
+                    responses.append(orjson.loads(buffer[start : start + size]))
+                    offset = start + size
+                    continue
+            chunk = client.recv(65536)
+            if not chunk:
+                raise ConnectionResetError("compositor closed the IPC socket")
+            buffer += chunk
+        return responses
+
+
 def handle_ipc_error(func):
     @wraps(func)
     def wrapper(self, *args, **kwargs):
@@ -199,7 +711,7 @@ def handle_ipc_error(func):
         except (socket.error, ConnectionRefusedError, BrokenPipeError) as e:
             logger.error(f"IPC connection error in '{func.__name__}': {e}")
             self.is_compositor_socket_set_up = False
-            self.sock = None
+            self._pool.discard_current()
             return None
         except Exception as e:
             logger.error(f"An unexpected error occurred in '{func.__name__}': {e}")
@@ -219,67 +731,133 @@ class IPC:
     the running compositor and uses the appropriate backend.
     """
 
-    def __init__(self):
+    def __init__(self, pool_size: int | None = None):
         """
-        Initializes the IPC instance. It detects the compositor and establishes
-        the connection. A GLib timeout is set to ensure the connection remains active.
+        Initializes the IPC instance. It detects the compositor and sets up a
+        pool of connections, one per calling thread up to pool_size, so
+        concurrent callers never interleave requests on a shared socket.
+        Broken connections are replaced on the next checkout after an error,
+        so no periodic health check is needed.
         """
+        if pool_size is None:
+            pool_size = env_number("WAYPANEL_IPC_POOL_SIZE", 8, int)
+        self.is_compositor_socket_set_up = False
+        self._pool = IPCConnectionPool(
+            self._open_connection,
+            pool_size,
+            idle_ttl=env_number("WAYPANEL_IPC_POOL_IDLE_TTL", 300.0, float),
+        )
+        # event-fed mirror serving view lookups once attached to the EventServer
+        self.views = ViewStore(self)
         self.compositor_name = self.setup_compositor_socket()
-        GLib.timeout_add(1000, self.ensure_ipc_connection)
 
     def setup_compositor_socket(self):
         """
         Determines the active compositor (Wayfire or Sway) based on environment
-        variables and initializes the corresponding IPC socket object.
+        variables and opens the calling thread's connection.
         """
         if os.getenv("WAYFIRE_SOCKET"):
-            self.connect_wayfire_ipc()
-            return "wayfire"
-        if os.getenv("SWAYSOCK"):
-            self.connect_sway_ipc()
-            return "sway"
+            self.compositor_name = "wayfire"
+        elif os.getenv("SWAYSOCK"):
+            self.compositor_name = "sway"
+        else:
+            return None
+        self._pool.acquire()
+        return self.compositor_name
+
+    def _open_connection(self):
+        """Pool factory: open one compositor connection and its helpers."""
+        if self.compositor_name == "wayfire":
+            return self.connect_wayfire_ipc()
+        if self.compositor_name == "sway":
+            return self.connect_sway_ipc()
         return None
 
     def connect_wayfire_ipc(self):
-        """Initializes the connection to the Wayfire IPC socket."""
+        """Opens a new connection to the Wayfire IPC socket."""
         try:
             from wayfire.core.template import get_msg_template
             from wayfire import WayfireSocket
             from wayfire.extra.ipc_utils import WayfireUtils
             from wayfire.extra.stipc import Stipc
 
-            self.sock = WayfireSocket()
-            self.wf_utils = WayfireUtils(self.sock)
-            self.stipc = Stipc(self.sock)
-            self.is_compositor_socket_set_up = True
+            sock = WayfireSocket()
             self.get_msg_template = get_msg_template
+            self.is_compositor_socket_set_up = True
+            return {
+                "sock": sock,
+                "wf_utils": WayfireUtils(sock),
+                "stipc": Stipc(sock),
+            }
         except Exception as e:
             logger.error(f"Failed to connect to Wayfire IPC: {e}")
-            self.sock = None
             self.is_compositor_socket_set_up = False
+            return None
 
     def connect_sway_ipc(self):
-        """Initializes the connection to the Sway IPC socket."""
+        """Opens a new connection to the Sway IPC socket."""
         try:
             from pysway.ipc import SwayIPC
             from pysway.extra.utils import SwayUtils
 
-            self.sock = SwayIPC()
-            self.utils = SwayUtils(self.sock)
+            sock = SwayIPC()
+            return {"sock": sock, "utils": SwayUtils(sock)}
         except Exception as e:
             logger.error(f"Failed to connect to Sway IPC: {e}")
-            self.sock = None
+            return None
+
+    def _handle(self, name: str) -> Any:
+        conn = self._pool.acquire()
+        if conn is None:
+            return None
+        return conn.proxies.get(name)
+
+    @property
+    def sock(self) -> Any:
+        """The calling thread's compositor socket."""
+        return self._handle("sock")
+
+    @property
+    def wf_utils(self) -> Any:
+        """WayfireUtils bound to the calling thread's connection."""
+        return self._handle("wf_utils")
+
+    @property
+    def stipc(self) -> Any:
+        """Stipc bound to the calling thread's connection."""
+        return self._handle("stipc")
+
+    @property
+    def utils(self) -> Any:
+        """SwayUtils bound to the calling thread's connection."""
+        return self._handle("utils")
 
     def ensure_ipc_connection(self):
         """
-        Periodically checks if the IPC connection is active. If not, it attempts
-        to re-establish the connection.
+        Health-checks the pooled connections, dropping dead ones so they are
+        reopened on next use. Called when the compositor event stream
+        reconnects, since a compositor restart breaks every pooled socket.
         """
-        if not self.sock or not self.is_connected():
-            logger.warning("Attempting to re-establish IPC connection...")
+        if self.compositor_name is None:
             self.setup_compositor_socket()
+        elif self._pool.health_check() == 0:
+            logger.warning("Attempting to re-establish IPC connection...")
+            self._pool.acquire()
         return True
 
+    def batch(self) -> IPCBatch:
+        """
+        Start a pipelined batch of requests on the calling thread's connection.
+
+        Returns:
+            IPCBatch: A context manager; see IPCBatch for usage.
+        """
+        return IPCBatch(self)
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Return the size and per-connection user counts of the pool."""
+        return self._pool.stats()
+
     def is_view_valid(self, view_id) -> bool:
         """check if the view is a valid toplevel"""
         filtered_view_ids = [item["id"] for item in self.wf_utils.list_filtered_views()]
@@ -332,8 +910,17 @@ class IPC:
         return self.stipc.press_key(key, timeout)
 
     @handle_ipc_error
-    def get_view(self, id: int) -> dict[str, Any] | None:
-        """Get the view by the given id."""
+    def get_view(self, id: int, fresh: bool = False) -> dict[str, Any] | None:
+        """
+        Get the view by the given id.
+
+        Served from the view store when it is live; pass fresh=True to always
+        query the compositor.
+        """
+        if not fresh and self.views.ready():
+            view = self.views.get_view(id)
+            if view is not None:
+                return view
         return self.sock.get_view(id)  # pyright: ignore
 
     @handle_ipc_error
@@ -370,13 +957,27 @@ class IPC:
         return self.sock.get_focused_output()  # pyright: ignore
 
     @handle_ipc_error
-    def get_focused_view(self) -> dict[str, Any] | None:
-        """Get the currently focused view."""
+    def get_focused_view(self, fresh: bool = False) -> dict[str, Any] | None:
+        """
+        Get the currently focused view.
+
+        Served from the view store when it is live; pass fresh=True to always
+        query the compositor.
+        """
+        if not fresh and self.views.ready():
+            return self.views.get_focused_view()
         return self.sock.get_focused_view()  # pyright: ignore
 
     @handle_ipc_error
-    def list_views(self) -> list[dict[str, Any]]:
-        """List all views managed by the compositor."""
+    def list_views(self, fresh: bool = False) -> list[dict[str, Any]]:
+        """
+        List all views managed by the compositor.
+
+        Served from the view store when it is live; pass fresh=True to always
+        query the compositor.
+        """
+        if not fresh and self.views.ready():
+            return self.views.list_views()
         return self.sock.list_views()  # pyright: ignore
 
     @handle_ipc_error
@@ -397,8 +998,8 @@ class IPC:
 
     @handle_ipc_error
     def close(self) -> Any:
-        """Close the compositor socket connection."""
-        return self.sock.close()  # pyright: ignore
+        """Close every pooled compositor socket connection."""
+        return self._pool.close_all()
 
     @handle_ipc_error
     def set_workspace(self, x: int, y: int, view_id: int | None = None) -> Any:
@@ -462,8 +1063,15 @@ class IPC:
         return self.wf_utils.center_cursor_on_view(view_id)  # pyright: ignore
 
     @handle_ipc_error
-    def get_views_from_active_workspace(self):
-        """Get all views on the currently active workspace."""
+    def get_views_from_active_workspace(self, fresh: bool = False):
+        """
+        Get all views on the currently active workspace.
+
+        Served from the view store when it is live; pass fresh=True to always
+        query the compositor.
+        """
+        if not fresh and self.views.ready():
+            return self.views.get_views_from_active_workspace()
         return self.wf_utils.get_views_from_active_workspace()  # pyright: ignore
 
     @handle_ipc_error
@@ -812,3 +1420,288 @@ class IPC:
         inter_width = max(0, inter_end_x - inter_start_x)
         inter_height = max(0, inter_end_y - inter_start_y)
         return inter_width * inter_height
+
+
+class _AsyncConnection:
+    """
+    One AsyncIPC socket: its writer, the futures awaiting replies in send
+    order and the reader task resolving them. The reader task only touches
+    its own connection, so a connection replaced after a loop change cannot
+    fail or close its successor.
+    """
+
+    __slots__ = ("writer", "pending", "task", "closed")
+
+    def __init__(self, writer: Any):
+        import collections
+
+        self.writer = writer
+        self.pending: Any = collections.deque()
+        self.task: Any = None
+        self.closed = False
+
+    def fail_pending(self, error: Exception) -> None:
+        pending = self.pending
+        while pending:
+            future = pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+
+    def close(self) -> None:
+        """Stop the reader task, which closes the writer on its own loop."""
+        self.closed = True
+        task = self.task
+        if task is None or task.done():
+            return
+        import asyncio
+
+        task_loop = task.get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if task_loop is running:
+            task.cancel()
+        elif not task_loop.is_closed():
+            task_loop.call_soon_threadsafe(task.cancel)
+        else:
+            try:
+                self.writer.close()
+            except Exception:
+                pass
+
+
+class AsyncIPC:
+    """
+    Awaitable facade over the compositor IPC for code running on an asyncio loop.
+
+    Common Wayfire requests are sent over a non-blocking socket owned by the
+    calling loop. Requests are pipelined: each one is written immediately and
+    its future is resolved by a single reader task in send order, which is
+    the order Wayfire replies in. Any other IPC method, and every method when
+    running under Sway, is still available as a coroutine and falls back to
+    the synchronous IPC in a worker thread.
+    """
+
+    _HEADER = 4
+
+    def __init__(self, ipc: IPC):
+        """
+        Args:
+            ipc: The synchronous IPC instance used for compositor detection and
+                as fallback for requests without a native async path.
+        """
+        self._ipc = ipc
+        self._loop: Any = None
+        self._conn: _AsyncConnection | None = None
+        self._connect_lock: Any = None
+
+    @property
+    def compositor_name(self) -> str | None:
+        return self._ipc.compositor_name
+
+    async def _ensure_connection(self) -> _AsyncConnection:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        conn = self._conn
+        if conn is not None and not conn.closed and self._loop is loop:
+            return conn
+        if self._loop is not loop:
+            self._drop_connection()
+            self._loop = loop
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            conn = self._conn
+            if conn is not None and not conn.closed:
+                return conn
+            reader, writer = await asyncio.open_unix_connection(
+                os.environ["WAYFIRE_SOCKET"]
+            )
+            conn = _AsyncConnection(writer)
+            conn.task = loop.create_task(self._read_responses(reader, conn))
+            self._conn = conn
+            return conn
+
+    async def _read_responses(self, reader, conn: _AsyncConnection) -> None:
+        import asyncio
+        import orjson
+
+        try:
+            while True:
+                header = await reader.readexactly(self._HEADER)
+                body = await reader.readexactly(int.from_bytes(header, "little"))
+                future = conn.pending.popleft()
+                if not future.done():
+                    future.set_result(orjson.loads(body))
+        except (asyncio.IncompleteReadError, OSError, ValueError, IndexError) as e:
+            logger.error(f"Async IPC connection lost: {e}")
+        except asyncio.CancelledError:
+            pass
+        finally:
+            conn.closed = True
+            conn.fail_pending(ConnectionResetError("compositor IPC closed"))
+            try:
+                conn.writer.close()
+            except Exception:
+                pass
+
+    def _drop_connection(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+    def _send(self, conn: _AsyncConnection, payload: dict[str, Any]) -> Any:
+        """Write one request and return the future of its response."""
+        import orjson
+
+        if conn.closed:
+            raise ConnectionResetError("compositor IPC closed")
+        body = orjson.dumps(payload)
+        future = self._loop.create_future()
+        conn.pending.append(future)
+        conn.writer.write(len(body).to_bytes(self._HEADER, "little") + body)
+        return future
+
+    async def request(self, method: str, data: dict[str, Any] | None = None) -> Any:
+        """
+        Send a raw Wayfire IPC request and await its response.
+
+        Args:
+            method: The Wayfire IPC method, e.g. "window-rules/list-views".
+            data: The request data object.
+
+        Returns:
+            The decoded JSON response.
+
+        Raises:
+            RuntimeError: If the error field of the response is set.
+        """
+        conn = await self._ensure_connection()
+        response = await self._send(conn, {"method": method, "data": data or {}})
+        if isinstance(response, dict) and "error" in response:
+            raise RuntimeError(f"{method}: {response['error']}")
+        return response
+
+    async def _call(self, name: str, *args, **kwargs) -> Any:
+        import asyncio
+
+        return await asyncio.to_thread(getattr(self._ipc, name), *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or not callable(getattr(self._ipc, name, None)):
+            raise AttributeError(name)
+
+        async def fallback(*args, **kwargs):
+            return await self._call(name, *args, **kwargs)
+
+        fallback.__name__ = name
+        return fallback
+
+    async def _native(
+        self, name: str, method: str, data: dict[str, Any], key: str | None, *args
+    ) -> Any:
+        if self.compositor_name != "wayfire":
+            return await self._call(name, *args)
+        try:
+            response = await self.request(method, data)
+        except (OSError, RuntimeError) as e:
+            logger.error(f"An unexpected error occurred in '{name}': {e}")
+            return None
+        return response.get(key) if key and isinstance(response, dict) else response
+
+    async def list_views(self) -> list[dict[str, Any]]:
+        """List all views managed by the compositor."""
+        return await self._native("list_views", "window-rules/list-views", {}, None)
+
+    async def get_view(self, id: int) -> dict[str, Any] | None:
+        """Get the view by the given id."""
+        return await self._native(
+            "get_view", "window-rules/view-info", {"id": id}, "info", id
+        )
+
+    async def get_view_property(self, view_id: int, property: Any) -> Any:
+        """Get the view property"""
+        if self.compositor_name != "wayfire":
+            return await self._call("get_view_property", view_id, property)
+        method, data, key = _WAYFIRE_REQUESTS["get_view_property"](view_id, property)
+        try:
+            return _unwrap(await self.request(method, data), key)["value"]
+        except Exception as e:
+            return {"result": e, "value": None}
+
+    async def get_focused_view(self) -> dict[str, Any] | None:
+        """Get the currently focused view."""
+        return await self._native(
+            "get_focused_view", "window-rules/get-focused-view", {}, "info"
+        )
+
+    async def get_focused_output(self) -> dict[str, Any] | None:
+        """Get the currently focused output."""
+        return await self._native(
+            "get_focused_output", "window-rules/get-focused-output", {}, "info"
+        )
+
+    async def list_outputs(self) -> list[dict[str, Any]] | None:
+        """List all outputs connected to the compositor."""
+        return await self._native(
+            "list_outputs", "window-rules/list-outputs", {}, None
+        )
+
+    async def get_output(self, output_id: int) -> dict[str, Any] | None:
+        """Get detailed information about a specific output."""
+        return await self._native(
+            "get_output",
+            "window-rules/output-info",
+            {"id": output_id},
+            None,
+            output_id,
+        )
+
+    async def set_focus(self, view_id: int) -> Any:
+        """Set focus to the specified view."""
+        return await self._native(
+            "set_focus", "window-rules/focus-view", {"id": view_id}, None, view_id
+        )
+
+    async def set_view_minimized(self, view_id: int, state: bool) -> Any:
+        """Set the minimized state of a view."""
+        return await self._native(
+            "set_view_minimized",
+            "wm-actions/set-minimized",
+            {"view_id": view_id, "state": state},
+            None,
+            view_id,
+            state,
+        )
+
+    async def get_option_value(self, option_name: str) -> Any:
+        """Retrieve the value of a specific Wayfire option."""
+        return await self._native(
+            "get_option_value",
+            "wayfire/get-config-option",
+            {"option": option_name},
+            None,
+            option_name,
+        )
+
+    async def set_option_values(self, values: dict[str, Any]) -> Any:
+        """Set multiple Wayfire option values."""
+        if self.compositor_name != "wayfire":
+            return await self._call("set_option_values", values)
+        # same shape as the synchronous client: "section/option" keys, with
+        # {"section": {"option": value}} entries flattened
+        data = {}
+        for name, value in values.items():
+            if "/" in name or not isinstance(value, dict):
+                data[name] = value
+            else:
+                for option, option_value in value.items():
+                    data[f"{name}/{option}"] = option_value
+        return await self._native(
+            "set_option_values", "wayfire/set-config-options", data, None, values
+        )
+
+    async def close(self) -> None:
+        """Close the async compositor connection."""
+        self._drop_connection()
@@ -0,0 +1,480 @@
+import logging
+import threading
+from typing import Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+# events whose payload carries the complete, current view info
+VIEW_UPDATE_EVENTS = frozenset(
+    (
+        "view-mapped",
+        "view-focused",
+        "view-title-changed",
+        "view-app-id-changed",
+        "view-geometry-changed",
+        "view-set-output",
+        "view-wset-changed",
+        "view-workspace-changed",
+        "view-minimized",
+        "view-fullscreen",
+        "view-tiled",
+        "view-sticky",
+    )
+)
+VIEW_REMOVE_EVENTS = frozenset(("view-unmapped", "view-closed"))
+# events after which derived state (outputs) is re-read
+RESEED_EVENTS = frozenset(
+    (
+        "output-added",
+        "output-removed",
+        "output-wset-changed",
+    )
+)
+# view fields whose change is reported by a resync, and the event reporting it
+RESYNC_FIELD_EVENTS = (
+    ("app-id", "view-app-id-changed"),
+    ("title", "view-title-changed"),
+    ("output-id", "view-set-output"),
+    ("minimized", "view-minimized"),
+    ("fullscreen", "view-fullscreen"),
+)
+
+
+class ViewStore:
+    """
+    In-memory mirror of the compositor's views and outputs.
+
+    The store is seeded from list_views/list_outputs and then kept current by
+    the compositor event stream, so lookups by id, app-id, pid, output or
+    workspace are dictionary reads instead of IPC round trips. It only serves
+    reads while attached to a running EventServer whose compositor stream is
+    connected; otherwise ready() is False and callers query the compositor.
+
+    Events are applied on the IPC server thread and reads happen on any
+    thread, so all state is guarded by one lock. Lookups return shallow
+    copies of the mirrored dicts. Seeding queries the compositor without
+    holding the lock; events arriving meanwhile are buffered and applied on
+    top of the snapshot once it is swapped in.
+
+    Only Wayfire is mirrored; Sway events are translated to a different view
+    shape and are ignored.
+    """
+
+    def __init__(self, ipc):
+        """
+        Args:
+            ipc: The IPC instance used to seed the store.
+        """
+        self._ipc = ipc
+        self._lock = threading.RLock()
+        self._server = None
+        self._stale = True
+        # events received while a seed is reading the compositor, else None
+        self._buffer: list[dict[str, Any]] | None = None
+        # notified whenever a seed finishes and _buffer goes back to None
+        self._seed_done = threading.Condition(self._lock)
+        self.views: dict[int, dict[str, Any]] = {}
+        self.outputs: dict[int, dict[str, Any]] = {}
+        self.focused_view_id: int | None = None
+        self.focused_output_id: int | None = None
+        self.by_app_id: dict[str, set[int]] = {}
+        self.by_pid: dict[int, set[int]] = {}
+        self.by_output: dict[int, set[int]] = {}
+        self.by_workspace: dict[tuple[int, int, int], set[int]] = {}
+        # the workspace key each view was indexed under
+        self._view_workspace: dict[int, tuple[int, int, int]] = {}
+        self.seeds = 0
+
+    def attach(self, ipc_server) -> None:
+        """
+        Start following the event stream of an EventServer.
+
+        Args:
+            ipc_server: The EventServer instance; its batch listeners run on
+                the server thread before events reach any other consumer.
+        """
+        if ipc_server is None or not hasattr(ipc_server, "add_batch_listener"):
+            return
+        self._server = ipc_server
+        ipc_server.add_batch_listener(self.apply_batch)
+        if hasattr(ipc_server, "add_resync_provider"):
+            ipc_server.add_resync_provider(self.resync)
+
+    def detach(self) -> None:
+        """Stop following the event stream and drop the mirrored state."""
+        if self._server is not None:
+            self._server.remove_batch_listener(self.apply_batch)
+            if hasattr(self._server, "remove_resync_provider"):
+                self._server.remove_resync_provider(self.resync)
+            self._server = None
+        with self._lock:
+            self._stale = True
+
+    def ready(self) -> bool:
+        """
+        Whether lookups can be served from the mirror.
+
+        Re-seeds the store first if it was invalidated.
+        """
+        if self._server is None or self._ipc.compositor_name != "wayfire":
+            return False
+        if not self._server.is_socket_active():
+            # events are being missed; re-read everything once reconnected
+            with self._lock:
+                self._stale = True
+            return False
+        with self._lock:
+            if not self._stale:
+                return True
+            if self._buffer is not None:
+                # another thread is seeding; query the compositor meanwhile
+                return False
+            self._buffer = []
+        return self._seed()
+
+    def invalidate(self) -> None:
+        """Force a re-seed before the next lookup."""
+        with self._lock:
+            self._stale = True
+
+    def _seed(self) -> bool:
+        """
+        Read a snapshot without holding the lock, so event batches are not
+        held up by the round trips, then swap it in and apply the events
+        buffered meanwhile. The caller must have set _buffer.
+        """
+        try:
+            snapshot = self._snapshot()
+        except Exception as e:
+            logger.warning(f"Could not seed the view store: {e}")
+            snapshot = None
+        with self._lock:
+            buffered, self._buffer = self._buffer, None
+            self._seed_done.notify_all()
+            if snapshot is None:
+                return False
+            self._install(*snapshot)
+            for event in buffered or ():
+                self.apply(event)
+            return not self._stale
+
+    def _snapshot(self) -> tuple | None:
+        with self._ipc.batch() as batch:
+            views = batch.call("list_views")
+            outputs = batch.call("list_outputs")
+            focused_view = batch.call("get_focused_view")
+            focused_output = batch.call("get_focused_output")
+        if views.error or outputs.error:
+            logger.warning(
+                f"Could not seed the view store: {views.error or outputs.error}"
+            )
+            return None
+        return (
+            views.value or (),
+            outputs.value or (),
+            (focused_view.value or {}).get("id"),
+            (focused_output.value or {}).get("id"),
+        )
+
+    def _install(self, views, outputs, focused_view_id, focused_output_id) -> None:
+        self.outputs = {o["id"]: o for o in outputs}
+        self.views = {}
+        self.by_app_id = {}
+        self.by_pid = {}
+        self.by_output = {}
+        self.by_workspace = {}
+        self._view_workspace = {}
+        for view in views:
+            self._add(view)
+        self.focused_view_id = focused_view_id
+        self.focused_output_id = focused_output_id
+        self._stale = False
+        self.seeds += 1
+
+    def resync(self) -> list[dict[str, Any]]:
+        """
+        Re-seed after the event stream was interrupted and describe the gap.
+
+        The last known state, even if marked stale, is diffed against a fresh
+        snapshot: views that appeared or vanished become view-mapped and
+        view-unmapped events, changed fields of surviving views become the
+        matching change events, and a focus change becomes view-focused. Each
+        synthetic event carries "synthetic": True. A seed already in flight,
+        started by ready(), is waited for rather than run alongside.
+
+        Returns:
+            list: The synthetic events, empty if the store was never seeded.
+        """
+        if self._ipc.compositor_name != "wayfire":
+            return []
+        with self._lock:
+            had_state = self.seeds > 0
+            old_views = self.views
+            old_focus = self.focused_view_id
+            while self._buffer is not None:
+                self._seed_done.wait()
+            self._buffer = []
+        # request sockets opened before the outage may be dead as well
+        self._ipc.ensure_ipc_connection()
+        if not self._seed():
+            with self._lock:
+                self._stale = True
+            return []
+        if not had_state:
+            return []
+        with self._lock:
+            return self._diff(old_views, old_focus)
+
+    def _diff(
+        self, old_views: dict[int, dict[str, Any]], old_focus: int | None
+    ) -> list[dict[str, Any]]:
+        events = []
+
+        def emit(etype, view):
+            events.append({"event": etype, "view": dict(view), "synthetic": True})
+
+        for view_id, view in old_views.items():
+            if view_id not in self.views:
+                emit("view-unmapped", view)
+        for view_id, view in self.views.items():
+            old = old_views.get(view_id)
+            if old is None:
+                emit("view-mapped", view)
+                continue
+            for field, etype in RESYNC_FIELD_EVENTS:
+                if old.get(field) != view.get(field):
+                    emit(etype, view)
+        focused = self.views.get(self.focused_view_id)  # pyright: ignore
+        if self.focused_view_id != old_focus and focused is not None:
+            emit("view-focused", focused)
+        return events
+
+    def apply_batch(self, events: Iterable[Any]) -> None:
+        """Apply a batch of compositor events to the mirror."""
+        with self._lock:
+            if self._buffer is not None:
+                self._buffer.extend(event for event in events if event)
+                return
+            if self._stale:
+                return
+            for event in events:
+                if event:
+                    self.apply(event)
+
+    def apply(self, event: dict[str, Any]) -> None:
+        """Apply one compositor event to the mirror."""
+        etype = event.get("event")
+        view = event.get("view")
+        with self._lock:
+            if etype in VIEW_UPDATE_EVENTS:
+                if etype == "view-focused":
+                    self.focused_view_id = view.get("id") if view else None
+                if isinstance(view, dict) and "id" in view:
+                    self._add(view)
+            elif etype in VIEW_REMOVE_EVENTS:
+                if isinstance(view, dict) and "id" in view:
+                    self._remove(view["id"])
+                    if view["id"] == self.focused_view_id:
+                        # the view-focused that follows names the new focus
+                        self.focused_view_id = None
+            elif etype == "output-gain-focus":
+                output = event.get("output")
+                if isinstance(output, dict) and "id" in output:
+                    self.outputs[output["id"]] = output
+                    self.focused_output_id = output["id"]
+                else:
+                    self._stale = True
+            elif etype == "wset-workspace-changed":
+                self._apply_workspace_change(event)
+            elif etype in RESEED_EVENTS:
+                self._stale = True
+
+    def _apply_workspace_change(self, event: dict[str, Any]) -> None:
+        """
+        Follow a workspace switch of one output without re-seeding.
+
+        View geometry is relative to the output's current workspace, so the
+        geometry of every view on that output is shifted by the switch,
+        except for sticky views, which move along to the new workspace.
+        """
+        output_data = event.get("output-data")
+        if not isinstance(output_data, dict):
+            output_data = None
+        output_id = (output_data or {}).get("id", event.get("output"))
+        old_output = self.outputs.get(output_id)  # pyright: ignore
+        new = event.get("new-workspace")
+        if old_output is None or not isinstance(new, dict):
+            self._stale = True
+            return
+        old = event.get("previous-workspace") or old_output.get("workspace") or {}
+        size = old_output.get("geometry") or {}
+        width, height = size.get("width"), size.get("height")
+        if not width or not height or "x" not in old or "y" not in old:
+            self._stale = True
+            return
+        output = dict(output_data or old_output)
+        output["workspace"] = {
+            **(output.get("workspace") or {}),
+            "x": new["x"],
+            "y": new["y"],
+        }
+        self.outputs[output_id] = output
+        dx = (new["x"] - old["x"]) * width
+        dy = (new["y"] - old["y"]) * height
+        for view_id in list(self.by_output.get(output_id, ())):
+            view = self.views[view_id]
+            geometry = view.get("geometry")
+            if geometry and not view.get("sticky") and (dx or dy):
+                view = {
+                    **view,
+                    "geometry": {
+                        **geometry,
+                        "x": geometry["x"] - dx,
+                        "y": geometry["y"] - dy,
+                    },
+                }
+            self._add(view)
+
+    def _add(self, view: dict[str, Any]) -> None:
+        """Insert or replace a view, keeping its position in mapping order."""
+        view_id = view["id"]
+        old = self.views.get(view_id)
+        if old is not None:
+            self._unindex(old)
+        self.views[view_id] = view
+        self.by_app_id.setdefault(view.get("app-id"), set()).add(view_id)
+        self.by_pid.setdefault(view.get("pid"), set()).add(view_id)
+        self.by_output.setdefault(view.get("output-id"), set()).add(view_id)
+        workspace = self._workspace_of(view)
+        if workspace is not None:
+            self.by_workspace.setdefault(workspace, set()).add(view_id)
+            self._view_workspace[view_id] = workspace
+
+    def _remove(self, view_id: int) -> None:
+        view = self.views.pop(view_id, None)
+        if view is not None:
+            self._unindex(view)
+
+    def _unindex(self, view: dict[str, Any]) -> None:
+        view_id = view["id"]
+        for index, key in (
+            (self.by_app_id, view.get("app-id")),
+            (self.by_pid, view.get("pid")),
+            (self.by_output, view.get("output-id")),
+            (self.by_workspace, self._view_workspace.pop(view_id, None)),
+        ):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(view_id)
+                if not ids:
+                    del index[key]
+
+    def _workspace_of(self, view: dict[str, Any]) -> tuple[int, int, int] | None:
+        """
+        Locate the workspace holding the center of a view.
+
+        View geometry is relative to the current workspace of its output, so
+        this is only valid until that output switches workspace, which is why
+        wset-workspace-changed re-indexes the views of that output.
+        """
+        output = self.outputs.get(view.get("output-id"))
+        geometry = view.get("geometry")
+        if not output or not geometry:
+            return None
+        current = output.get("workspace") or {}
+        size = output.get("geometry") or {}
+        width, height = size.get("width"), size.get("height")
+        if not width or not height or "x" not in current or "y" not in current:
+            return None
+        center_x = geometry["x"] + geometry["width"] // 2
+        center_y = geometry["y"] + geometry["height"] // 2
+        return (
+            output["id"],
+            current["x"] + center_x // width,
+            current["y"] + center_y // height,
+        )
+
+    def _copies(self, ids: Iterable[int]) -> list[dict[str, Any]]:
+        # keep the compositor's stacking/mapping order
+        wanted = set(ids)
+        return [dict(v) for view_id, v in self.views.items() if view_id in wanted]
+
+    def list_views(self) -> list[dict[str, Any]]:
+        """All mirrored views, in mapping order."""
+        with self._lock:
+            return [dict(v) for v in self.views.values()]
+
+    def get_view(self, view_id: int) -> dict[str, Any] | None:
+        """The view with the given id, or None if it is not mirrored."""
+        with self._lock:
+            view = self.views.get(view_id)
+            return dict(view) if view is not None else None
+
+    def get_focused_view(self) -> dict[str, Any] | None:
+        """The focused view, or None if no view has focus."""
+        with self._lock:
+            view = self.views.get(self.focused_view_id)  # pyright: ignore
+            return dict(view) if view is not None else None
+
+    def list_outputs(self) -> list[dict[str, Any]]:
+        """All mirrored outputs."""
+        with self._lock:
+            return [dict(o) for o in self.outputs.values()]
+
+    def get_focused_output(self) -> dict[str, Any] | None:
+        """The focused output, or None if unknown."""
+        with self._lock:
+            output = self.outputs.get(self.focused_output_id)  # pyright: ignore
+            return dict(output) if output is not None else None
+
+    def get_views_by_app_id(self, app_id: str) -> list[dict[str, Any]]:
+        """Views whose app-id equals app_id."""
+        with self._lock:
+            return self._copies(self.by_app_id.get(app_id, ()))
+
+    def get_view_by_pid(self, pid: int) -> dict[str, Any] | None:
+        """The first view owned by the given process id."""
+        with self._lock:
+            views = self._copies(self.by_pid.get(pid, ()))
+            return views[0] if views else None
+
+    def get_views_on_output(self, output_id: int) -> list[dict[str, Any]]:
+        """Views placed on the given output."""
+        with self._lock:
+            return self._copies(self.by_output.get(output_id, ()))
+
+    def get_views_on_workspace(
+        self, output_id: int, x: int, y: int
+    ) -> list[dict[str, Any]]:
+        """Views whose center lies on workspace (x, y) of the given output."""
+        with self._lock:
+            return self._copies(self.by_workspace.get((output_id, x, y), ()))
+
+    def get_views_from_active_workspace(self) -> list[int]:
+        """Ids of the mapped toplevel views on the focused output's workspace."""
+        with self._lock:
+            output = self.outputs.get(self.focused_output_id)  # pyright: ignore
+            if not output or "workspace" not in output:
+                return []
+            current = output["workspace"]
+            ids = self.by_workspace.get((output["id"], current["x"], current["y"]))
+            return [
+                view_id
+                for view_id, view in self.views.items()
+                if ids
+                and view_id in ids
+                and view.get("role") == "toplevel"
+                and view.get("mapped", True)
+            ]
+
+    def stats(self) -> dict[str, Any]:
+        """Return the size of the mirror and how often it was seeded."""
+        with self._lock:
+            return {
+                "views": len(self.views),
+                "outputs": len(self.outputs),
+                "app_ids": len(self.by_app_id),
+                "workspaces": len(self.by_workspace),
+                "seeds": self.seeds,
+                "stale": self._stale,
+            }
@@ -2,7 +2,7 @@ import sys
 import importlib
 import os
 from gi.repository import GLib
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
 try:
     SOURCE_REMOVE = GLib.SOURCE_REMOVE
@@ -14,14 +14,26 @@ class PluginResolver(dict):
     """
     A dictionary proxy that resolves plugin instances using full identifiers,
     short names, or module names.
+
+    Lazy plugins that were not created yet count as present, and looking one
+    up creates it through the materialize callback. Iteration only yields
+    plugins that exist, so scanning the plugins never creates a lazy one.
     """
 
     def __init__(
-        self, *args, id_map: Dict[str, str], full_id_map: Dict[str, str], **kwargs
+        self,
+        *args,
+        id_map: Dict[str, str],
+        full_id_map: Dict[str, str],
+        lazy: Optional[Dict[str, Any]] = None,
+        materialize: Optional[Callable[[str], Any]] = None,
+        **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.short_name_to_id = id_map
         self.module_name_to_id = full_id_map
+        self.lazy = lazy if lazy is not None else {}
+        self.materialize = materialize
 
     def __getitem__(self, key: str) -> Any:
         if dict.__contains__(self, key):
@@ -31,13 +43,21 @@ class PluginResolver(dict):
         if resolved_id and dict.__contains__(self, resolved_id):
             return dict.__getitem__(self, resolved_id)
 
+        p_id = resolved_id or key
+        if p_id in self.lazy and self.materialize is not None:
+            instance = self.materialize(p_id)
+            if instance is not None:
+                return instance
+
         raise KeyError(key)
 
     def __contains__(self, key: str) -> bool:
         if dict.__contains__(self, key):
             return True
         resolved_id = self.short_name_to_id.get(key) or self.module_name_to_id.get(key)
-        return resolved_id is not None and dict.__contains__(self, resolved_id)
+        if resolved_id is not None and dict.__contains__(self, resolved_id):
+            return True
+        return (resolved_id or key) in self.lazy
 
     def get(self, key: str, default: Any = None) -> Any:
         try:
@@ -160,6 +180,9 @@ class PluginLoaderHelpers:
         Triggers plugin cleanup hooks and removes the instance from the resolver.
         """
         p_id = self.loader.short_name_to_id.get(plugin_name) or plugin_name
+        if p_id in self.loader.lazy_plugins:
+            self.loader.discard_lazy_plugin(p_id)
+            return
         if p_id not in self.loader.plugins:
             return
 
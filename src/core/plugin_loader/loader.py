@@ -1,14 +1,32 @@
 import os
+import copy
 import importlib
 import importlib.util
 from gi.repository import GLib, Gtk  # pyright: ignore
 import sys
 import gc
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from src.core import startup_trace
 from src.core.plugin_loader.helper import PluginLoaderHelpers, PluginResolver
-from typing import Any, Dict, Tuple, Set
+from src.core.plugin_loader.manifest import (
+    MANIFEST_NAME,
+    PluginManifest,
+    config_fingerprint,
+    reads_environment,
+)
+from src.shared.env_helpers import env_number
+from typing import Any, Dict, Optional, Tuple, Set
 
 PluginMetadataTuple = Tuple[Any, str, int, int, str]
 
+# worker threads importing plugin modules during startup; 0 imports serially
+IMPORT_WORKERS = env_number(
+    "WAYPANEL_PLUGIN_IMPORT_WORKERS", min(4, os.cpu_count() or 1), int
+)
+# main loop time one loader idle callback may take before yielding a frame
+FRAME_BUDGET = env_number("WAYPANEL_LOADER_FRAME_BUDGET_MS", 8.0, float) / 1000
+
 
 class PluginLoader:
     """
@@ -17,7 +35,12 @@ class PluginLoader:
     This loader implements a recursive directory scan that accommodates both standard
     Python packages and repository-style directories (e.g., those with hyphens).
     It prioritizes startup performance by batching imports and managing garbage
-    collection during the loading phase.
+    collection during the loading phase. Plugin metadata is cached in an on-disk
+    manifest, so on a warm start only the plugins being initialized are imported.
+    Plugins whose metadata sets "lazy" are only given a proxy button at startup
+    and are imported and created on first use. Module imports run ahead on
+    worker threads, as does get_plugin_class for plugins whose metadata sets
+    "preload"; plugin construction stays on the GTK main thread.
     """
 
     def __init__(self, panel_instance):
@@ -58,6 +81,14 @@ class PluginLoader:
         self.plugins_to_process_index = 0
         self.plugins_to_initialize = []
         self.plugins_to_initialize_index = 0
+        self.lazy_plugins: Dict[str, PluginMetadataTuple] = {}
+        self._lazy_proxies: Dict[str, Any] = {}
+        self._prewarm_queue = []
+        self._import_executor: Optional[ThreadPoolExecutor] = None
+        self._preloads: Dict[str, Future] = {}
+        self._plugin_files: Dict[str, str] = {}
+        # per phase [total seconds, count] measured in this run
+        self._run_costs: Dict[str, list] = {"import": [0.0, 0], "init": [0.0, 0]}
 
         self.data_helper = self.panel_instance.data_helper
         self.config_handler = self.panel_instance.config_handler
@@ -79,6 +110,13 @@ class PluginLoader:
 
         self._sys_path_cache: Set[str] = set(sys.path)
 
+        self.manifest: Optional[PluginManifest] = None
+        if os.environ.get("WAYPANEL_PLUGIN_MANIFEST", "1") != "0":
+            self.manifest = PluginManifest(
+                self.panel_instance.path_handler.get_cache_path(MANIFEST_NAME),
+                self.logger,
+            )
+
     def _smart_scan(self, current_dir, package_prefix=""):
         """
         Recursively scans the directory structure to identify plugin modules.
@@ -147,21 +185,123 @@ class PluginLoader:
             if self.plugins_dir not in self._sys_path_cache:
                 sys.path.append(self.plugins_dir)
                 self._sys_path_cache.add(self.plugins_dir)
-            self._smart_scan(self.plugins_dir, package_prefix="")
+            with startup_trace.span("_smart_scan", dir=self.plugins_dir):
+                self._smart_scan(self.plugins_dir, package_prefix="")
 
             if os.path.exists(self.user_plugins_dir):
                 if self.user_plugins_dir not in self._sys_path_cache:
                     sys.path.append(self.user_plugins_dir)
                     self._sys_path_cache.add(self.user_plugins_dir)
-                self._smart_scan(self.user_plugins_dir, package_prefix="")
+                with startup_trace.span("_smart_scan", dir=self.user_plugins_dir):
+                    self._smart_scan(self.user_plugins_dir, package_prefix="")
 
         except Exception as e:
             self.logger.error(f"Error during plugin scanning: {e}")
 
         if self.plugins_to_process:
+            self._preimport_modules()
             GLib.idle_add(self._batch_import_and_validate)
         return False
 
+    def _get_import_executor(self) -> Optional[ThreadPoolExecutor]:
+        if IMPORT_WORKERS <= 0:
+            return None
+        if self._import_executor is None:
+            self._import_executor = ThreadPoolExecutor(
+                max_workers=IMPORT_WORKERS, thread_name_prefix="WaypanelImport"
+            )
+        return self._import_executor
+
+    def _shutdown_import_executor(self):
+        self._preloads.clear()
+        if self._import_executor is not None:
+            self._import_executor.shutdown(wait=False, cancel_futures=True)
+            self._import_executor = None
+
+    def _preimport_modules(self):
+        """
+        Imports the scanned modules that have no valid manifest entry on worker
+        threads, ahead of _batch_import_and_validate.
+
+        The validation step still imports each module on the main thread, which
+        returns the module from sys.modules, or waits on the import lock if a
+        worker is still importing it. A failed import is simply retried there,
+        so its error is reported as before.
+        """
+        executor = self._get_import_executor()
+        if executor is None:
+            return
+        manifest = self.manifest
+        for module_name, module_import_path in self.plugins_to_process:
+            if module_name in self.disabled_plugins:
+                continue
+            file_path = self.plugins_path.get(module_name)
+            if manifest is not None and file_path:
+                if manifest.get(file_path, manifest.key(file_path)) is not None:
+                    continue
+            executor.submit(self._import_module, module_import_path)
+
+    def _import_module(self, module_import_path):
+        with startup_trace.span(f"import {module_import_path}", cat="import"):
+            return importlib.import_module(module_import_path)
+
+    def _preload_plugin_classes(self, plugins, plugin_deps):
+        """
+        Imports the modules of the plugins about to be initialized on worker
+        threads.
+
+        get_plugin_class, where plugins defer their heavy imports, may also
+        touch GTK or other main-thread-only state, so it only runs here for
+        plugins whose metadata sets "preload"; the others get their module
+        imported and their class created on the main thread. Plugins are
+        submitted in initialization order and each task first waits for the
+        tasks of its dependencies, so a plugin never imports ahead of a
+        plugin it depends on.
+        """
+        executor = self._get_import_executor()
+        if executor is None:
+            return
+        for module, _container, _priority, _order, p_id in plugins:
+            metadata = self._meta_cache.get(p_id, {})
+            if metadata.get("lazy", False):
+                continue
+            deps = [self._preloads[d] for d in plugin_deps[p_id] if d in self._preloads]
+            self._preloads[p_id] = executor.submit(
+                self._preload_plugin_class,
+                module,
+                p_id,
+                deps,
+                bool(metadata.get("preload", False)),
+            )
+
+    def _preload_plugin_class(self, module, plugin_id, deps, get_class):
+        wait(deps)
+        module = self._load_plugin_module(module)
+        if not get_class:
+            return None
+        with startup_trace.span(f"{plugin_id} get_plugin_class", cat="import"):
+            return module.get_plugin_class()
+
+    def _plugin_class(self, module, plugin_id):
+        """
+        Returns the plugin class, taking over its preload task.
+
+        A task that has not started yet is cancelled and the work done in
+        place; a running one is waited for, since the main thread would block
+        on the import locks it holds anyway. A failed preload is redone here
+        so the error is raised on the main thread, and a plugin that did not
+        opt into "preload" gets its class created here.
+        """
+        future = self._preloads.pop(plugin_id, None)
+        if future is not None and not future.cancel():
+            try:
+                plugin_class = future.result()
+            except Exception:
+                plugin_class = None
+            if plugin_class is not None:
+                return plugin_class
+        return self._load_plugin_module(module).get_plugin_class()
+
     def load_plugins(self):
         """
         Schedules the plugin discovery and loading process on the main loop.
@@ -198,43 +338,57 @@ class PluginLoader:
         """
         Imports and validates plugins in chunks to maintain UI responsiveness.
 
+        Each idle callback processes modules until the next one is expected to
+        exceed FRAME_BUDGET, based on its cost measured in previous runs (see
+        _predicted_cost), and always processes at least one.
+
         Garbage collection is temporarily disabled during this process to reduce
         overhead while creating numerous module and class objects.
         """
         gc.disable()
+        chunk_start = startup_trace.now()
 
-        CHUNK_SIZE = 20
-        start = self.plugins_to_process_index
-        end = min(start + CHUNK_SIZE, len(self.plugins_to_process))
-        chunk = self.plugins_to_process[start:end]
+        deadline = time.perf_counter() + FRAME_BUDGET
+        start = index = self.plugins_to_process_index
+        total = len(self.plugins_to_process)
 
         try:
-            if not chunk and start >= len(self.plugins_to_process):
+            if start >= total:
                 gc.enable()
+                if self.manifest is not None:
+                    self.logger.debug(
+                        f"Plugin manifest: {self.manifest.hits} cached, "
+                        f"{self.manifest.misses} imported"
+                    )
                 self.plugins = PluginResolver(
                     self._plugins_instance_map,
                     id_map=self.short_name_to_id,
                     full_id_map=self.module_name_to_id,
+                    lazy=self.lazy_plugins,
+                    materialize=self.load_lazy_plugin,
                 )
                 GLib.idle_add(self._initialize_sorted_plugins)
                 GLib.idle_add(self._update_plugin_configuration, self.valid_plugins)
                 return False
 
-            for module_name, module_import_path in chunk:
+            while index < total:
+                module_name, module_import_path = self.plugins_to_process[index]
+                file_path = self.plugins_path.get(module_name)
+                predicted = self._predicted_cost(file_path, "import")
+                if index > start and time.perf_counter() + predicted > deadline:
+                    break
+                index += 1
                 if module_name in self.disabled_plugins:
                     continue
 
+                item_start = time.perf_counter()
                 try:
-                    module = importlib.import_module(module_import_path)
-
-                    get_meta = getattr(module, "get_plugin_metadata", None)
-                    if not get_meta or not hasattr(module, "get_plugin_class"):
-                        if module_import_path in sys.modules:
-                            del sys.modules[module_import_path]
+                    metadata, module = self._read_plugin_metadata(
+                        module_name, module_import_path
+                    )
+                    if metadata is None:
                         continue
 
-                    metadata = get_meta(self.panel_instance)
-
                     if "deps" not in metadata:
                         metadata["deps"] = []
                     elif metadata["deps"]:
@@ -251,6 +405,8 @@ class PluginLoader:
                     self.plugin_id_to_short_name[p_id] = s_name
                     self.short_name_to_id[s_name] = p_id
                     self.module_name_to_id[module_name] = p_id
+                    if file_path:
+                        self._plugin_files[p_id] = file_path
 
                     self._meta_cache[p_id] = metadata
                     self.plugin_metadata_map[p_id] = metadata
@@ -269,8 +425,13 @@ class PluginLoader:
 
                 except Exception as e:
                     self.logger.error(f"Failed to load plugin {module_name}: {e}")
+                finally:
+                    self._record_cost(
+                        file_path, "import", time.perf_counter() - item_start
+                    )
 
-            self.plugins_to_process_index = end
+            self.plugins_to_process_index = index
+            startup_trace.complete("import chunk", chunk_start, modules=index - start)
             return True
 
         except Exception as e:
@@ -278,6 +439,112 @@ class PluginLoader:
             self.logger.critical(f"FATAL: Unhandled exception during batch import: {e}")
             return False
 
+    def _save_manifest(self) -> None:
+        """
+        Writes the manifest once per start, after plugin construction, so the
+        metadata entries and both phases' costs go out in one write.
+        """
+        if self.manifest is not None:
+            self.manifest.save(self.plugins_path.values())
+
+    def _predicted_cost(self, file_path: Optional[str], phase: str) -> float:
+        """
+        Expected main thread seconds of one plugin in a loader phase ("import"
+        or "init"): its cost remembered in the manifest, else the mean cost
+        measured so far in this run.
+        """
+        if self.manifest is not None and file_path:
+            cost = self.manifest.cost(file_path, phase)
+            if cost is not None:
+                return cost
+        total, count = self._run_costs[phase]
+        return total / count if count else 0.0
+
+    def _record_cost(self, file_path: Optional[str], phase: str, seconds: float):
+        run = self._run_costs[phase]
+        run[0] += seconds
+        run[1] += 1
+        if self.manifest is not None and file_path:
+            self.manifest.record_cost(file_path, phase, seconds)
+
+    def _config_fingerprint(self, metadata: dict) -> Optional[str]:
+        """
+        Returns the fingerprint of a plugin's config section, which is what
+        get_plugin_metadata implementations read from the panel (container,
+        panel position, visibility and the defaults they write there).
+        """
+        p_id = metadata.get("id")
+        if not p_id:
+            return None
+        return config_fingerprint(self.config_handler.get_root_setting([p_id], None))
+
+    def _read_plugin_metadata(self, module_name: str, module_import_path: str):
+        """
+        Returns the metadata of a scanned module and the module to initialize.
+
+        When the manifest holds a valid entry for the file, nothing is imported
+        and the module slot carries the import path instead, resolved by
+        _load_plugin_module once the plugin is initialized. An entry is also
+        bypassed when the plugin's config section changed since it was
+        stored, or when its metadata was stored as not cacheable. Otherwise
+        the module is imported and get_plugin_metadata run again, so its
+        config reads and the defaults it writes see the current config.
+
+        Returns:
+            tuple: (metadata, module or import path), or (None, None) when the
+            module is not a plugin.
+        """
+        manifest = self.manifest
+        file_path = self.plugins_path.get(module_name)
+        key = None
+        if manifest is not None and file_path:
+            key = manifest.key(file_path)
+            entry = manifest.get(file_path, key)
+            if entry is not None and entry.get("module") == module_import_path:
+                metadata = entry.get("metadata")
+                if entry.get("cacheable", True):
+                    if metadata is None:
+                        manifest.hits += 1
+                        return None, None
+                    if entry.get("config") == self._config_fingerprint(metadata):
+                        manifest.hits += 1
+                        return copy.deepcopy(metadata), module_import_path
+            manifest.misses += 1
+
+        module = self._import_module(module_import_path)
+
+        get_meta = getattr(module, "get_plugin_metadata", None)
+        if not get_meta or not hasattr(module, "get_plugin_class"):
+            if module_import_path in sys.modules:
+                del sys.modules[module_import_path]
+            if manifest is not None and file_path:
+                manifest.put(
+                    file_path, key, {"module": module_import_path, "metadata": None}
+                )
+            return None, None
+
+        metadata = get_meta(self.panel_instance)
+        if manifest is not None and file_path:
+            if reads_environment(get_meta) or not isinstance(metadata, dict):
+                entry = {"module": module_import_path, "cacheable": False}
+            else:
+                entry = {
+                    "module": module_import_path,
+                    "metadata": metadata,
+                    "config": self._config_fingerprint(metadata),
+                }
+            manifest.put(file_path, key, entry)
+        return metadata, module
+
+    def _load_plugin_module(self, module):
+        """
+        Imports a plugin selected from the manifest, which is carried by its
+        import path until it is initialized.
+        """
+        if isinstance(module, str):
+            module = self._import_module(module)
+        return module
+
     def handle_set_widget(self, action, widgets, target, plugin_id, hide=False):
         """
         Manages the placement of plugin widgets into the target panel container.
@@ -345,12 +612,17 @@ class PluginLoader:
         Top panel plugins are prioritized during sorting.
         """
         if not self.plugin_metadata:
+            self._shutdown_import_executor()
+            self._save_manifest()
             return False
 
+        sort_start = startup_trace.now()
         all_plugins = {m[4]: m for m in self.plugin_metadata}
         in_degree = {n: 0 for n in all_plugins}
         adj = {n: [] for n in all_plugins}
 
+        plugin_deps = {n: [] for n in all_plugins}
+
         short_map = self.short_name_to_id
         mod_map = self.module_name_to_id
         meta_cache = self._meta_cache
@@ -365,6 +637,7 @@ class PluginLoader:
                 )
                 if d_id:
                     adj[d_id].append(name)
+                    plugin_deps[name].append(d_id)
                     in_degree[name] += 1
 
         def sort_key(item):
@@ -400,29 +673,53 @@ class PluginLoader:
 
         self.plugins_to_initialize = [all_plugins[n] for n in sorted_names]
         self.plugins_to_initialize_index = 0
+        startup_trace.complete("topological sort", sort_start, plugins=len(sorted_names))
+        self._preload_plugin_classes(self.plugins_to_initialize, plugin_deps)
         GLib.idle_add(self._chunked_initialize_plugins)
         return False
 
     def _chunked_initialize_plugins(self):
         """
         Initializes plugin instances in small batches to prevent UI freezes.
+
+        Like the import step, each batch ends before the next plugin's
+        remembered cost would exceed FRAME_BUDGET, after at least one plugin.
         """
-        CHUNK = 5
-        for _ in range(CHUNK):
+        chunk_start = startup_trace.now()
+        deadline = time.perf_counter() + FRAME_BUDGET
+        count = 0
+        while True:
             if self.plugins_to_initialize_index >= len(self.plugins_to_initialize):
                 GLib.idle_add(
                     lambda: setattr(
                         self.panel_instance, "plugins_startup_finished", True
                     )
                 )
+                self._shutdown_import_executor()
+                self._schedule_lazy_prewarm()
+                self._save_manifest()
+                startup_trace.complete("init chunk", chunk_start, plugins=count)
+                startup_trace.milestone("plugins-started")
                 return False
 
             m, c, p, o, pid = self.plugins_to_initialize[
                 self.plugins_to_initialize_index
             ]
-            self._initialize_single_plugin(m, c, o, p, pid)
+            file_path = self._plugin_files.get(pid)
+            predicted = self._predicted_cost(file_path, "init")
+            if count and time.perf_counter() + predicted > deadline:
+                break
+            count += 1
+
+            item_start = time.perf_counter()
+            if self._meta_cache.get(pid, {}).get("lazy", False):
+                self._register_lazy_plugin(m, c, p, o, pid)
+            else:
+                self._initialize_single_plugin(m, c, o, p, pid)
+            self._record_cost(file_path, "init", time.perf_counter() - item_start)
             self.plugins_to_initialize_index += 1
 
+        startup_trace.complete("init chunk", chunk_start, plugins=count)
         return True
 
     def _initialize_single_plugin(self, module, container, order, priority, plugin_id):
@@ -431,10 +728,14 @@ class PluginLoader:
         """
         meta = self._meta_cache.get(plugin_id, {})
         try:
-            instance = module.get_plugin_class()(self.panel_instance)
+            with startup_trace.span(f"{plugin_id} get_plugin_class", cat="plugin"):
+                plugin_class = self._plugin_class(module, plugin_id)
+            with startup_trace.span(f"{plugin_id} __init__", cat="plugin"):
+                instance = plugin_class(self.panel_instance)
 
             if hasattr(instance, "on_start"):
-                instance.on_start()
+                with startup_trace.span(f"{plugin_id} on_start", cat="plugin"):
+                    instance.on_start()
             if hasattr(instance, "on_enable"):
                 instance.on_enable()
 
@@ -478,6 +779,148 @@ class PluginLoader:
             self.logger.error(f"Failed init {plugin_id}: {e}")
         return False
 
+    def _register_lazy_plugin(self, module, container, priority, order, plugin_id):
+        """
+        Defers a lazy plugin: only a proxy button is placed in its container.
+
+        The module is not imported here; clicking the proxy, or looking the
+        plugin up in self.plugins (e.g. from a keybinding or another plugin),
+        creates it through load_lazy_plugin. Background plugins get no proxy.
+        """
+        self.lazy_plugins[plugin_id] = (module, container, priority, order, plugin_id)
+        if container == "background":
+            return
+        target = self._get_target_panel_box(container, plugin_id)
+        if not target or target == "background":
+            return
+
+        meta = self._meta_cache.get(plugin_id, {})
+        proxy = Gtk.Button()
+        proxy.add_css_class("lazy-plugin-proxy")
+        if meta.get("icon"):
+            proxy.set_icon_name(meta["icon"])
+        proxy.connect("clicked", self._on_lazy_proxy_clicked, plugin_id)
+        self.gtk_helpers.add_cursor_effect(proxy)
+        self._lazy_proxies[plugin_id] = proxy
+        self.handle_set_widget(
+            "append", [proxy], target, plugin_id, meta.get("hidden", False)
+        )
+
+    def _remove_lazy_proxy(self, plugin_id):
+        proxy = self._lazy_proxies.pop(plugin_id, None)
+        if proxy is None:
+            return
+        parent = proxy.get_parent()
+        if isinstance(parent, Gtk.FlowBoxChild):
+            flow = parent.get_parent()
+            if flow is not None:
+                flow.remove(parent)
+        elif parent is not None and hasattr(parent, "remove"):
+            parent.remove(proxy)
+
+    def load_lazy_plugin(self, plugin_id):
+        """
+        Creates a lazy plugin now, replacing its proxy with the real widget.
+
+        Must be called on the GTK main thread. The plugin's decorated event
+        handlers are registered as well, since the event handler plugin only
+        scans the plugins that existed when it started.
+
+        Returns:
+            The plugin instance, or None if it is not lazy or failed to start.
+        """
+        plugin = self.lazy_plugins.pop(plugin_id, None)
+        if plugin is None:
+            return None
+        module, container, priority, order, p_id = plugin
+        self._initialize_single_plugin(module, container, order, priority, p_id)
+        self._remove_lazy_proxy(plugin_id)
+
+        instance = dict.get(self.plugins, plugin_id)
+        if instance is None:
+            return None
+        event_handler = dict.get(self.plugins, "org.waypanel.plugin.event_handler")
+        if hasattr(event_handler, "register_plugin_handlers"):
+            event_handler.register_plugin_handlers(plugin_id, instance)
+        self.logger.debug(f"Lazy plugin {plugin_id} created on first use")
+        return instance
+
+    def discard_lazy_plugin(self, plugin_id):
+        """Drops a lazy plugin that was never created, and its proxy."""
+        self.lazy_plugins.pop(plugin_id, None)
+        self._remove_lazy_proxy(plugin_id)
+
+    def _on_lazy_proxy_clicked(self, _button, plugin_id):
+        instance = self.load_lazy_plugin(plugin_id)
+        mw = getattr(instance, "main_widget", None)
+        if not mw:
+            return
+        widget = mw[0] if isinstance(mw, (list, tuple)) else mw
+        if isinstance(widget, (list, tuple)):
+            widget = widget[0] if widget else None
+        if widget is not None:
+            self._activate_when_mapped(widget)
+
+    def _activate_when_mapped(self, widget):
+        """
+        Forwards the proxy click to the real widget once it is on screen, so
+        the popover opens anchored to it.
+        """
+
+        def activate(*_):
+            if hasattr(widget, "popup"):
+                widget.popup()
+            else:
+                widget.activate()
+            return False
+
+        if widget.get_mapped():
+            activate()
+            return
+
+        def on_map(w):
+            w.disconnect(handler_id)
+            GLib.idle_add(activate)
+
+        handler_id = widget.connect("map", on_map)
+
+    def _schedule_lazy_prewarm(self):
+        """
+        Starts the optional prewarm of lazy plugins, configured in seconds after
+        startup by plugins.lazy_prewarm_delay (0 or unset disables it).
+        """
+        delay = self.config_handler.get_root_setting(
+            ["plugins", "lazy_prewarm_delay"], 0
+        )
+        if not self.lazy_plugins or not isinstance(delay, (int, float)) or delay <= 0:
+            return
+        GLib.timeout_add(int(delay * 1000), self._start_lazy_prewarm)
+
+    def _start_lazy_prewarm(self):
+        self._prewarm_queue = list(self.lazy_plugins)
+        GLib.idle_add(self._prewarm_lazy_plugins, priority=GLib.PRIORITY_LOW)
+        return False
+
+    def _prewarm_lazy_plugins(self):
+        """
+        Imports one lazy plugin per idle callback and runs its get_plugin_class,
+        which performs the plugin's own heavy imports. The plugin is not
+        created, so no widgets or resources exist until it is used.
+        """
+        while self._prewarm_queue:
+            plugin_id = self._prewarm_queue.pop(0)
+            plugin = self.lazy_plugins.get(plugin_id)
+            if plugin is None:
+                continue
+            try:
+                module = self._load_plugin_module(plugin[0])
+                module.get_plugin_class()
+                self.lazy_plugins[plugin_id] = (module,) + tuple(plugin[1:])
+            except Exception as e:
+                self.logger.error(f"Failed to prewarm lazy plugin {plugin_id}: {e}")
+            return True
+        return False
+
     def _update_plugin_configuration(self, valid_plugins):
         """
         Updates the global configuration file with the list of active plugins.
@@ -0,0 +1,201 @@
+import dis
+import hashlib
+import os
+import sys
+import types
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import orjson as json
+
+MANIFEST_NAME = "plugin_manifest.json"
+MANIFEST_VERSION = 1
+# weight of the newest measurement in a remembered cost
+COST_SMOOTHING = 0.5
+# a remembered cost is only replaced when it moves by more than this
+# fraction of itself, or by COST_MIN_CHANGE seconds for tiny costs, so
+# run-to-run noise does not rewrite the manifest on every start
+COST_TOLERANCE = 0.25
+COST_MIN_CHANGE = 0.0005
+
+
+def config_fingerprint(settings: Any) -> str:
+    """Returns a short stable hash of a plugin's config section."""
+    data = json.dumps(
+        settings,
+        default=str,
+        option=json.OPT_SORT_KEYS | json.OPT_NON_STR_KEYS,
+    )
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def reads_environment(func: Callable) -> bool:
+    """
+    Whether a get_plugin_metadata function may depend on more than the
+    config: it imports a module or reads a module global, e.g. to look for
+    an installed program. The metadata of such functions is not cached.
+    """
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return True
+    func_globals = getattr(func, "__globals__", {})
+    codes = [code]
+    while codes:
+        code = codes.pop()
+        for instruction in dis.get_instructions(code):
+            if instruction.opname == "IMPORT_NAME":
+                return True
+            if instruction.opname in ("LOAD_GLOBAL", "LOAD_NAME") and isinstance(
+                func_globals.get(instruction.argval), types.ModuleType
+            ):
+                return True
+        codes.extend(c for c in code.co_consts if isinstance(c, types.CodeType))
+    return False
+
+
+class PluginManifest:
+    """
+    On-disk cache of plugin metadata, so a warm start can select and sort
+    plugins without importing their modules.
+
+    Entries are keyed by the plugin file path and stay valid while the file's
+    mtime, size and the interpreter's bytecode tag are unchanged. A file that
+    changes is imported again and its entry replaced; entries of files the
+    scan no longer finds are dropped on save.
+
+    get_plugin_metadata receives the panel and may read the plugin's config
+    section, so each entry also stores a fingerprint of that section as it
+    was after the call, and the loader ignores the entry once it differs.
+    Metadata that depends on the environment is stored as not cacheable.
+
+    Entries also remember how long each loader phase took for the plugin, so
+    the loader can size its idle callbacks before measuring anything.
+    """
+
+    def __init__(self, path: str, logger: Any = None):
+        self.path = path
+        self.logger = logger
+        self.tag = sys.implementation.cache_tag
+        # plugins read from the manifest / imported, counted by the loader
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as handle:
+                data = json.loads(handle.read())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self._warn(f"Ignoring unreadable plugin manifest {self.path}: {e}")
+            self._dirty = True
+            return
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            self._dirty = True
+            return
+        entries = data.get("plugins")
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    def _warn(self, message: str) -> None:
+        if self.logger:
+            self.logger.warning(message)
+
+    def key(self, file_path: str) -> Optional[List[Any]]:
+        """
+        Returns the validity key of a plugin file: [mtime_ns, size, cache tag].
+
+        Take the key before importing the file, so an edit made during the
+        import invalidates the entry stored afterwards.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size, self.tag]
+
+    def get(self, file_path: str, key: Optional[List[Any]]) -> Optional[dict]:
+        """
+        Returns the cached entry of a plugin file, or None if it is missing or
+        stale.
+        """
+        entry = self._entries.get(file_path)
+        if entry is None or key is None or entry.get("key") != key:
+            return None
+        return entry
+
+    def put(self, file_path: str, key: Optional[List[Any]], entry: dict) -> None:
+        """
+        Stores the entry of a plugin file under the key taken before import.
+
+        Entries are deep-copied through JSON; one whose metadata does not
+        serialize is not cached, so that plugin is imported on every start.
+        """
+        if key is None:
+            return
+        try:
+            entry = json.loads(json.dumps(entry))
+        except TypeError as e:
+            self._warn(f"Plugin metadata of {file_path} is not cacheable: {e}")
+            if self._entries.pop(file_path, None) is not None:
+                self._dirty = True
+            return
+        entry["key"] = key
+        old = self._entries.get(file_path)
+        if old is not None and "cost" in old:
+            entry["cost"] = old["cost"]
+        self._entries[file_path] = entry
+        self._dirty = True
+
+    def cost(self, file_path: str, phase: str) -> Optional[float]:
+        """
+        Returns the remembered seconds of a loader phase for a plugin file.
+        Stale entries still answer: an edit rarely changes the cost much.
+        """
+        entry = self._entries.get(file_path)
+        if entry is None:
+            return None
+        return entry.get("cost", {}).get(phase)
+
+    def record_cost(self, file_path: str, phase: str, seconds: float) -> None:
+        """
+        Blends a measured phase duration into the remembered cost. The entry
+        only changes, and the manifest only needs a write, when the result
+        differs from the remembered cost by more than the tolerance.
+        """
+        entry = self._entries.get(file_path)
+        if entry is None:
+            return
+        costs = entry.setdefault("cost", {})
+        old = costs.get(phase)
+        if old is not None:
+            seconds = old + COST_SMOOTHING * (seconds - old)
+            if abs(seconds - old) <= max(COST_TOLERANCE * old, COST_MIN_CHANGE):
+                return
+        costs[phase] = round(seconds, 6)
+        self._dirty = True
+
+    def save(self, file_paths: Iterable[str]) -> None:
+        """
+        Writes the manifest if anything changed, dropping the entries of files
+        not in file_paths. The file is replaced atomically.
+
+        Args:
+            file_paths: Every plugin file found by the current scan.
+        """
+        stale = set(self._entries).difference(file_paths)
+        for file_path in stale:
+            del self._entries[file_path]
+        if not (self._dirty or stale):
+            return
+        data = {"version": MANIFEST_VERSION, "plugins": self._entries}
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "wb") as handle:
+                handle.write(json.dumps(data))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            self._warn(f"Could not write plugin manifest {self.path}: {e}")
@@ -0,0 +1,189 @@
+"""
+Opt-in startup tracer writing Chrome trace-event JSON.
+
+Set WAYPANEL_TRACE_STARTUP to an output path to record spans for the startup
+phases (config load, plugin scan and imports, sorting, plugin construction,
+CSS generation, first frame). The file can be opened in Perfetto
+(ui.perfetto.dev) or chrome://tracing. Each thread gets its own track, so the
+import workers show next to the GTK main thread, and the idle callbacks the
+loader splits its work into appear as separate spans with the gaps between
+them visible.
+
+The trace is written once the plugins have started and the first frame was
+painted, or at exit. When the variable is unset every helper here is a no-op.
+"""
+
+import atexit
+import contextlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import orjson as json
+
+TRACE_PATH = os.environ.get("WAYPANEL_TRACE_STARTUP")
+# the trace is written when all of these were reached
+MILESTONES = ("plugins-started", "first-frame")
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTracer:
+    """Collects trace events in memory until startup completes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pid = os.getpid()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._pending: Set[str] = set(MILESTONES)
+        self._lock = threading.Lock()
+        self._written = False
+        atexit.register(self.write)
+
+    @staticmethod
+    def now() -> float:
+        """Current trace timestamp in microseconds."""
+        return time.perf_counter_ns() / 1000
+
+    def _tid(self) -> int:
+        thread = threading.current_thread()
+        tid = thread.ident or 0
+        if tid not in self._threads:
+            self._threads[tid] = thread.name
+        return tid
+
+    def _add(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            event["pid"] = self.pid
+            event["tid"] = self._tid()
+            self._events.append(event)
+
+    def complete(self, name: str, start: float, cat: str = "startup", **args) -> None:
+        """Record a span that started at start (from now()) and ends now."""
+        event = {"name": name, "cat": cat, "ph": "X", "ts": start}
+        event["dur"] = self.now() - start
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str = "startup", **args):
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.complete(name, start, cat, **args)
+
+    def instant(self, name: str, cat: str = "startup", **args) -> None:
+        event = {"name": name, "cat": cat, "ph": "i", "s": "p", "ts": self.now()}
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def milestone(self, name: str) -> None:
+        """Mark a startup milestone; the trace is written after the last one."""
+        self.instant(name, cat="milestone")
+        with self._lock:
+            self._pending.discard(name)
+            ready = not self._pending
+        if ready:
+            self.write()
+
+    def write(self) -> None:
+        with self._lock:
+            if self._written:
+                return
+            self._written = True
+            events = list(self._events)
+            threads = dict(self._threads)
+        meta = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "args": {"name": "waypanel"},
+            }
+        ]
+        meta.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in threads.items()
+        )
+        data = {"traceEvents": meta + events, "displayTimeUnit": "ms"}
+        try:
+            with open(self.path, "wb") as handle:
+                handle.write(json.dumps(data))
+            logger.info(f"Startup trace with {len(events)} events written to {self.path}")
+        except OSError as e:
+            logger.error(f"Could not write startup trace {self.path}: {e}")
+
+
+_TRACER: Optional[StartupTracer] = StartupTracer(TRACE_PATH) if TRACE_PATH else None
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def enabled() -> bool:
+    return _TRACER is not None
+
+
+def now() -> float:
+    """Start timestamp for complete(), for spans that cross callbacks."""
+    return StartupTracer.now() if _TRACER is not None else 0.0
+
+
+def span(name: str, cat: str = "startup", **args):
+    """Context manager recording one span; free when tracing is off."""
+    if _TRACER is None:
+        return _NULL_SPAN
+    return _TRACER.span(name, cat, **args)
+
+
+def complete(name: str, start: float, cat: str = "startup", **args) -> None:
+    if _TRACER is not None:
+        _TRACER.complete(name, start, cat, **args)
+
+
+def instant(name: str, cat: str = "startup", **args) -> None:
+    if _TRACER is not None:
+        _TRACER.instant(name, cat, **args)
+
+
+def milestone(name: str) -> None:
+    if _TRACER is not None:
+        _TRACER.milestone(name)
+
+
+def trace_first_frame(widget: Any) -> None:
+    """
+    Record the first frame painted for a window as the "first-frame"
+    milestone, using the after-paint signal of its frame clock.
+    """
+    if _TRACER is None or widget is None:
+        return
+
+    def on_after_paint(clock):
+        clock.disconnect(handlers["paint"])
+        milestone("first-frame")
+
+    def on_realize(w):
+        if "realize" in handlers:
+            w.disconnect(handlers.pop("realize"))
+        clock = w.get_frame_clock()
+        if clock is None:
+            milestone("first-frame")
+            return
+        handlers["paint"] = clock.connect("after-paint", on_after_paint)
+
+    handlers: Dict[str, int] = {}
+    if widget.get_realized():
+        on_realize(widget)
+    else:
+        handlers["realize"] = widget.connect("realize", on_realize)
@@ -0,0 +1,180 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# i3-ipc event message types, with the event bit (1 << 31) cleared
+SWAY_EVENT_TYPES = {
+    0x00: "workspace",
+    0x01: "output",
+    0x02: "mode",
+    0x03: "window",
+    0x04: "barconfig_update",
+    0x05: "binding",
+    0x06: "shutdown",
+    0x07: "tick",
+    0x14: "bar_state_update",
+    0x15: "input",
+}
+SWAY_EVENT_BIT = 1 << 31
+
+# (sway event type, change) -> internal event names, in emission order.
+# A change of None matches events that carry no "change" field, or whose
+# change is free-form (mode names). Names without a Wayfire counterpart, or
+# whose payload has no Wayfire shape, use the "sway-" prefix so subscribers
+# can still opt in to them. A Sway window close is reported as view-closed
+# only, as before the table existed; Sway has no separate unmap.
+SWAY_EVENT_TABLE: Dict[Tuple[str, Optional[str]], Tuple[str, ...]] = {
+    ("window", "new"): ("view-mapped",),
+    ("window", "close"): ("view-closed",),
+    ("window", "focus"): ("view-focused",),
+    ("window", "title"): ("view-title-changed",),
+    ("window", "fullscreen_mode"): ("view-fullscreen",),
+    ("window", "move"): ("view-workspace-changed",),
+    ("window", "floating"): ("view-tiled",),
+    ("window", "urgent"): ("sway-view-urgent",),
+    ("window", "mark"): ("sway-view-mark",),
+    ("workspace", "init"): ("sway-workspace-init",),
+    ("workspace", "empty"): ("sway-workspace-empty",),
+    ("workspace", "focus"): ("sway-workspace-focus", "workspace-lose-focus"),
+    ("workspace", "move"): ("sway-workspace-move",),
+    ("workspace", "rename"): ("sway-workspace-rename",),
+    ("workspace", "urgent"): ("sway-workspace-urgent",),
+    ("workspace", "reload"): ("sway-workspace-reload",),
+    ("output", "unspecified"): ("sway-output-changed",),
+    ("mode", None): ("sway-mode-changed",),
+    ("barconfig_update", None): ("sway-barconfig-update",),
+    ("binding", "run"): ("sway-binding",),
+    ("shutdown", "exit"): ("sway-shutdown",),
+    ("tick", None): ("sway-tick",),
+    ("bar_state_update", None): ("sway-bar-state-update",),
+    ("input", "added"): ("sway-input-added",),
+    ("input", "removed"): ("sway-input-removed",),
+    ("input", "xkb_keymap"): ("sway-input-keymap-changed",),
+    ("input", "xkb_layout"): ("sway-input-layout-changed",),
+    ("input", "libinput_config"): ("sway-input-config-changed",),
+}
+
+# Sway container types that correspond to Wayfire toplevel views
+SWAY_VIEW_TYPES = frozenset(("con", "floating_con"))
+
+
+def _window(name: str, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    container = event.get("container")
+    if not isinstance(container, dict):
+        return None
+    if container.get("type") not in SWAY_VIEW_TYPES:
+        return None
+    return {"event": name, "view": container}
+
+
+def _workspace(name: str, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if name == "workspace-lose-focus":
+        old = event.get("old")
+        if not isinstance(old, dict) or old.get("type") != "workspace":
+            return None
+        return {"event": name, "workspace": old}
+    return {"event": name, "workspace": event.get("current"), "old": event.get("old")}
+
+
+def _output(name: str, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return {"event": name, "output": event}
+
+
+def _input(name: str, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return {"event": name, "input": event.get("input")}
+
+
+def _raw(name: str, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return {"event": name, "data": event}
+
+
+# sway event type -> builder of one internal event, or None to drop it
+SWAY_PAYLOADS: Dict[str, Callable[[str, Dict[str, Any]], Optional[Dict[str, Any]]]] = {
+    "window": _window,
+    "workspace": _workspace,
+    "output": _output,
+    "input": _input,
+}
+
+
+class CompositorAdapter:
+    """
+    Maps raw compositor events to the internal, Wayfire-shaped event stream.
+
+    One adapter is selected per compositor connection, so the per-event cost
+    is a table lookup instead of re-detecting the compositor.
+    """
+
+    name: Optional[str] = None
+
+    def translate(self, event: Any) -> List[Dict[str, Any]]:
+        """Return the internal events produced by one raw event."""
+        raise NotImplementedError
+
+    def translate_batch(self, events: List[Any]) -> List[Dict[str, Any]]:
+        """Translate a batch decoded in one reader wakeup, keeping its order."""
+        result = []
+        for event in events:
+            result.extend(self.translate(event))
+        return result
+
+
+class WayfireAdapter(CompositorAdapter):
+    """Wayfire events already use the internal shape and pass through."""
+
+    name = "wayfire"
+
+    def translate(self, event: Any) -> List[Dict[str, Any]]:
+        return [event] if event else []
+
+    def translate_batch(self, events: List[Any]) -> List[Dict[str, Any]]:
+        return [event for event in events if event]
+
+
+class SwayAdapter(CompositorAdapter):
+    """
+    Translates i3-ipc events through SWAY_EVENT_TABLE.
+
+    Raw events are (type name, payload) pairs as produced by the event
+    reader. The table is compiled once into {(type, change): [(name,
+    builder)]} so translating an event is a single dictionary lookup.
+    Events missing from the table are dropped.
+    """
+
+    name = "sway"
+
+    def __init__(self):
+        self._rules = {
+            key: tuple((name, SWAY_PAYLOADS.get(key[0], _raw)) for name in names)
+            for key, names in SWAY_EVENT_TABLE.items()
+        }
+        # types whose change field is free-form or absent
+        self._changeless = frozenset(t for t, change in SWAY_EVENT_TABLE if not change)
+
+    def translate(self, event: Any) -> List[Dict[str, Any]]:
+        try:
+            etype, payload = event
+        except (TypeError, ValueError):
+            return []
+        if not isinstance(payload, dict):
+            return []
+        change = None if etype in self._changeless else payload.get("change")
+        rules = self._rules.get((etype, change))
+        if not rules:
+            return []
+        result = []
+        for name, build in rules:
+            translated = build(name, payload)
+            if translated is not None:
+                result.append(translated)
+        return result
+
+
+ADAPTERS = {"wayfire": WayfireAdapter, "sway": SwayAdapter}
+
+
+def get_adapter(compositor: Optional[str]) -> CompositorAdapter:
+    """
+    Return the adapter for a compositor name.
+
+    Unknown or missing names get the pass-through Wayfire adapter.
+    """
+    return ADAPTERS.get(compositor or "", WayfireAdapter)()
@@ -0,0 +1,225 @@
+import asyncio
+import collections
+import socket
+import struct
+import time
+from typing import Any, Deque, Dict, Hashable, List, Optional
+from src.ipc.framing import NDJSON
+
+OVERFLOW_POLICIES = ("drop-oldest", "coalesce-by-key", "disconnect")
+
+
+def event_key(event: Any) -> Optional[Hashable]:
+    """
+    Compute the coalescing key of an event.
+
+    Events about the same view or output can replace each other while they
+    are still queued; everything else is not coalescable.
+
+    Args:
+        event: The parsed event dict.
+
+    Returns:
+        A (event type, object id) tuple, or None when the event has no key.
+    """
+    if not isinstance(event, dict):
+        return None
+    etype = event.get("event")
+    view = event.get("view")
+    if isinstance(view, dict) and "id" in view:
+        return (etype, "view", view["id"])
+    output = event.get("output")
+    if isinstance(output, dict) and "id" in output:
+        return (etype, "output", output["id"])
+    if isinstance(output, int):
+        return (etype, "output", output)
+    return None
+
+
+class ClientChannel:
+    """
+    Bounded outgoing queue and writer task for a single waypanel.sock client.
+
+    Broadcasting only appends to the ring buffer, so a slow or stuck reader
+    can never stall delivery to the other clients. When the buffer is full the
+    configured overflow policy decides what happens:
+
+    - ``drop-oldest``: discard the oldest queued message.
+    - ``coalesce-by-key``: replace a queued message with the same
+      (event type, view/output id) key, otherwise discard the oldest.
+      Below the limit messages are queued as they come, as with the other
+      policies.
+    - ``disconnect``: close the connection.
+    """
+
+    _next_id = 0
+
+    def __init__(
+        self,
+        writer: asyncio.StreamWriter,
+        logger,
+        maxsize: int = 1024,
+        policy: str = "drop-oldest",
+    ):
+        """
+        Args:
+            writer: The asyncio stream writer of the connected client.
+            logger: Logger used for overflow and write errors.
+            maxsize: Maximum number of queued messages.
+            policy: One of OVERFLOW_POLICIES.
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        ClientChannel._next_id += 1
+        self.id = ClientChannel._next_id
+        self.writer = writer
+        self.logger = logger
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.pid = self._peer_pid(writer)
+        self.connected_at = time.time()
+        self.closed = False
+        # optional EventFilter set by the client's 'subscribe' command
+        self.filter = None
+        # wire format, switched by the client's 'set_framing' command
+        self.codec = NDJSON
+        # request id -> task of the requests in flight on this connection
+        self.requests: Dict[Any, asyncio.Task] = {}
+        # each entry is a mutable [key, payload, enqueue_time] cell so that
+        # coalescing can swap the payload without moving it in the queue
+        self._queue: Deque[List[Any]] = collections.deque()
+        self._keyed: Dict[Hashable, List[Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.max_lag = 0.0
+
+    @staticmethod
+    def _peer_pid(writer: asyncio.StreamWriter) -> Optional[int]:
+        sock = writer.get_extra_info("socket")
+        if sock is None or not hasattr(socket, "SO_PEERCRED"):
+            return None
+        try:
+            creds = sock.getsockopt(
+                socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+            )
+            return struct.unpack("3i", creds)[0]
+        except OSError:
+            return None
+
+    def start(self) -> None:
+        """Start the writer task on the running loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._writer_loop())
+
+    def enqueue(
+        self, payload: bytes, key: Optional[Hashable] = None, force: bool = False
+    ) -> bool:
+        """
+        Queue a serialized message without blocking.
+
+        Args:
+            payload: The bytes to send, including the frame delimiter.
+            key: Optional coalescing key, see event_key.
+            force: Queue even when full, bypassing the overflow policy; for
+                control replies that must not be lost.
+
+        Returns:
+            bool: False if the client was disconnected by the overflow policy.
+        """
+        if self.closed:
+            return False
+        self.enqueued += 1
+        if len(self._queue) >= self.maxsize and not force:
+            if key is not None and self.policy == "coalesce-by-key":
+                cell = self._keyed.get(key)
+                if cell is not None:
+                    cell[1] = payload
+                    self.coalesced += 1
+                    return True
+            if self.policy == "disconnect":
+                self.logger.warning(
+                    f"IPC client {self.id} (pid {self.pid}) overflowed its queue; disconnecting."
+                )
+                self.close()
+                return False
+            old = self._queue.popleft()
+            if old[0] is not None and self._keyed.get(old[0]) is old:
+                del self._keyed[old[0]]
+            self.dropped += 1
+        cell = [key, payload, time.monotonic()]
+        self._queue.append(cell)
+        if key is not None and self.policy == "coalesce-by-key":
+            self._keyed[key] = cell
+        depth = len(self._queue)
+        if depth > self.max_depth:
+            self.max_depth = depth
+        self._wakeup.set()
+        return True
+
+    async def _writer_loop(self) -> None:
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                # write everything that is pending, then drain once
+                now = time.monotonic()
+                lag = now - self._queue[0][2]
+                if lag > self.max_lag:
+                    self.max_lag = lag
+                count = 0
+                while self._queue:
+                    cell = self._queue.popleft()
+                    if cell[0] is not None and self._keyed.get(cell[0]) is cell:
+                        del self._keyed[cell[0]]
+                    self.writer.write(cell[1])
+                    count += 1
+                await self.writer.drain()
+                self.sent += count
+        except (ConnectionResetError, BrokenPipeError):
+            self.logger.warning(f"IPC client {self.id} disconnected during write.")
+        finally:
+            self.closed = True
+
+    def close(self) -> None:
+        """Stop the writer task and close the underlying transport."""
+        if self.closed and self._task is None:
+            return
+        self.closed = True
+        self._queue.clear()
+        self._keyed.clear()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return lag and drop counters for this client."""
+        lag = time.monotonic() - self._queue[0][2] if self._queue else 0.0
+        return {
+            "id": self.id,
+            "pid": self.pid,
+            "policy": self.policy,
+            "codec": self.codec.name,
+            "filter": self.filter.describe() if self.filter is not None else None,
+            "connected_at": int(self.connected_at),
+            "queue_depth": len(self._queue),
+            "queue_max_depth": self.max_depth,
+            "queue_size": self.maxsize,
+            "lag_ms": round(lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "requests_in_flight": len(self.requests),
+        }
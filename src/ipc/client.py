@@ -1,15 +1,21 @@
+import random
 import socket
-import orjson as json
 from gi.repository import GLib
 from typing import Any, Dict, Optional
+from src.ipc.framing import NDJSON
 
 
 class WayfireClientIPC:
+    READ_SIZE = 65536
+    MAX_READS_PER_WAKEUP = 16
+
     def __init__(self, handle_event, panel_instance):
         """
         Initialize the Wayfire IPC client for communication with the compositor.
 
-        Establishes an event-driven socket reader using GLib.
+        Establishes an event-driven socket reader using GLib. A hang-up or
+        socket error schedules a reconnect with jittered exponential backoff,
+        so there is no periodic connection polling.
 
         Args:
             handle_event: Callback function to process incoming IPC events.
@@ -19,22 +25,52 @@ class WayfireClientIPC:
         self.logger = self.obj.logger
         self.client_socket: Optional[socket.socket] = None
         self.source: Optional[int] = None
-        # buffer must be bytes to handle partial multi-byte character streams correctly
-        self.buffer: bytes = b""
+        # incremental NDJSON framer over a reusable buffer
+        self.decoder = NDJSON.decoder(
+            size=self.READ_SIZE, on_error=self._on_decode_error
+        )
         self.socket_path: Optional[str] = None
         self.handle_event = handle_event
-
-        # Check connection status periodically
-        GLib.timeout_add_seconds(3, self.is_connected)
+        self.backoff_initial = 0.1
+        self.backoff_max = 10.0
+        self._backoff = self.backoff_initial
+        self._reconnect_id: Optional[int] = None
+        self._closing = False
 
     def is_connected(self) -> bool:
+        """Whether the socket is currently connected and watched."""
+        return self.client_socket is not None and self.source is not None
+
+    def _schedule_reconnect(self) -> None:
         """
-        Checks connection status and attempts reconnection if necessary.
+        Retry the connection after a jittered, exponentially growing delay.
         """
-        if not self.obj.ipc.is_connected():
-            if self.socket_path:
-                self.wayfire_events_setup(self.socket_path)
-        return True
+        if self._closing or self._reconnect_id or not self.socket_path:
+            return
+        delay = self._backoff / 2 + random.random() * self._backoff / 2
+        self._backoff = min(self._backoff * 2, self.backoff_max)
+        self.logger.info(f"Reconnecting to {self.socket_path} in {delay:.2f}s")
+        self._reconnect_id = GLib.timeout_add(int(delay * 1000), self._reconnect)
+
+    def _reconnect(self) -> bool:
+        self._reconnect_id = None
+        self.connect_socket(self.socket_path)  # pyright: ignore
+        return GLib.SOURCE_REMOVE
+
+    def _connection_lost(self, reason: str) -> int:
+        """Drop the dead socket and start reconnecting."""
+        self.logger.warning(f"{reason}; reconnecting.")
+        # the watch is removed by returning SOURCE_REMOVE, not source_remove
+        self.source = None
+        if self.client_socket:
+            try:
+                self.client_socket.close()
+            except Exception:
+                pass
+            self.client_socket = None
+        self.decoder.reset()
+        self._schedule_reconnect()
+        return GLib.SOURCE_REMOVE
 
     def connect_socket(self, socket_path: str) -> None:
         """
@@ -43,6 +79,7 @@ class WayfireClientIPC:
         Args:
             socket_path: Path to the Unix socket file.
         """
+        self._closing = False
         try:
             self.socket_path = socket_path
             self.client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
@@ -54,9 +91,10 @@ class WayfireClientIPC:
             self.source = GLib.io_add_watch(
                 self.client_socket,
                 GLib.PRIORITY_DEFAULT,
-                GLib.IO_IN,
+                GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR,
                 self.handle_socket_event,
             )
+            self._backoff = self.backoff_initial
             self.logger.info(f"Successfully connected to Unix socket: {socket_path}")
         except FileNotFoundError:
             self.logger.error(f"Socket file not found: {socket_path}")
@@ -65,16 +103,21 @@ class WayfireClientIPC:
         except Exception as e:
             self.logger.error(f"Unexpected error connecting to socket: {e}")
         finally:
-            if not self.source and self.client_socket:
-                self.client_socket.close()
-                self.client_socket = None
+            if not self.source:
+                if self.client_socket:
+                    self.client_socket.close()
+                    self.client_socket = None
+                self._schedule_reconnect()
 
     def handle_socket_event(self, fd: socket.socket, condition: int) -> int:
         """
-        Reads raw bytes from the socket, buffers them, and extracts line-based JSON events.
+        Receives everything available on the socket and dispatches every
+        complete line-based JSON event.
 
-        This method fixes the previous architectural flaw where partial multi-byte
-        characters could be corrupted by premature decoding.
+        Bytes go straight into the decoder's preallocated buffer via
+        recv_into, and all messages are decoded in one pass per wakeup, so a
+        burst costs linear time instead of one buffer copy per event. Partial
+        multi-byte characters stay buffered until their line is complete.
 
         Args:
             fd: The socket file descriptor.
@@ -83,45 +126,32 @@ class WayfireClientIPC:
         Returns:
             int: GLib.SOURCE_CONTINUE (True) or GLib.SOURCE_REMOVE (False).
         """
+        if condition & (GLib.IO_HUP | GLib.IO_ERR) and not condition & GLib.IO_IN:
+            return self._connection_lost("Socket hung up")
+        closed = False
         try:
-            # Read raw bytes. 4096 is a standard page size, better for throughput than 1024.
-            chunk: bytes = fd.recv(4096)
-
-            if not chunk:
-                self.logger.warning("Socket closed by peer; removing source.")
-                return GLib.SOURCE_REMOVE
-
-            self.buffer += chunk
-
-            # Process all complete messages currently in the buffer
-            while b"\n" in self.buffer:
-                line, self.buffer = self.buffer.split(b"\n", 1)
-
-                # strip() on bytes removes whitespace bytes like \r, \t, etc.
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    # Direct bytes-to-dict parsing via orjson (Zero-Copy optimization)
-                    event: Dict[str, Any] = json.loads(line)
-                    self.process_event(event)
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"JSON decode error: {e}")
-                    # Log the raw bytes for debugging, safely decoded
-                    self.logger.debug(
-                        f"Failed payload: {line.decode('utf-8', errors='replace')}"
-                    )
-
-            return GLib.SOURCE_CONTINUE
-
+            # bounded so a flood cannot starve the GTK main loop
+            for _ in range(self.MAX_READS_PER_WAKEUP):
+                if not self.decoder.recv_into(fd, self.READ_SIZE):
+                    closed = True
+                    break
         except BlockingIOError:
             # Resource temporarily unavailable (normal in non-blocking mode)
-            return GLib.SOURCE_CONTINUE
-
+            pass
         except Exception as e:
             self.logger.error(f"Critical socket error: {e}", exc_info=True)
-            return GLib.SOURCE_REMOVE
+            return self._connection_lost("Socket error")
+
+        for event in self.decoder.drain():
+            self.process_event(event)
+        if closed:
+            return self._connection_lost("Socket closed by peer")
+        return GLib.SOURCE_CONTINUE
+
+    def _on_decode_error(self, error: Exception, payload: bytes) -> None:
+        self.logger.error(f"JSON decode error: {error}")
+        # Log the raw bytes for debugging, safely decoded
+        self.logger.debug(f"Failed payload: {payload.decode('utf-8', errors='replace')}")
 
     def process_event(self, event: Dict[str, Any]) -> None:
         """
@@ -136,6 +166,10 @@ class WayfireClientIPC:
         """
         Gracefully disconnect and cleanup resources.
         """
+        self._closing = True
+        if self._reconnect_id:
+            GLib.source_remove(self._reconnect_id)
+            self._reconnect_id = None
         if self.source:
             GLib.source_remove(self.source)
             self.source = None
@@ -147,7 +181,7 @@ class WayfireClientIPC:
                 pass
             self.client_socket = None
 
-        self.buffer = b""
+        self.decoder.reset()
 
     def wayfire_events_setup(self, socket_path: str) -> None:
         """
@@ -0,0 +1,119 @@
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+# predicate name -> where to look it up in an event
+FIELD_PREDICATES = ("app-id", "output-id", "role")
+
+
+def _as_frozenset(value: Any) -> FrozenSet[Any]:
+    if value is None:
+        return frozenset()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return frozenset(value)
+    return frozenset((value,))
+
+
+def _event_field(event: Dict[str, Any], field: str) -> Any:
+    """Resolve a predicate field from the view or output carried by an event."""
+    view = event.get("view")
+    if field in ("app-id", "role"):
+        return view.get(field) if isinstance(view, dict) else None
+    if field == "output-id":
+        if isinstance(view, dict) and "output-id" in view:
+            return view["output-id"]
+        output = event.get("output")
+        if isinstance(output, dict):
+            return output.get("id")
+        return output
+    return None
+
+
+class EventFilter:
+    """
+    Immutable, hashable subscription filter for waypanel.sock clients.
+
+    Clients with equal filters share one match evaluation per event, so the
+    server only needs to test each distinct filter once.
+
+    A filter spec is a dict such as::
+
+        {"events": ["view-focused"], "prefixes": ["output-"], "app-id": "kitty"}
+
+    An event passes when its type is listed in ``events`` or starts with one
+    of ``prefixes`` (both empty means any type), and every field predicate
+    matches. Predicate values may be a single value or a list of values.
+    """
+
+    __slots__ = ("events", "prefixes", "predicates", "_hash")
+
+    def __init__(
+        self,
+        events: Optional[list] = None,
+        prefixes: Optional[list] = None,
+        predicates: Optional[Dict[str, Any]] = None,
+    ):
+        self.events: FrozenSet[str] = _as_frozenset(events)
+        self.prefixes: Tuple[str, ...] = tuple(sorted(_as_frozenset(prefixes)))
+        self.predicates: Tuple[Tuple[str, FrozenSet[Any]], ...] = tuple(
+            sorted(
+                (field, _as_frozenset(value))
+                for field, value in (predicates or {}).items()
+            )
+        )
+        self._hash = hash((self.events, self.prefixes, self.predicates))
+
+    @classmethod
+    def from_spec(cls, spec: Any) -> "EventFilter":
+        """
+        Build a filter from the arguments of a ``subscribe`` command.
+
+        Args:
+            spec: A filter dict, or a list holding a single filter dict.
+
+        Raises:
+            ValueError: If the spec is malformed or uses unknown predicates.
+        """
+        if isinstance(spec, list):
+            spec = spec[0] if spec else {}
+        if not isinstance(spec, dict):
+            raise ValueError("subscribe expects a filter object")
+        unknown = set(spec) - {"events", "prefixes", *FIELD_PREDICATES}
+        if unknown:
+            raise ValueError(f"Unknown filter keys: {', '.join(sorted(unknown))}")
+        predicates = {f: spec[f] for f in FIELD_PREDICATES if f in spec}
+        return cls(spec.get("events"), spec.get("prefixes"), predicates)
+
+    def matches(self, event: Any) -> bool:
+        """Return True if the event should be delivered to this subscription."""
+        if not isinstance(event, dict):
+            return False
+        if self.events or self.prefixes:
+            etype = event.get("event")
+            if not isinstance(etype, str):
+                return False
+            if etype not in self.events and not etype.startswith(self.prefixes):
+                return False
+        for field, accepted in self.predicates:
+            if _event_field(event, field) not in accepted:
+                return False
+        return True
+
+    def describe(self) -> Dict[str, Any]:
+        """Return the filter in the same shape accepted by from_spec."""
+        spec: Dict[str, Any] = {
+            "events": sorted(self.events),
+            "prefixes": list(self.prefixes),
+        }
+        for field, accepted in self.predicates:
+            spec[field] = sorted(accepted, key=str)
+        return spec
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, EventFilter)
+            and self.events == other.events
+            and self.prefixes == other.prefixes
+            and self.predicates == other.predicates
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
@@ -0,0 +1,284 @@
+import asyncio
+import struct
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson as json
+
+FRAMINGS = ("ndjson", "length-prefixed")
+ENCODINGS = ("json", "msgpack")
+LENGTH_HEADER = 4
+_LENGTH = struct.Struct("<I")
+# refuse frames larger than this instead of buffering them
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+def _msgpack():
+    try:
+        import msgpack  # pyright: ignore
+    except ImportError:
+        return None
+    return msgpack
+
+
+class Codec:
+    """
+    One wire format of waypanel.sock: a framing plus a body encoding.
+
+    Codecs are shared singletons obtained from get_codec, so the server can
+    serialize an event once per codec in use rather than once per client.
+
+    - ``ndjson``: one JSON document per line; the default, and the
+      recommended format.
+    - ``length-prefixed``: a 4-byte little-endian body size, then the body,
+      as on the Wayfire socket. Receivers never scan for delimiters.
+
+    Length-prefixed framing is for clients that already frame the Wayfire
+    socket this way or want msgpack bodies. It is not a throughput option:
+    with JSON bodies, body parsing dominates and it decodes no faster than
+    NDJSON (see tools/bench_framing.py).
+    """
+
+    __slots__ = ("framing", "encoding", "_dumps", "_loads")
+
+    def __init__(
+        self,
+        framing: str,
+        encoding: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[Any], Any],
+    ):
+        self.framing = framing
+        self.encoding = encoding
+        self._dumps = dumps
+        self._loads = loads
+
+    @property
+    def name(self) -> str:
+        return f"{self.framing}/{self.encoding}"
+
+    def encode(self, message: Any) -> bytes:
+        """Serialize a message into one complete frame."""
+        body = self._dumps(message)
+        if self.framing == "ndjson":
+            return body + b"\n"
+        return _LENGTH.pack(len(body)) + body
+
+    def decode(self, body: Any) -> Any:
+        """Parse one frame body (without delimiter or length header)."""
+        return self._loads(body)
+
+    async def read(self, reader: asyncio.StreamReader) -> Optional[Any]:
+        """
+        Read and parse the next message from a stream.
+
+        Returns:
+            The message, or None at end of stream.
+
+        Raises:
+            ValueError: On an oversized frame or a body that does not parse.
+        """
+        if self.framing == "ndjson":
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return None
+                if line.strip():
+                    return self._loads(line)
+        try:
+            header = await reader.readexactly(LENGTH_HEADER)
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise
+        size = int.from_bytes(header, "little")
+        if size > MAX_FRAME_SIZE:
+            raise ValueError(f"Frame of {size} bytes exceeds {MAX_FRAME_SIZE}")
+        return self._loads(await reader.readexactly(size))
+
+    def decoder(self, **kwargs) -> "FrameDecoder":
+        """Return an incremental decoder for a stream in this format."""
+        return FrameDecoder(self, **kwargs)
+
+
+class FrameDecoder:
+    """
+    Incremental decoder for clients reading waypanel.sock in chunks.
+
+    Bytes are received into one preallocated bytearray, either copied in by
+    feed() or written straight from the socket by recv_into(). drain() then
+    walks the pending bytes once, decodes every complete message and only
+    moves the start offset, so a burst costs linear time. The unconsumed
+    tail is moved to the front only when the free space runs out, and the
+    buffer only grows for a message larger than itself.
+    """
+
+    def __init__(
+        self,
+        codec: Codec,
+        size: int = 65536,
+        on_error: Optional[Callable[[Exception, bytes], None]] = None,
+    ):
+        """
+        Args:
+            codec: The wire format of the stream.
+            size: Initial buffer capacity in bytes.
+            on_error: Called with the error and the raw body of a message
+                that fails to parse; the message is skipped. Without it the
+                error propagates out of drain().
+        """
+        self.codec = codec
+        self.on_error = on_error
+        self._buffer = bytearray(max(size, 64))
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of received bytes not yet consumed."""
+        return self._end - self._start
+
+    def reset(self) -> None:
+        """Discard any pending bytes, e.g. after the connection dropped."""
+        self._start = self._end = 0
+
+    def _reserve(self, size: int) -> None:
+        """Make room for at least size bytes after the pending data."""
+        if len(self._buffer) - self._end >= size:
+            return
+        pending = self._end - self._start
+        capacity = len(self._buffer)
+        if pending + size > capacity:
+            while capacity < pending + size:
+                capacity *= 2
+            buffer = bytearray(capacity)
+            buffer[:pending] = self._view[self._start : self._end]
+            self._view.release()
+            self._buffer = buffer
+            self._view = memoryview(buffer)
+        elif pending:
+            self._view[:pending] = bytes(self._view[self._start : self._end])
+        self._start, self._end = 0, pending
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Append received bytes and return every complete message."""
+        size = len(data)
+        self._reserve(size)
+        self._view[self._end : self._end + size] = data
+        self._end += size
+        return self.drain()
+
+    def recv_into(self, sock, size: int = 65536) -> int:
+        """
+        Receive directly into the buffer with a single recv_into call.
+
+        Returns:
+            int: The number of bytes read; 0 means the peer closed.
+
+        Raises:
+            BlockingIOError: From a non-blocking socket with nothing to read.
+        """
+        self._reserve(size)
+        count = sock.recv_into(self._view[self._end :])
+        self._end += count
+        return count
+
+    def drain(self) -> List[Any]:
+        """Decode and consume every complete message received so far."""
+        if self._start == self._end:
+            return []
+        if self.codec.framing == "ndjson":
+            messages = self._split_lines()
+        else:
+            messages = self._split_frames()
+        if self._start == self._end:
+            self._start = self._end = 0
+        return messages
+
+    def _load(self, messages: List[Any], body: memoryview) -> None:
+        try:
+            messages.append(self.codec._loads(body))
+        except Exception as e:
+            if self.on_error is None:
+                raise
+            self.on_error(e, bytes(body))
+
+    def _split_lines(self) -> List[Any]:
+        buffer = self._buffer
+        view = self._view
+        load = self._load
+        messages: List[Any] = []
+        start, end = self._start, self._end
+        try:
+            while True:
+                newline = buffer.find(b"\n", start, end)
+                if newline < 0:
+                    break
+                line_start, start = start, newline + 1
+                if newline > line_start:
+                    load(messages, view[line_start:newline])
+        finally:
+            self._start = start
+        return messages
+
+    def _split_frames(self) -> List[Any]:
+        buffer = self._buffer
+        view = self._view
+        load = self._load
+        unpack = _LENGTH.unpack_from
+        messages: List[Any] = []
+        offset, end = self._start, self._end
+        try:
+            while end - offset >= LENGTH_HEADER:
+                (size,) = unpack(buffer, offset)
+                if size > MAX_FRAME_SIZE:
+                    raise ValueError(f"Frame of {size} bytes exceeds {MAX_FRAME_SIZE}")
+                start = offset + LENGTH_HEADER
+                if end - start < size:
+                    break
+                offset = start + size
+                load(messages, view[start:offset])
+        finally:
+            self._start = offset
+        return messages
+
+
+_CODECS: Dict[Tuple[str, str], Codec] = {}
+
+
+def available_encodings() -> List[str]:
+    """Body encodings usable in this process; msgpack is optional."""
+    return [e for e in ENCODINGS if e != "msgpack" or _msgpack() is not None]
+
+
+def get_codec(framing: str = "ndjson", encoding: str = "json") -> Codec:
+    """
+    Return the shared codec for a framing and body encoding.
+
+    Raises:
+        ValueError: If the combination is unknown or msgpack is requested
+            without the msgpack package installed. NDJSON only carries JSON.
+    """
+    key = (framing, encoding)
+    codec = _CODECS.get(key)
+    if codec is not None:
+        return codec
+    if framing not in FRAMINGS:
+        raise ValueError(f"Unknown framing: {framing}")
+    if encoding == "json":
+        dumps, loads = json.dumps, json.loads
+    elif encoding == "msgpack":
+        if framing == "ndjson":
+            raise ValueError("msgpack bodies require length-prefixed framing")
+        msgpack = _msgpack()
+        if msgpack is None:
+            raise ValueError("msgpack encoding requires the msgpack package")
+        dumps = msgpack.packb
+        loads = lambda body: msgpack.unpackb(body, raw=False)  # noqa: E731
+    else:
+        raise ValueError(f"Unknown encoding: {encoding}")
+    codec = _CODECS[key] = Codec(framing, encoding, dumps, loads)
+    return codec
+
+
+NDJSON = get_codec()
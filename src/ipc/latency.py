@@ -0,0 +1,125 @@
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in microseconds, in the style of HDR
+    histograms.
+
+    Values are grouped into power-of-two ranges, each split into
+    2 ** (SUB_BUCKET_BITS - 1) linear sub-buckets, so every recorded value is
+    kept within about 3% while memory stays proportional to the number of
+    distinct buckets hit. Recording is O(1).
+    """
+
+    SUB_BUCKET_BITS = 6
+    _HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        if shift <= 0:
+            return value
+        return shift * cls._HALF + (value >> shift)
+
+    @classmethod
+    def _highest_equivalent(cls, index: int) -> int:
+        if index < (1 << cls.SUB_BUCKET_BITS):
+            return index
+        shift = index // cls._HALF - 1
+        mantissa = index - shift * cls._HALF
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_us: int) -> None:
+        """Record one latency sample in microseconds."""
+        if value_us < 0:
+            value_us = 0
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value_us
+        if self.min is None or value_us < self.min:
+            self.min = value_us
+        if value_us > self.max:
+            self.max = value_us
+
+    def percentile(self, percentile: float) -> int:
+        """Return the value below which the given percentage of samples fall."""
+        if not self.count:
+            return 0
+        wanted = max(1, round(self.count * percentile / 100.0))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= wanted:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "count": self.count,
+            "mean_us": round(self.total / self.count, 1) if self.count else 0,
+            "min_us": self.min or 0,
+            "max_us": self.max,
+        }
+        for percentile in PERCENTILES:
+            result[f"p{percentile:g}_us"] = self.percentile(percentile)
+        return result
+
+
+class LatencyTracker:
+    """
+    Thread-safe set of latency histograms keyed by (stage, key).
+
+    Stages used by the event pipeline:
+
+    - ``delivery``: compositor read to GTK-thread delivery, per event type.
+    - ``dispatch``: compositor read to event_manager dispatch, per event type.
+    - ``subscriber``: compositor read to subscriber return, per plugin.
+    - ``subscriber_time``: time spent inside the subscriber, per plugin.
+    - ``gtk``: compositor read to the first idle GTK iteration after all
+      subscribers ran, i.e. after the updates they queued, per event type.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Hashable], LatencyHistogram] = {}
+
+    def record(self, stage: str, key: Hashable, elapsed_ns: int) -> None:
+        """Record a sample measured in nanoseconds."""
+        with self._lock:
+            histogram = self._histograms.get((stage, key))
+            if histogram is None:
+                histogram = self._histograms[(stage, key)] = LatencyHistogram()
+            histogram.record(elapsed_ns // 1000)
+
+    def snapshot(self, stage: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize the histograms as {stage: {key: summary}}.
+
+        Args:
+            stage: Only include this stage when given.
+        """
+        with self._lock:
+            items = list(self._histograms.items())
+            result: Dict[str, Dict[str, Any]] = {}
+            for (name, key), histogram in items:
+                if stage is None or name == stage:
+                    result.setdefault(name, {})[str(key)] = histogram.summary()
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
@@ -0,0 +1,232 @@
+import asyncio
+import os
+import random
+import struct
+import orjson as json
+from typing import Any, Awaitable, Callable, List, Optional
+from src.ipc.adapter import SWAY_EVENT_BIT, SWAY_EVENT_TYPES
+
+WAYFIRE_HEADER = 4
+SWAY_MAGIC = b"i3-ipc"
+SWAY_HEADER = struct.Struct("=6sII")
+SWAY_SUBSCRIBE = 2
+SWAY_EVENTS = sorted(SWAY_EVENT_TYPES.values())
+READ_SIZE = 65536
+
+
+def detect_compositor() -> tuple[Optional[str], Optional[str]]:
+    """
+    Resolve the running compositor and its IPC socket path from the environment.
+
+    Returns:
+        tuple: ("wayfire" | "sway", socket path), or (None, None) when no
+        supported compositor socket is advertised.
+    """
+    if os.getenv("WAYFIRE_SOCKET"):
+        return "wayfire", os.environ["WAYFIRE_SOCKET"]
+    if os.getenv("SWAYSOCK"):
+        return "sway", os.environ["SWAYSOCK"]
+    return None, None
+
+
+def jittered(delay: float) -> float:
+    """
+    Spread a backoff delay over [delay / 2, delay].
+
+    Keeps clients that lost the compositor at the same moment from all
+    reconnecting in lockstep.
+    """
+    return delay / 2 + random.random() * delay / 2
+
+
+class CompositorEventReader:
+    """
+    asyncio-native reader for the compositor event stream.
+
+    Connects with asyncio.open_unix_connection, subscribes to events and then
+    decodes every complete frame available after each wakeup, handing them to
+    the consumer as one batch. Connection loss (EOF or a socket error) is
+    handled inside the run() task with jittered exponential backoff, so no
+    thread, polling timer or blocking sleep is involved.
+    """
+
+    def __init__(
+        self,
+        logger,
+        on_batch: Callable[[List[Any]], None],
+        compositor: Optional[str] = None,
+        path: Optional[str] = None,
+        backoff_initial: float = 0.05,
+        backoff_max: float = 10.0,
+        on_connect: Optional[Callable[[bool], Awaitable[None]]] = None,
+    ):
+        """
+        Args:
+            logger: Logger for connection state changes.
+            on_batch: Called on the loop with the list of events decoded in
+                one wakeup.
+            compositor: "wayfire" or "sway"; detected from the environment
+                when omitted.
+            path: Compositor IPC socket path; detected when omitted.
+            backoff_initial: First reconnect delay in seconds.
+            backoff_max: Upper bound for the reconnect delay in seconds.
+            on_connect: Awaited after every successful subscription with
+                True when it follows a lost connection. Events are not read
+                until it returns, so anything it queues comes first.
+        """
+        self.logger = logger
+        self.on_batch = on_batch
+        if compositor is None or path is None:
+            compositor, path = detect_compositor()
+        self.compositor = compositor
+        self.path = path
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.on_connect = on_connect
+        self.connected = False
+        self.reconnects = 0
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def run(self) -> None:
+        """Connect, read until the connection drops, and reconnect forever."""
+        if not self.compositor:
+            self.logger.error("No compositor IPC socket found; event reader idle.")
+            return
+        delay = self.backoff_initial
+        was_connected = False
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(self.path)
+                await self._subscribe(reader, self._writer)
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                wait = jittered(delay)
+                self.logger.error(
+                    f"Compositor event socket unavailable, retrying in {wait:.2f}s: {e}"
+                )
+                await asyncio.sleep(wait)
+                delay = min(delay * 2, self.backoff_max)
+                continue
+
+            self.connected = True
+            self.logger.info(f"Watching {self.compositor} events on {self.path}")
+            if self.on_connect is not None:
+                try:
+                    await self.on_connect(was_connected)
+                except Exception as e:
+                    self.logger.error(f"Compositor connect hook failed: {e}")
+            was_connected = True
+            received = 0
+            try:
+                received = await self._read_loop(reader)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Event read failed: {e}")
+            finally:
+                self.connected = False
+                self.close()
+            # a connection that delivered events was healthy; start over from
+            # the shortest delay, otherwise keep backing off
+            if received:
+                delay = self.backoff_initial
+            self.reconnects += 1
+            wait = jittered(delay)
+            self.logger.warning(
+                f"Compositor event socket closed; reconnecting in {wait:.2f}s."
+            )
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, self.backoff_max)
+
+    async def _subscribe(self, reader, writer) -> None:
+        if self.compositor == "wayfire":
+            body = json.dumps({"method": "window-rules/events/watch", "data": {}})
+            writer.write(len(body).to_bytes(WAYFIRE_HEADER, "little") + body)
+            await writer.drain()
+            size = int.from_bytes(await reader.readexactly(WAYFIRE_HEADER), "little")
+            reply = json.loads(await reader.readexactly(size))
+            if reply.get("result") != "ok":
+                raise ValueError(f"watch rejected: {reply}")
+        else:
+            body = json.dumps(SWAY_EVENTS)
+            writer.write(SWAY_HEADER.pack(SWAY_MAGIC, len(body), SWAY_SUBSCRIBE) + body)
+            await writer.drain()
+            _, size, _ = SWAY_HEADER.unpack(await reader.readexactly(SWAY_HEADER.size))
+            reply = json.loads(await reader.readexactly(size))
+            if not reply.get("success"):
+                raise ValueError(f"subscribe rejected: {reply}")
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> int:
+        """Read until EOF and return the number of events delivered."""
+        buffer = bytearray()
+        parse = (
+            self._parse_wayfire if self.compositor == "wayfire" else self._parse_sway
+        )
+        received = 0
+        while True:
+            chunk = await reader.read(READ_SIZE)
+            if not chunk:
+                return received
+            buffer += chunk
+            events, consumed = parse(buffer)
+            if consumed:
+                del buffer[:consumed]
+            if events:
+                received += len(events)
+                self.on_batch(events)
+
+    @staticmethod
+    def _parse_wayfire(buffer: bytearray) -> tuple[List[Any], int]:
+        """Decode all complete length-prefixed frames at the start of buffer."""
+        events = []
+        view = memoryview(buffer)
+        offset = 0
+        end = len(buffer)
+        try:
+            while end - offset >= WAYFIRE_HEADER:
+                size = int.from_bytes(view[offset : offset + WAYFIRE_HEADER], "little")
+                start = offset + WAYFIRE_HEADER
+                if end - start < size:
+                    break
+                events.append(json.loads(view[start : start + size]))
+                offset = start + size
+        finally:
+            view.release()
+        return events, offset
+
+    @staticmethod
+    def _parse_sway(buffer: bytearray) -> tuple[List[Any], int]:
+        """
+        Decode all complete i3-ipc frames at the start of buffer.
+
+        Sway only names the event type in the frame header, so each event is
+        returned as a (type name, payload) pair for the SwayAdapter.
+        """
+        events = []
+        view = memoryview(buffer)
+        offset = 0
+        end = len(buffer)
+        try:
+            while end - offset >= SWAY_HEADER.size:
+                magic, size, msg_type = SWAY_HEADER.unpack_from(view, offset)
+                if magic != SWAY_MAGIC:
+                    raise ValueError("Corrupted i3-ipc frame header")
+                start = offset + SWAY_HEADER.size
+                if end - start < size:
+                    break
+                events.append(
+                    (
+                        SWAY_EVENT_TYPES.get(msg_type & ~SWAY_EVENT_BIT),
+                        json.loads(view[start : start + size]),
+                    )
+                )
+                offset = start + size
+        finally:
+            view.release()
+        return events, offset
+
+    def close(self) -> None:
+        """Close the current compositor connection, if any."""
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            self._writer = None
@@ -1,88 +1,338 @@
 import os
 import asyncio
-import orjson as json
+import collections
+import gzip
+import inspect
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+import orjson as json
+from gi.repository import GLib  # pyright: ignore
 from src.core.compositor.ipc import IPC
 from src.plugins.core._event_loop import get_global_loop
-from src.ipc.utils import translate_ipc
+from src.ipc.adapter import get_adapter
+from src.ipc.channel import ClientChannel, event_key
+from src.ipc.filters import EventFilter
+from src.ipc.framing import available_encodings, get_codec
+from src.ipc.reader import CompositorEventReader
+from src.ipc.latency import LatencyTracker
+from src.shared.env_helpers import env_number
+
+
+RECORDING_FORMAT = "waypanel-events"
+RECORDING_VERSION = 1
+
+
+def _open_recording(path, mode):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+class EventRecorder:
+    """
+    Writes the compositor event stream to a file for later replay.
+
+    The file is JSON lines: a header object, then one [offset, events] array
+    per batch, where offset is the number of seconds since recording started
+    and events is the batch exactly as queued for handle_event. Paths ending
+    in .gz are gzip-compressed.
+    """
+
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, path, compositor=None):
+        """
+        Args:
+            path: The file to write; existing content is replaced.
+            compositor: Compositor name stored in the header.
+        """
+        self.path = path
+        self._file = _open_recording(path, "wb")
+        self._start = time.monotonic()
+        self._last_flush = self._start
+        self.batches = 0
+        self.events = 0
+        header = {
+            "format": RECORDING_FORMAT,
+            "version": RECORDING_VERSION,
+            "compositor": compositor,
+            "started": time.time(),
+        }
+        self._file.write(json.dumps(header) + b"\n")
+
+    def record(self, batch) -> None:
+        """Append one batch, timestamped relative to the start of recording."""
+        now = time.monotonic()
+        self._file.write(json.dumps([round(now - self._start, 6), batch]) + b"\n")
+        self.batches += 1
+        self.events += len(batch)
+        if now - self._last_flush >= self.FLUSH_INTERVAL:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self) -> None:
+        """Flush and close the recording."""
+        if not self._file.closed:
+            self._file.close()
+
+
+class EventReplayer:
+    """
+    Feeds a recording made by EventRecorder back into an EventServer.
+
+    Batches are queued for handle_event with their original spacing divided
+    by speed, so speed=1 reproduces the recorded timing, speed=10 plays ten
+    times faster and speed=0 replays as fast as the consumer allows. Events
+    are queued as recorded, without compositor translation, so no compositor
+    needs to be running.
+
+    Without a live compositor (WAYPANEL_IPC_REPLAY) the recording takes the
+    normal path, batch listeners and plugins included. When the compositor
+    event stream is connected, replayed events carry "replayed": True and
+    their batches skip the batch listeners, so state mirrored from the live
+    compositor (the view store, the taskbar) is not overwritten.
+    """
+
+    def __init__(self, server, path, speed=1.0):
+        """
+        Args:
+            server: The EventServer whose event queue receives the batches.
+            path: The recording to play.
+            speed: Playback rate multiplier; 0 or less means no delays.
+        """
+        self.server = server
+        self.path = path
+        self.speed = speed
+
+    @staticmethod
+    def read(path):
+        """
+        Load a recording.
+
+        Returns:
+            tuple: (header dict, iterator of (offset, events) pairs).
+
+        Raises:
+            ValueError: If the file is not a waypanel event recording.
+        """
+        handle = _open_recording(path, "rb")
+        try:
+            header = json.loads(handle.readline() or b"{}")
+        except Exception:
+            handle.close()
+            raise
+        if not isinstance(header, dict) or header.get("format") != RECORDING_FORMAT:
+            handle.close()
+            raise ValueError(f"{path} is not a waypanel event recording")
+
+        def batches():
+            with handle:
+                for line in handle:
+                    if line.strip():
+                        offset, events = json.loads(line)
+                        yield offset, events
+
+        return header, batches()
+
+    async def run(self):
+        """
+        Play the recording once.
+
+        Returns:
+            dict: Number of batches and events queued, and the elapsed time.
+        """
+        header, batches = self.read(self.path)
+        self.server.logger.info(
+            f"Replaying {self.path} ({header.get('compositor')}) at speed {self.speed}"
+        )
+        # only isolate the recording from state that follows a live stream
+        isolated = self.server.is_socket_active()
+        start = time.monotonic()
+        count = events = 0
+        for offset, batch in batches:
+            if self.speed > 0:
+                delay = start + offset / self.speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                # still let handle_event run between batches
+                await asyncio.sleep(0)
+            if isolated:
+                batch = [
+                    {**event, "replayed": True} if isinstance(event, dict) else event
+                    for event in batch
+                ]
+            self.server.event_queue.put_nowait(
+                (time.monotonic_ns(), batch, isolated)
+            )
+            count += 1
+            events += len(batch)
+        elapsed = time.monotonic() - start
+        self.server.logger.info(
+            f"Replay finished: {events} events in {count} batches, {elapsed:.3f}s"
+        )
+        return {"batches": count, "events": events, "elapsed": elapsed}
 
 
 class EventServer:
-    def __init__(self, logger):
+    def __init__(self, logger, queue_size=None, overflow_policy=None):
         self.logger = logger
+        self.client_queue_size = queue_size or env_number(
+            "WAYPANEL_IPC_QUEUE_SIZE", 1024, int
+        )
+        self.client_overflow_policy = overflow_policy or os.environ.get(
+            "WAYPANEL_IPC_OVERFLOW", "drop-oldest"
+        )
         self.ipcet_paths = [
             self.get_socket_path(),
         ]
         self._cleanup_sockets()
         self.ipc = IPC()
-        self.ipc.watch()
-        self.compositor = None
-        self.executor = ThreadPoolExecutor()
+        self.event_reader = CompositorEventReader(
+            self.logger,
+            self._on_compositor_events,
+            on_connect=self._on_compositor_connected,
+        )
+        self.adapter = get_adapter(self.event_reader.compositor)
+        self.compositor = self.event_reader.compositor
+        # items are (monotonic_ns when read, batch, replayed)
         self.event_queue = asyncio.Queue()
+        self.latency = LatencyTracker()
+        # read time of the event being delivered to the local sinks
+        self.current_event_received_ns = None
         self.clients = []
         self.event_subscribers = {}
         self.command_handlers = {}
+        # commands whose synchronous handler runs on a worker thread
+        self.blocking_commands = set()
+        self.request_timeout = env_number(
+            "WAYPANEL_IPC_REQUEST_TIMEOUT", 30.0, float
+        )
+        self.max_requests_per_client = env_number(
+            "WAYPANEL_IPC_MAX_REQUESTS", 64, int
+        )
+        self.local_sinks = []
+        self.batch_listeners = []
+        self.resync_providers = []
+        self.resyncs = 0
+        self._local_pending = collections.deque()
+        self._local_scheduled = False
+        self._local_lock = threading.Lock()
         self.loop = get_global_loop
+        self.recorder = None
+        # running replays, referenced so they are not collected mid-run
+        self._replay_tasks = set()
+        self.register_command("get_client_stats", self._handle_client_stats)
+        self.register_command("start_event_recording", self._handle_start_recording)
+        self.register_command("stop_event_recording", self._handle_stop_recording)
+        self.register_command("replay_events", self._handle_replay)
+        self.register_command("get_event_latency", self._handle_event_latency)
+        if os.environ.get("WAYPANEL_IPC_RECORD"):
+            self.start_recording(os.environ["WAYPANEL_IPC_RECORD"])
+        # commands that act on the calling connection instead of the panel
+        self.connection_commands = {
+            "subscribe": self._handle_subscribe,
+            "set_framing": self._handle_set_framing,
+            "cancel": self._handle_cancel,
+        }
 
     def _cleanup_sockets(self) -> None:
         for path in self.ipcet_paths:
             if os.path.exists(path):
                 os.remove(path)
 
-    def reconnect_wayfire_socket(self) -> None:
-        self.logger.info("reconnecting wayfire ipc")
-        self.ipc = IPC()
-        self.ipc.watch()
-        self.ipc.connect_client(self.get_socket_path())
-        self.ipc.watch()
-
     def is_socket_active(self) -> bool:
-        if not self.ipc.is_connected():
-            try:
-                self.reconnect_wayfire_socket()
-            except Exception as e:
-                self.logger.error(f"Retrying in 10 seconds: {e}")
-                time.sleep(10)
-                return False
-        return True
+        """Whether the compositor event stream is currently connected."""
+        return self.event_reader.connected
 
-    def read_events(self) -> None:
-        while True:
-            if not self.is_socket_active():
-                continue
+    async def read_events(self) -> None:
+        """Run the asyncio compositor reader until the server stops."""
+        await self.event_reader.run()
+
+    def _on_compositor_events(self, events) -> None:
+        """Translate a batch decoded in one reader wakeup and queue it whole."""
+        received = time.monotonic_ns()
+        if self.adapter.name != self.event_reader.compositor:
+            # the reader switched compositors; pick the matching table once
+            self.compositor = self.event_reader.compositor
+            self.adapter = get_adapter(self.compositor)
+        batch = self.adapter.translate_batch(events)
+        if self.recorder is not None:
+            self.recorder.record(batch)
+        self.event_queue.put_nowait((received, batch, False))
+
+    async def _on_compositor_connected(self, reconnect: bool) -> None:
+        """
+        Resync consumers after the compositor event stream was re-established.
+
+        Events that happened while disconnected are lost, so every resync
+        provider diffs a fresh snapshot against its last known state and the
+        synthetic events it returns are queued ahead of the live stream.
+        """
+        if not reconnect or not self.resync_providers:
+            return
+        batch = []
+        for provider in self.resync_providers[:]:
             try:
-                event = self.ipc.read_next_event()
-                event = translate_ipc(event, self)
-                if self.loop and not self.loop.is_closed():
-                    try:
-                        asyncio.run_coroutine_threadsafe(
-                            self.event_queue.put(event), self.loop
-                        )
-                    except RuntimeError as e:
-                        if "This event loop is closed" in str(e):
-                            self.logger.warning(
-                                "Event loop is closed. Cannot put event in queue."
-                            )
-                        else:
-                            raise
-                else:
-                    self.logger.warning(
-                        "Event loop not available or already closed. Skipping event."
-                    )
+                # providers query the compositor; keep the loop free meanwhile
+                batch.extend(await asyncio.to_thread(provider) or ())
             except Exception as e:
-                self.logger.error(f"Event read failed: {e}")
-                try:
-                    self.reconnect_wayfire_socket()
-                except Exception as e:
-                    self.logger.error(f"Retrying in 1 second: {e}")
-                time.sleep(1)
-                continue
+                self.logger.error(f"Resync provider {provider} failed: {e}")
+        self.resyncs += 1
+        self.logger.info(f"Resynced after reconnect: {len(batch)} synthetic events")
+        if batch:
+            self.event_queue.put_nowait((time.monotonic_ns(), batch, False))
+
+    def start_recording(self, path) -> None:
+        """Record every event batch to path until stop_recording is called."""
+        self.stop_recording()
+        self.recorder = EventRecorder(path, self.event_reader.compositor)
+        self.logger.info(f"Recording compositor events to {path}")
 
-    def register_command(self, command_name: str, handler) -> None:
+    def stop_recording(self):
+        """
+        Stop an active recording.
+
+        Returns:
+            The stopped EventRecorder, or None if nothing was being recorded.
+        """
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+            self.logger.info(
+                f"Recorded {recorder.events} events in {recorder.batches} batches "
+                f"to {recorder.path}"
+            )
+        return recorder
+
+    async def replay(self, path, speed=1.0):
+        """Feed a recording through handle_event; see EventReplayer."""
+        return await EventReplayer(self, path, speed).run()
+
+    def register_command(
+        self, command_name: str, handler, blocking: bool = False
+    ) -> None:
+        """
+        Expose a handler as a waypanel.sock command.
+
+        Handlers take the request args and return a reply dict. They may be
+        coroutine functions, which run as tasks on the server loop. Plain
+        functions run inline on the loop and must be quick, unless blocking
+        is set, in which case they run on a worker thread. Either way a
+        handler must not touch GTK directly; see run_on_main_thread.
+
+        Args:
+            command_name: The "command" clients send.
+            handler: Callable taking the args.
+            blocking: Run a synchronous handler on a worker thread.
+        """
         if command_name in self.command_handlers:
             self.logger.warning(f"Overwriting IPC command handler for: {command_name}")
         self.command_handlers[command_name] = handler
+        if blocking:
+            self.blocking_commands.add(command_name)
+        else:
+            self.blocking_commands.discard(command_name)
         self.logger.info(f"IPC command registered: {command_name}")
 
     def add_event_subscriber(self, event_type, callback) -> None:
@@ -91,6 +341,105 @@ class EventServer:
         self.event_subscribers[event_type].append(callback)
         self.logger.info(f"new event: {event_type}")
 
+    def add_local_sink(self, callback) -> None:
+        """
+        Register an in-process consumer that receives every parsed event.
+
+        Sinks are invoked on the GTK main thread with the same event dict that
+        was read from the compositor, so no JSON round trip through
+        waypanel.sock is needed. The dict is shared between all consumers and
+        must be treated as read-only.
+
+        Args:
+            callback: Callable taking the event dict.
+        """
+        if callback not in self.local_sinks:
+            self.local_sinks.append(callback)
+            self.logger.info(f"Local event sink registered: {callback}")
+
+    def remove_local_sink(self, callback) -> None:
+        """Unregister a consumer previously added with add_local_sink."""
+        if callback in self.local_sinks:
+            self.local_sinks.remove(callback)
+
+    def add_batch_listener(self, callback) -> None:
+        """
+        Register a callback that sees every event batch before anyone else.
+
+        Unlike local sinks, listeners run synchronously on the IPC server
+        thread, so state they maintain is current by the time subscribers on
+        the GTK thread handle the same events. They must be fast and
+        thread-safe. Batches played back by EventReplayer are not passed to
+        them.
+
+        Args:
+            callback: Callable taking the list of parsed events.
+        """
+        if callback not in self.batch_listeners:
+            self.batch_listeners.append(callback)
+
+    def remove_batch_listener(self, callback) -> None:
+        """Unregister a callback previously added with add_batch_listener."""
+        if callback in self.batch_listeners:
+            self.batch_listeners.remove(callback)
+
+    def add_resync_provider(self, callback) -> None:
+        """
+        Register a callback that reconciles state after a reconnect.
+
+        The callback runs on a worker thread once the compositor event stream
+        is back, before any new event is read, and returns a list of
+        synthetic events (marked with "synthetic": True) describing what
+        changed while the stream was down. Those are delivered like a normal
+        batch, so subscribers converge without re-listing anything.
+
+        Args:
+            callback: Callable taking no arguments and returning a list.
+        """
+        if callback not in self.resync_providers:
+            self.resync_providers.append(callback)
+
+    def remove_resync_provider(self, callback) -> None:
+        """Unregister a callback previously added with add_resync_provider."""
+        if callback in self.resync_providers:
+            self.resync_providers.remove(callback)
+
+    def _dispatch_local(self, events, received=None) -> None:
+        """
+        Queue events for the local sinks and wake the GTK thread once per batch.
+
+        Only the first batch of a burst schedules an idle callback; later ones
+        are appended to the pending deque and drained by that same callback.
+        """
+        with self._local_lock:
+            self._local_pending.extend((e, received) for e in events if e)
+            if self._local_scheduled:
+                return
+            self._local_scheduled = True
+        GLib.idle_add(self._drain_local_sinks, priority=GLib.PRIORITY_DEFAULT)
+
+    def _drain_local_sinks(self) -> bool:
+        """Deliver all pending events to the local sinks on the GTK thread."""
+        with self._local_lock:
+            batch = self._local_pending
+            self._local_pending = collections.deque()
+            self._local_scheduled = False
+        sinks = self.local_sinks[:]
+        latency = self.latency
+        for event, received in batch:
+            if received is not None:
+                latency.record(
+                    "delivery", event.get("event"), time.monotonic_ns() - received
+                )
+            self.current_event_received_ns = received
+            for sink in sinks:
+                try:
+                    sink(event)
+                except Exception as e:
+                    self.logger.error(f"Local event sink error: {e}")
+        self.current_event_received_ns = None
+        return GLib.SOURCE_REMOVE
+
     def handle_msg(self, msg) -> None:
         event_type = msg.get("event")
         self.logger.warning(msg)
@@ -108,93 +457,450 @@ class EventServer:
 
     async def handle_event(self) -> None:
         while True:
-            event = await self.event_queue.get()
-            serialized_event = json.dumps(event) + b"\n"
-            for client in self.clients[:]:
+            received, batch, replayed = await self.event_queue.get()
+            # listeners mirror the live compositor; a recording played next
+            # to it must not feed them
+            for listener in () if replayed else self.batch_listeners[:]:
+                try:
+                    listener(batch)
+                except Exception as e:
+                    self.logger.error(f"Event batch listener error: {e}")
+            if self.local_sinks:
+                self._dispatch_local(batch, received)
+            for event in batch:
+                self.process_event(event)
+
+    def process_event(self, event) -> None:
+        """Fan a single event out to socket clients and async subscribers."""
+        if not event:
+            return
+        if self.clients:
+            self._broadcast(event)
+        event_type = event.get("event")
+        if event_type in self.event_subscribers:
+            for callback in self.event_subscribers[event_type]:
                 try:
-                    client.write(serialized_event)
-                    await client.drain()
-                except (ConnectionResetError, BrokenPipeError):
-                    self.clients.remove(client)
-                    self.logger.warning("Removed disconnected client during broadcast.")
-            if event:
-                event_type = event.get("event")
-                if event_type in self.event_subscribers:
-                    for callback in self.event_subscribers[event_type]:
-                        try:
-                            asyncio.create_task(callback(event))
-                            self.logger.debug(
-                                f"Invoked callback for event: {event_type}"
-                            )
-                        except Exception as e:
-                            self.logger.error(
-                                f"Error executing callback for event '{event_type}': {e}"
-                            )
-                else:
-                    self.logger.debug(f"No subscribers for event: {event}")
+                    asyncio.create_task(callback(event))
+                    self.logger.debug(f"Invoked callback for event: {event_type}")
+                except Exception as e:
+                    self.logger.error(
+                        f"Error executing callback for event '{event_type}': {e}"
+                    )
+        else:
+            self.logger.debug(f"No subscribers for event: {event_type}")
+
+    def _broadcast(self, event) -> None:
+        """
+        Queue an event for every client whose subscription filter accepts it.
+
+        Each distinct filter is evaluated once per event and the payload is
+        serialized at most once per wire format, and only if at least one
+        client wants it.
+        """
+        serialized = {}
+        key = None
+        verdicts = {}
+        for client in self.clients[:]:
+            event_filter = client.filter
+            if event_filter is not None:
+                accepted = verdicts.get(event_filter)
+                if accepted is None:
+                    accepted = verdicts[event_filter] = event_filter.matches(event)
+                if not accepted:
+                    continue
+            codec = client.codec
+            payload = serialized.get(codec)
+            if payload is None:
+                if not serialized and self.client_overflow_policy == "coalesce-by-key":
+                    key = event_key(event)
+                payload = serialized[codec] = codec.encode(event)
+            if not client.enqueue(payload, key):
+                self._remove_client(client)
+
+    def _handle_subscribe(self, client, args):
+        """
+        Handler for 'subscribe': restrict the events sent to this connection.
+
+        Args are a filter object, e.g.
+        {"events": ["view-focused"], "prefixes": ["output-"], "app-id": "kitty"}.
+        An empty object restores the default of receiving every event.
+        """
+        try:
+            event_filter = EventFilter.from_spec(args)
+        except (TypeError, ValueError) as e:
+            return {"status": "error", "command": "subscribe", "message": str(e)}
+        client.filter = (
+            None
+            if not (
+                event_filter.events
+                or event_filter.prefixes
+                or event_filter.predicates
+            )
+            else event_filter
+        )
+        return {
+            "status": "ok",
+            "command": "subscribe",
+            "data": event_filter.describe(),
+        }
+
+    def _handle_set_framing(self, client, args):
+        """
+        Handler for 'set_framing': switch this connection's wire format.
+
+        Args are {"framing": "ndjson" | "length-prefixed", "encoding":
+        "json" | "msgpack"}; encoding defaults to json. NDJSON remains the
+        recommended format; length-prefixed JSON is no faster to decode
+        (see Codec). The reply is sent in
+        the old format and is queued behind any pending events, and
+        everything after it in both directions uses the new format, so the
+        client must wait for the reply before sending framed requests.
+        """
+        if isinstance(args, list):
+            args = args[0] if args else {}
+        if not isinstance(args, dict):
+            args = {}
+        try:
+            codec = get_codec(
+                args.get("framing", "ndjson"), args.get("encoding", "json")
+            )
+        except (TypeError, ValueError) as e:
+            return {
+                "status": "error",
+                "command": "set_framing",
+                "message": str(e),
+                "data": {"encodings": available_encodings()},
+            }
+        # the reply is still encoded in the old format by handle_client
+        client.codec = codec
+        return {
+            "status": "ok",
+            "command": "set_framing",
+            "data": {"framing": codec.framing, "encoding": codec.encoding},
+        }
+
+    def _remove_client(self, client) -> None:
+        if client in self.clients:
+            self.clients.remove(client)
+            self.logger.warning(f"Removed IPC client {client.id} (pid {client.pid}).")
+        client.close()
+
+    def _handle_client_stats(self, args):
+        """Handler for 'get_client_stats': per-client queue lag and drop counters."""
+        return {
+            "status": "ok",
+            "command": "get_client_stats",
+            "data": [client.stats() for client in self.clients],
+        }
+
+    def _handle_event_latency(self, args):
+        """
+        Handler for 'get_event_latency': latency histograms of the event
+        pipeline, see LatencyTracker. Args may name a stage to select, and
+        "reset" clears the histograms after reading them.
+        """
+        args = args if isinstance(args, list) else [args]
+        stage = next((a for a in args if a and a != "reset"), None)
+        data = self.latency.snapshot(stage)
+        if "reset" in args:
+            self.latency.reset()
+        return {"status": "ok", "command": "get_event_latency", "data": data}
+
+    def _handle_start_recording(self, args):
+        """Handler for 'start_event_recording': args are [path]."""
+        if not args:
+            return {
+                "status": "error",
+                "command": "start_event_recording",
+                "message": "Expected a file path.",
+            }
+        path = args[0] if isinstance(args, list) else args
+        try:
+            self.start_recording(path)
+        except OSError as e:
+            return {
+                "status": "error",
+                "command": "start_event_recording",
+                "message": str(e),
+            }
+        return {"status": "ok", "command": "start_event_recording", "data": path}
+
+    def _handle_stop_recording(self, args):
+        """Handler for 'stop_event_recording'."""
+        recorder = self.stop_recording()
+        data = None
+        if recorder is not None:
+            data = {
+                "path": recorder.path,
+                "batches": recorder.batches,
+                "events": recorder.events,
+            }
+        return {"status": "ok", "command": "stop_event_recording", "data": data}
+
+    def _handle_replay(self, args):
+        """Handler for 'replay_events': args are [path, speed]; speed defaults to 1."""
+        if not args or not isinstance(args, list):
+            return {
+                "status": "error",
+                "command": "replay_events",
+                "message": "Expected [path, speed].",
+            }
+        path = args[0]
+        speed = float(args[1]) if len(args) > 1 else 1.0
+        if not os.path.exists(path):
+            return {
+                "status": "error",
+                "command": "replay_events",
+                "message": f"No such file: {path}",
+            }
+        task = asyncio.create_task(self.replay(path, speed))
+        self._replay_tasks.add(task)
+        task.add_done_callback(self._replay_done)
+        return {"status": "ok", "command": "replay_events", "data": path}
+
+    def _replay_done(self, task) -> None:
+        self._replay_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Event replay failed: {task.exception()}")
 
     async def handle_client(self, reader, writer) -> None:
-        self.clients.append(writer)
+        """
+        Serve one waypanel.sock connection.
+
+        Requests are {"command": ..., "args": ..., "id": ..., "timeout": ...}.
+        Each command runs as its own task, so a slow handler never holds up
+        other clients or event broadcasting. Requests that carry an "id" run
+        concurrently and their replies, which echo the id, may arrive out of
+        order; requests without one are answered in order, as before. At most
+        max_requests_per_client requests run at once per connection; further
+        requests are not read until one finishes.
+        """
+        client = ClientChannel(
+            writer,
+            self.logger,
+            maxsize=self.client_queue_size,
+            policy=self.client_overflow_policy,
+        )
+        client.start()
+        self.clients.append(client)
+        slots = asyncio.Semaphore(self.max_requests_per_client)
         try:
             while True:
-                message = {}
-                raw_data = await reader.readline()
-                if not raw_data:
-                    break
-                if not raw_data.strip():
-                    continue
-                response = {}
                 try:
-                    message = json.loads(raw_data)
+                    message = await client.codec.read(reader)
+                    if message is None:
+                        break
+                except asyncio.IncompleteReadError:
+                    raise
                 except Exception as e:
                     self.logger.error(f"Failed to parse client IPC message: {e}")
-                    response = {"status": "error", "message": "Invalid JSON format."}
+                    if client.codec.framing != "ndjson":
+                        # framing cannot be trusted past a bad frame
+                        break
+                    self._reply(
+                        client, {"status": "error", "message": "Invalid JSON format."}
+                    )
+                    continue
+                if not isinstance(message, dict):
+                    continue
                 command = message.get("command")
+                if not command:
+                    continue
                 args = message.get("args", [])
-                if command:
-                    if command in self.command_handlers:
-                        self.logger.debug(f"Handling IPC command: {command}")
-                        handler = self.command_handlers[command]
-                        try:
-                            response = handler(args)
-                        except Exception as e:
-                            self.logger.error(
-                                f"Error executing command '{command}': {e}"
-                            )
-                            response = {
-                                "status": "error",
-                                "command": command,
-                                "message": f"Handler error: {e}",
-                            }
-                    else:
+                request_id = message.get("id")
+                if command in self.connection_commands:
+                    # replies in the format in effect when the command arrived
+                    codec = client.codec
+                    try:
+                        response = self.connection_commands[command](client, args)
+                    except Exception as e:
+                        self.logger.error(f"Error executing command '{command}': {e}")
                         response = {
                             "status": "error",
                             "command": command,
-                            "message": f"Unknown command: {command}",
+                            "message": f"Handler error: {e}",
                         }
-                if response:
-                    if isinstance(response, dict):
-                        response_bytes = json.dumps(response) + b"\n"
-                        writer.write(response_bytes)
-                        await writer.drain()
-                    else:
-                        self.logger.error(
-                            f"Handler for {command} did not return a dictionary."
-                        )
-                        error_resp = {
+                    if response:
+                        self._reply(client, response, request_id, codec)
+                    continue
+                if request_id is not None and not isinstance(
+                    request_id, (str, int, float)
+                ):
+                    self._reply(
+                        client,
+                        {
                             "status": "error",
                             "command": command,
-                            "message": "Server error: Handler did not return valid format.",
-                        }
-                        writer.write(json.dumps(error_resp) + b"\n")
-                        await writer.drain()
+                            "message": "Request id must be a string or number",
+                        },
+                    )
+                    continue
+                if request_id is not None and request_id in client.requests:
+                    self._reply(
+                        client,
+                        {
+                            "status": "error",
+                            "command": command,
+                            "message": f"Request id {request_id} is already in flight",
+                        },
+                        request_id,
+                    )
+                    continue
+                timeout = message.get("timeout", self.request_timeout)
+                if not isinstance(timeout, (int, float)) or timeout <= 0:
+                    timeout = None
+                await slots.acquire()
+                task = asyncio.create_task(
+                    self._run_request(client, command, args, request_id, timeout)
+                )
+                task.add_done_callback(lambda _: slots.release())
+                if request_id is None:
+                    await task
+                    continue
+                client.requests[request_id] = task
+                task.add_done_callback(
+                    lambda t, rid=request_id, name=command: self._request_done(
+                        client, rid, name, t
+                    )
+                )
         except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
             pass
         finally:
-            if writer in self.clients:
-                self.clients.remove(writer)
-            writer.close()
-            await writer.wait_closed()
+            for task in list(client.requests.values()):
+                task.cancel()
+            if client in self.clients:
+                self.clients.remove(client)
+            client.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionResetError, BrokenPipeError):
+                pass
+
+    async def _run_request(self, client, command, args, request_id, timeout) -> None:
+        """Run one command handler and queue its reply."""
+        handler = self.command_handlers.get(command)
+        if handler is None:
+            response = {
+                "status": "error",
+                "command": command,
+                "message": f"Unknown command: {command}",
+            }
+        else:
+            self.logger.debug(f"Handling IPC command: {command}")
+            try:
+                response = await asyncio.wait_for(
+                    self._call_handler(command, handler, args), timeout
+                )
+            except asyncio.TimeoutError:
+                response = {
+                    "status": "error",
+                    "command": command,
+                    "message": f"Timed out after {timeout}s",
+                }
+            except Exception as e:
+                self.logger.error(f"Error executing command '{command}': {e}")
+                response = {
+                    "status": "error",
+                    "command": command,
+                    "message": f"Handler error: {e}",
+                }
+        if response is None:
+            return
+        if not isinstance(response, dict):
+            self.logger.error(f"Handler for {command} did not return a dictionary.")
+            response = {
+                "status": "error",
+                "command": command,
+                "message": "Server error: Handler did not return valid format.",
+            }
+        self._reply(client, response, request_id)
+
+    def _request_done(self, client, request_id, command, task) -> None:
+        if client.requests.get(request_id) is task:
+            del client.requests[request_id]
+        # a cancelled task may never have started, so answer for it here
+        if task.cancelled() and not client.closed:
+            self._reply(
+                client,
+                {"status": "error", "command": command, "message": "Cancelled"},
+                request_id,
+            )
+
+    async def _call_handler(self, command, handler, args):
+        if command in self.blocking_commands:
+            return await asyncio.to_thread(handler, args)
+        result = handler(args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def _reply(self, client, response, request_id=None, codec=None) -> None:
+        """
+        Queue a reply on the client's channel, after any event already queued.
+
+        Replies are never dropped by the overflow policy; the number of
+        requests in flight per client bounds how many can pile up.
+        """
+        if request_id is not None:
+            response = {**response, "id": request_id}
+        client.enqueue((codec or client.codec).encode(response), force=True)
+
+    def _handle_cancel(self, client, args):
+        """
+        Handler for 'cancel': abort a request of this connection by id.
+
+        Args are {"id": ...} or [id]. The cancelled request is answered with
+        a "Cancelled" error under its own id.
+        """
+        if isinstance(args, dict):
+            target = args.get("id")
+        elif isinstance(args, list):
+            target = args[0] if args else None
+        else:
+            target = args
+        try:
+            task = client.requests.get(target)
+        except TypeError:
+            # an unhashable id cannot name a request in flight
+            task = None
+        if task is None:
+            return {
+                "status": "error",
+                "command": "cancel",
+                "message": f"No request in flight with id {target}",
+            }
+        task.cancel()
+        return {"status": "ok", "command": "cancel", "data": target}
+
+    async def run_on_main_thread(self, func, *args):
+        """
+        Run func on the GTK main thread and await its result.
+
+        For command handlers that must touch GTK or plugin state; the server
+        loop stays free while the main thread gets to it.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def settle(result=None, error=None):
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        def call():
+            try:
+                result = func(*args)
+            except Exception as e:
+                loop.call_soon_threadsafe(settle, None, e)
+            else:
+                loop.call_soon_threadsafe(settle, result)
+            return GLib.SOURCE_REMOVE
+
+        GLib.idle_add(call)
+        return await future
 
     async def start_server(self, path) -> None:
         server = await asyncio.start_unix_server(
@@ -206,21 +912,22 @@ class EventServer:
     async def main(self) -> None:
         servers = [self.start_server(path) for path in self.ipcet_paths]
         self.loop = asyncio.get_running_loop()
-        self.executor.submit(self.read_events)
+        # WAYPANEL_IPC_REPLAY plays a recording instead of reading the
+        # compositor, e.g. to reproduce a report on a headless machine
+        replay_path = os.environ.get("WAYPANEL_IPC_REPLAY")
+        if replay_path:
+            speed = env_number("WAYPANEL_IPC_REPLAY_SPEED", 1.0, float)
+            source = self.replay(replay_path, speed)
+        else:
+            source = self.read_events()
         try:
-            await asyncio.gather(*servers, self.handle_event())
+            await asyncio.gather(*servers, source, self.handle_event())
         finally:
-            pass
+            self.event_reader.close()
+            self.stop_recording()
 
     async def broadcast_message(self, message) -> None:
-        serialized_message = json.dumps(message) + b"\n"
-        for client in self.clients[:]:
-            try:
-                client.write(serialized_message)
-                await client.drain()
-            except (ConnectionResetError, BrokenPipeError):
-                self.clients.remove(client)
-                self.logger.warning("Removed disconnected client during broadcast.")
+        self._broadcast(message)
 
     def get_socket_path(self) -> str:
         runtime_dir = os.environ.get("XDG_RUNTIME_DIR", "/tmp")
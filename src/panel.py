@@ -3,6 +3,7 @@ import lazy_loader as lazy
 from typing import Any
 import gc
 from gi.repository import Adw, Gio, GLib  # pyright: ignore
+from src.core import startup_trace
 from src.shared.config_handler import ConfigHandler
 
 IPC_MODULE = lazy.load("src.core.compositor.ipc")
@@ -31,8 +32,10 @@ class Panel(Adw.Application):
         self.config_data = self.config_handler.load_config()
         self.path_handler = PATH_HELPERS_MODULE.PathHandler(self)  # pyright: ignore
         self.ipc = IPC_MODULE.IPC()  # pyright: ignore
+        self.aipc = IPC_MODULE.AsyncIPC(self.ipc)  # pyright: ignore
         self.data_helper = DATA_HELPERS_MODULE.DataHelpers()  # pyright: ignore
         self.ipc_server = ipc_server
+        self.ipc.views.attach(ipc_server)
         self.display = None
         self.args = sys.argv
         self.gtk_helpers = GTK_HELPERS_MODULE.GtkHelpers(self)  # pyright: ignore
@@ -192,7 +195,8 @@ class Panel(Adw.Application):
         GLib.idle_add(self.load_css)
 
     def load_css(self):
-        self.gtk_helpers.load_css_from_file()
+        with startup_trace.span("load_css", cat="css"):
+            self.gtk_helpers.load_css_from_file()
 
         # Monitor ONLY the master generated styles.css
         styles_css_path = self.path_handler.get_config_dir() / "styles.css"
@@ -213,6 +217,7 @@ class Panel(Adw.Application):
         Each panel's properties are determined by the TOML configuration file.
         """
         self.logger.info("Setting up panels...")
+        setup_start = startup_trace.now()
         panel_toml = self.config_data.get("org.waypanel.panel", {})
         for panel_type, config in panel_toml.items():
             try:
@@ -230,6 +235,17 @@ class Panel(Adw.Application):
                 self.logger.error(
                     f"Failed to set up {panel_type} panel: {e}", exc_info=True
                 )
+        startup_trace.complete("setup_panels", setup_start)
+        startup_trace.trace_first_frame(
+            next(
+                (
+                    getattr(self, name)
+                    for name in ("top_panel", "bottom_panel", "left_panel", "right_panel")
+                    if getattr(self, name, None) is not None
+                ),
+                None,
+            )
+        )
         self.logger.info("Panels setup completed.")
 
     def _setup_top_panel(self, config):
@@ -117,6 +117,7 @@ class BasePlugin:
     _panel_instance: Any
     _plugin_loader: Any
     _ipc: Any
+    _aipc: Any
     _ipc_server: Any
     _logger_adapter: PluginLogAdapter
     _path_handler: PathHandler
@@ -142,6 +143,7 @@ class BasePlugin:
         self._panel_instance = panel_instance
         self._plugin_loader = panel_instance.plugin_loader
         self._ipc = panel_instance.ipc
+        self._aipc = panel_instance.aipc
         self._ipc_server = panel_instance.ipc_server
         self._logger_adapter = PluginLogAdapter(panel_instance.logger)
         self._path_handler = PathHandler(panel_instance)
@@ -444,6 +446,11 @@ class BasePlugin:
         """IPC client for Wayfire communication."""
         return self._ipc
 
+    @property
+    def aipc(self) -> Any:
+        """Awaitable IPC facade for compositor calls from async code."""
+        return self._aipc
+
     @property
     def ipc_server(self) -> Any:
         """Reference to the main IPC Server."""
@@ -15,6 +15,7 @@ def get_plugin_class():
     import hashlib
     from pathlib import Path
     from gi.repository import Gio
+    from src.core import startup_trace
     from src.plugins.core._base import BasePlugin
 
     DEFAULT_THEME = "adwaita"
@@ -274,6 +275,10 @@ menubutton > button.toggle {{
 """
 
         def generate_styles_css(self, is_startup=False):
+            with startup_trace.span("generate_styles_css", cat="css", startup=is_startup):
+                self._generate_styles_css()
+
+        def _generate_styles_css(self):
             base_block = self._get_injected_base_css()
             import_block = self.build_imports()
 
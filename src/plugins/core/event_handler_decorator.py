@@ -1,15 +1,42 @@
-def subscribe_to_event(event_type):
+def subscribe_to_event(
+    event_type,
+    coalesce=False,
+    priority="normal",
+    budget_ms=None,
+    thread_safe=False,
+    where=None,
+):
     """
     A decorator to register event handlers for Wayfire events.
     Usage:
         @subscribe_to_event("view-focused")
         def on_view_focused(self, event):
             ...
+
+        @subscribe_to_event("view-title-changed", coalesce=True)
+        def on_title_changed(self, event):
+            ...  # only the latest title per view within the coalescing window
+
+        @subscribe_to_event("view-focused", priority="ui")
+        def on_focus(self, event):
+            ...  # runs before "normal" subscribers and is never offloaded
+
+        @subscribe_to_event("view-title-changed", where={"app-id": "firefox"})
+        def on_firefox_title(self, event):
+            ...  # other views' title changes never reach this handler
+
+    See EventManagerPlugin.subscribe_to_event for priority, budget_ms,
+    thread_safe and where.
     """
 
     def decorator(func):
         func._is_event_handler = True
         func._event_type = event_type
+        func._coalesce = coalesce
+        func._priority = priority
+        func._budget_ms = budget_ms
+        func._thread_safe = thread_safe
+        func._where = where
         return func
 
     return decorator
@@ -40,6 +67,7 @@ def get_plugin_class():
                                 including the logger and loaded plugins.
             """
             super().__init__(panel_instance)
+            self._registered = set()
 
         def on_start(self):
             self._register_handlers()
@@ -50,37 +78,65 @@ def get_plugin_class():
                 self.logger.error("Event Manager is not available.")
                 return None
 
-            event_manager = self.plugin_loader.plugins["event_manager"]
-            registered = set()
             for plugin_name, plugin in self.plugin_loader.plugins.items():
                 if plugin_name == "event_handler_decorator":
                     continue
+                self.register_plugin_handlers(plugin_name, plugin)
+
+        def register_plugin_handlers(self, plugin_name, plugin):
+            """
+            Register the decorated event handlers of one plugin.
+
+            Used for plugins created after this one started, such as lazy
+            plugins on first use. Handlers already registered are skipped.
+            """
+            if "event_manager" not in self.plugin_loader.plugins:
+                return None
+            event_manager = self.plugin_loader.plugins["event_manager"]
+            registered = self._registered
+            try:
+                members = inspect.getmembers(plugin, predicate=inspect.isroutine)
+            except Exception as e:
+                self.logger.error(
+                    f"Error registering handlers for plugin {plugin_name}: {e}"
+                )
+                return None
+            for attr_name, attr in members:
+                if not getattr(attr, "_is_event_handler", False):
+                    continue
+                event_type = getattr(attr, "_event_type")
+                key = (plugin_name, attr_name, event_type)
+                if key in registered:
+                    continue
+                # one bad handler (e.g. an invalid where= spec) must not
+                # cost the plugin its other handlers
                 try:
-                    for attr_name, attr in inspect.getmembers(
-                        plugin, predicate=inspect.isroutine
-                    ):
-                        if hasattr(attr, "_is_event_handler") and getattr(
-                            attr, "_is_event_handler"
-                        ):
-                            event_type = getattr(attr, "_event_type")
-                            key = (plugin_name, attr_name, event_type)
-                            if key in registered:
-                                continue
-                            registered.add(key)
-                            sig = inspect.signature(attr)
-                            params = list(sig.parameters.values())
-                            if len(params) < 1:
-                                self.logger.warning(
-                                    f"Handler {plugin_name}.{attr_name} has incorrect signature."
-                                )
-                                continue
-                            event_manager.subscribe_to_event(event_type, attr)
-                            self.logger.debug(
-                                f"Subscribed {plugin_name}.{attr_name} to '{event_type}'"
-                            )
+                    sig = inspect.signature(attr)
+                    params = list(sig.parameters.values())
+                    if len(params) < 1:
+                        self.logger.warning(
+                            f"Handler {plugin_name}.{attr_name} has incorrect signature."
+                        )
+                        continue
+                    event_manager.subscribe_to_event(
+                        event_type,
+                        attr,
+                        plugin_name=plugin_name,
+                        coalesce=getattr(attr, "_coalesce", False),
+                        priority=getattr(attr, "_priority", "normal"),
+                        budget_ms=getattr(attr, "_budget_ms", None),
+                        thread_safe=getattr(attr, "_thread_safe", False),
+                        where=getattr(attr, "_where", None),
+                    )
                 except Exception as e:
                     self.logger.error(
-                        f"Error registering handlers for plugin {plugin_name}: {e}"
+                        f"Error registering handler {plugin_name}.{attr_name} "
+                        f"for '{event_type}': {e}"
                     )
+                    continue
+                registered.add(key)
+                self.logger.debug(
+                    f"Subscribed {plugin_name}.{attr_name} to '{event_type}'"
+                )
 
     return EventHandlerDecoratorPlugin
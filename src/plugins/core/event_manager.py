@@ -14,8 +14,118 @@ def get_plugin_metadata(_):
 
 def get_plugin_class():
     from src.plugins.core._base import BasePlugin
+    from src.ipc.filters import EventFilter, FIELD_PREDICATES
     import collections
     import os
+    import threading
+    import time
+
+    # Events whose order relative to each other matters; these are never
+    # coalesced and flush any pending coalesced events before dispatch.
+    ORDERING_SENSITIVE = frozenset(
+        {
+            "view-mapped",
+            "view-unmapped",
+            "view-closed",
+            "view-focused",
+            "output-added",
+            "output-removed",
+            "output-gain-focus",
+        }
+    )
+
+    # Subscriber priority classes, run in this order for every event. "ui"
+    # subscribers are never offloaded; "background" ones always run from a
+    # low-priority idle after the current burst.
+    PRIORITY_CLASSES = {"ui": 0, "normal": 1, "background": 2}
+    # overruns within this many recent calls that demote a subscriber
+    OVERRUN_WINDOW = 20
+
+    class _Subscriber:
+        """A registered callback plus its budget accounting and offload queue."""
+
+        __slots__ = (
+            "event_type",
+            "callback",
+            "plugin_name",
+            "priority",
+            "rank",
+            "budget_ns",
+            "thread_safe",
+            "mode",
+            "calls",
+            "overruns",
+            "recent",
+            "recent_overruns",
+            "queue",
+            "busy",
+            "lock",
+            "where",
+            "changed",
+        )
+
+        def __init__(
+            self,
+            event_type,
+            callback,
+            plugin_name,
+            priority,
+            budget_ns,
+            thread_safe,
+            where=None,
+            changed=None,
+        ):
+            self.event_type = event_type
+            # compiled 'where' predicates: an EventFilter over view fields and
+            # the set of view fields of which at least one must have changed
+            self.where = where
+            self.changed = changed
+            self.callback = callback
+            self.plugin_name = plugin_name
+            self.priority = priority
+            self.rank = PRIORITY_CLASSES[priority]
+            self.budget_ns = budget_ns
+            self.thread_safe = thread_safe
+            # "inline": called during dispatch; "deferred": low-priority idle
+            # on the GTK thread; "worker": background thread
+            self.mode = "deferred" if priority == "background" else "inline"
+            self.calls = 0
+            self.overruns = 0
+            self.recent = collections.deque(maxlen=OVERRUN_WINDOW)
+            self.recent_overruns = 0
+            self.queue = collections.deque()
+            self.busy = False
+            self.lock = threading.Lock()
+
+        @property
+        def name(self) -> str:
+            return self.plugin_name or getattr(self.callback, "__qualname__", "?")
+
+        def account(self, elapsed_ns: int) -> bool:
+            """Record a call duration; return True if it was over budget."""
+            self.calls += 1
+            over = elapsed_ns > self.budget_ns
+            if len(self.recent) == OVERRUN_WINDOW and self.recent[0]:
+                self.recent_overruns -= 1
+            self.recent.append(over)
+            if over:
+                self.overruns += 1
+                self.recent_overruns += 1
+            return over
+
+        def stats(self) -> dict:
+            return {
+                "event": self.event_type,
+                "subscriber": self.name,
+                "priority": self.priority,
+                "budget_ms": self.budget_ns / 1e6,
+                "mode": self.mode,
+                "calls": self.calls,
+                "overruns": self.overruns,
+                "queued": len(self.queue),
+                "where": self.where.describe() if self.where is not None else None,
+                "changed": sorted(self.changed) if self.changed else None,
+            }
 
     class EventManagerPlugin(BasePlugin):
         def __init__(self, panel_instance):
@@ -31,28 +141,99 @@ def get_plugin_class():
             }
 
             self.event_subscribers = collections.defaultdict(list)
+            self.coalesced_subscribers = collections.defaultdict(list)
+            # compiled per-event-type dispatch tables, rebuilt on (un)subscribe
+            self._tables = {}
+            self._coalesced_tables = {}
+            # fields watched by 'changed' predicates and the last view seen
+            self._watched_fields = frozenset()
+            self._last_views = {}
+            self._coalesce_pending = {}
+            self._coalesce_timer_id = None
+            # latency of the GTK work queued by subscribers, see _gtk_settled
+            self.latency = getattr(self.ipc_server, "latency", None)
+            self._gtk_pending = []
+            self._deferred = collections.deque()
+            self._deferred_idle_id = None
+            self.subscriber_budget_ms = self.get_plugin_setting_add_hint(
+                ["subscriber_budget_ms"],
+                8,
+                "Default time budget in milliseconds for a subscriber callback on the GTK thread.",
+            )
+            self.offload_after_overruns = self.get_plugin_setting_add_hint(
+                ["offload_after_overruns"],
+                3,
+                f"Budget overruns within the last {OVERRUN_WINDOW} calls after which a subscriber is moved off the dispatch path.",
+            )
+            if hasattr(self.ipc_server, "register_command"):
+                self.ipc_server.register_command(
+                    "get_event_subscribers", self._handle_get_subscribers
+                )
+            self.coalesce_window_ms = self.get_plugin_setting_add_hint(
+                ["coalesce_window_ms"],
+                16,
+                "Window in milliseconds used to merge bursts of the same event for the same view, for subscribers that opted in.",
+            )
+
+            # Same-process EventServer: take parsed events directly and skip
+            # the waypanel.sock encode/decode round trip.
+            if hasattr(self.ipc_server, "add_local_sink"):
+                self.ipc_server.add_local_sink(self.handle_event)
+                return
+
             self.ipc_client = WayfireClientIPC(self.handle_event, self.obj)
             self.ipc_client.wayfire_events_setup(self.get_runtime_socket_path())
 
+        def on_disable(self):
+            if self._coalesce_timer_id:
+                self.glib.source_remove(self._coalesce_timer_id)
+                self._coalesce_timer_id = None
+            if self._deferred_idle_id:
+                self.glib.source_remove(self._deferred_idle_id)
+                self._deferred_idle_id = None
+            if hasattr(self.ipc_server, "remove_local_sink"):
+                self.ipc_server.remove_local_sink(self.handle_event)
+            if self.ipc_client:
+                self.ipc_client.disconnect_socket()
+
         def get_runtime_socket_path(self) -> str:
             return os.path.join(
                 os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "waypanel.sock"
             )
 
         def handle_event(self, msg: dict) -> None:
-            """Direct execution entry point from IPC thread."""
+            """
+            Direct execution entry point on the GTK thread.
+
+            The event dict may be shared with other consumers (local sink
+            delivery), so subscribers must not mutate it.
+            """
             etype = msg.get("event")
             if not etype:
                 return
 
+            if self._coalesce_pending and etype in ORDERING_SENSITIVE:
+                self._flush_coalesced()
+
+            received = None
+            if self.latency is not None:
+                received = self.ipc_server.current_event_received_ns
+                if received is not None:
+                    self.latency.record(
+                        "dispatch", etype, time.monotonic_ns() - received
+                    )
+
+            changed = self._changed_fields(etype, msg) if self._watched_fields else None
+
             # Subscribers must now handle their own thread safety if they touch GTK
-            subs = self.event_subscribers.get(etype)
-            if subs:
-                for callback, _ in subs:
-                    try:
-                        callback(msg)
-                    except Exception as e:
-                        self.logger.error(f"Subscriber error: {e}")
+            if etype in self.event_subscribers:
+                self._dispatch(self._table(etype), msg, received, changed)
+
+            if etype in self.coalesced_subscribers:
+                self._coalesce(etype, msg, received, changed)
+
+            if received is not None:
+                self._track_gtk(etype, received)
 
             # Fast Routing via prefix matching
             prefix = etype[: etype.find("-") + 1]
@@ -60,6 +241,231 @@ def get_plugin_class():
             if handler:
                 handler(msg)
 
+        def _table(self, etype: str, coalesced: bool = False) -> tuple:
+            """
+            Return the compiled dispatch table of an event type.
+
+            The table groups consecutive subscribers (in priority order) that
+            share the same predicates, so each distinct predicate is tested
+            once per event and non-matching callbacks are never called.
+            """
+            tables = self._coalesced_tables if coalesced else self._tables
+            table = tables.get(etype)
+            if table is None:
+                source = (
+                    self.coalesced_subscribers if coalesced else self.event_subscribers
+                )
+                groups = []
+                for sub in source.get(etype, ()):
+                    if (
+                        groups
+                        and groups[-1][0] == sub.where
+                        and groups[-1][1] == sub.changed
+                    ):
+                        groups[-1][2].append(sub)
+                    else:
+                        groups.append((sub.where, sub.changed, [sub]))
+                table = tables[etype] = tuple(
+                    (where, changed, tuple(subs)) for where, changed, subs in groups
+                )
+            return table
+
+        def _dispatch(self, table: tuple, msg: dict, received, changed) -> None:
+            verdicts = None
+            for where, fields, subs in table:
+                if where is not None:
+                    if verdicts is None:
+                        verdicts = {}
+                    accepted = verdicts.get(where)
+                    if accepted is None:
+                        accepted = verdicts[where] = where.matches(msg)
+                    if not accepted:
+                        continue
+                if fields is not None and not (changed and fields & changed):
+                    continue
+                self._run_subscribers(subs, msg, received)
+
+        def _changed_fields(self, etype: str, msg: dict):
+            """
+            Return which watched view fields differ from the last event for the
+            same view; all of them for a view not seen before.
+            """
+            view = msg.get("view")
+            if not isinstance(view, dict) or "id" not in view:
+                return None
+            view_id = view["id"]
+            previous = self._last_views.get(view_id)
+            if etype in ("view-unmapped", "view-closed"):
+                self._last_views.pop(view_id, None)
+            else:
+                self._last_views[view_id] = view
+            if previous is None:
+                return self._watched_fields
+            return frozenset(
+                f for f in self._watched_fields if previous.get(f) != view.get(f)
+            )
+
+        def _run_subscribers(self, subs, msg: dict, received) -> None:
+            """
+            Call the subscribers in priority order, checking each inline call
+            against its budget; offloaded subscribers only get the event queued.
+            """
+            for sub in subs:
+                if sub.mode != "inline":
+                    self._enqueue(sub, msg, received)
+                    continue
+                elapsed = self._invoke(sub, msg, received)
+                if (
+                    sub.account(elapsed)
+                    and sub.rank != PRIORITY_CLASSES["ui"]
+                    and sub.recent_overruns >= self.offload_after_overruns
+                ):
+                    self._demote(sub, elapsed)
+
+        def _invoke(self, sub, msg: dict, received) -> int:
+            started = time.monotonic_ns()
+            try:
+                sub.callback(msg)
+            except Exception as e:
+                self.logger.error(f"Subscriber error: {e}")
+            finished = time.monotonic_ns()
+            if received is not None and self.latency is not None:
+                self.latency.record("subscriber_time", sub.name, finished - started)
+                self.latency.record("subscriber", sub.name, finished - received)
+            return finished - started
+
+        def _demote(self, sub, elapsed: int) -> None:
+            sub.mode = "worker" if sub.thread_safe else "deferred"
+            self.logger.warning(
+                f"Subscriber {sub.name} for '{sub.event_type}' exceeded its "
+                f"{sub.budget_ns / 1e6:g} ms budget {sub.recent_overruns} times "
+                f"(last {elapsed / 1e6:.1f} ms); moved to the {sub.mode} queue."
+            )
+
+        def _enqueue(self, sub, msg: dict, received) -> None:
+            """Queue an event for an offloaded subscriber, keeping its order."""
+            with sub.lock:
+                sub.queue.append((msg, received))
+                if sub.busy:
+                    return
+                sub.busy = True
+            if sub.mode == "worker":
+                self.run_in_thread(self._drain_worker, sub)
+                return
+            self._deferred.append(sub)
+            if self._deferred_idle_id is None:
+                self._deferred_idle_id = self.glib.idle_add(
+                    self._drain_deferred, priority=self.glib.PRIORITY_LOW
+                )
+
+        def _drain_worker(self, sub) -> None:
+            """Run a thread-safe subscriber's queued events on a worker thread."""
+            while True:
+                with sub.lock:
+                    if not sub.queue:
+                        sub.busy = False
+                        return
+                    msg, received = sub.queue.popleft()
+                self._invoke(sub, msg, received)
+
+        def _drain_deferred(self) -> bool:
+            """
+            Run queued events of deferred subscribers on the GTK thread,
+            round-robin, for at most one subscriber budget per idle iteration.
+            """
+            deadline = time.monotonic_ns() + int(self.subscriber_budget_ms * 1e6)
+            while self._deferred:
+                sub = self._deferred.popleft()
+                with sub.lock:
+                    if not sub.queue:
+                        sub.busy = False
+                        continue
+                    msg, received = sub.queue.popleft()
+                self._invoke(sub, msg, received)
+                self._deferred.append(sub)
+                if time.monotonic_ns() >= deadline:
+                    return self.glib.SOURCE_CONTINUE
+            self._deferred_idle_id = None
+            return self.glib.SOURCE_REMOVE
+
+        def _handle_get_subscribers(self, args):
+            """Handler for 'get_event_subscribers': priority, budget and offload state."""
+            data = [
+                sub.stats()
+                for table in (self.event_subscribers, self.coalesced_subscribers)
+                for subs in table.values()
+                for sub in subs
+            ]
+            return {"status": "ok", "command": "get_event_subscribers", "data": data}
+
+        def _track_gtk(self, etype: str, received: int) -> None:
+            """
+            Measure when the GTK work queued by this event's subscribers has run.
+
+            A default-idle source added after the subscribers runs after the
+            idle updates they scheduled, so one source per burst stamps every
+            pending event.
+            """
+            if not self._gtk_pending:
+                self.glib.idle_add(
+                    self._gtk_settled, priority=self.glib.PRIORITY_DEFAULT_IDLE
+                )
+            self._gtk_pending.append((etype, received))
+
+        def _gtk_settled(self) -> bool:
+            now = time.monotonic_ns()
+            pending = self._gtk_pending
+            self._gtk_pending = []
+            for etype, received in pending:
+                self.latency.record("gtk", etype, now - received)
+            return self.glib.SOURCE_REMOVE
+
+        def _coalesce(self, etype: str, msg: dict, received=None, changed=None) -> None:
+            """
+            Park an event for opted-in subscribers, keeping only the latest
+            payload per (event type, view id) until the window elapses.
+            """
+            view = msg.get("view")
+            view_id = view.get("id") if isinstance(view, dict) else None
+            if view_id is None:
+                self._dispatch_coalesced(etype, msg, received, changed)
+                return
+            # the stamp of the first merged event is kept, so the measured
+            # latency includes the coalescing delay; changed fields accumulate
+            key = (etype, view_id)
+            first = self._coalesce_pending.get(key)
+            if first is not None:
+                if first[1] is not None:
+                    received = first[1]
+                if first[2]:
+                    changed = first[2] | changed if changed else first[2]
+            self._coalesce_pending[key] = (msg, received, changed)
+            if self._coalesce_timer_id is None:
+                self._coalesce_timer_id = self.glib.timeout_add(
+                    self.coalesce_window_ms, self._on_coalesce_timeout
+                )
+
+        def _on_coalesce_timeout(self) -> bool:
+            self._coalesce_timer_id = None
+            self._flush_coalesced()
+            return self.glib.SOURCE_REMOVE
+
+        def _flush_coalesced(self) -> None:
+            """Deliver every pending coalesced event in first-seen order."""
+            if self._coalesce_timer_id is not None:
+                self.glib.source_remove(self._coalesce_timer_id)
+                self._coalesce_timer_id = None
+            pending = self._coalesce_pending
+            self._coalesce_pending = {}
+            for (etype, _), (msg, received, changed) in pending.items():
+                self._dispatch_coalesced(etype, msg, received, changed)
+
+        def _dispatch_coalesced(
+            self, etype: str, msg: dict, received=None, changed=None
+        ) -> None:
+            if etype in self.coalesced_subscribers:
+                self._dispatch(self._table(etype, True), msg, received, changed)
+
         def handle_view_event(self, msg: dict) -> None:
             view, ev = msg.get("view"), msg.get("event")
             if not view or view.get("pid") == -1 or view.get("role") != "toplevel":
@@ -89,14 +495,103 @@ def get_plugin_class():
             if msg.get("event") == "output-gain-focus":
                 self.on_output_gain_focus()
 
-        def subscribe_to_event(self, event_type, callback, plugin_name=None) -> None:
-            self.event_subscribers[event_type].append((callback, plugin_name))
+        def subscribe_to_event(
+            self,
+            event_type,
+            callback,
+            plugin_name=None,
+            coalesce=False,
+            priority="normal",
+            budget_ms=None,
+            thread_safe=False,
+            where=None,
+        ) -> None:
+            """
+            Register a callback for a compositor event type.
+
+            Args:
+                event_type: The event name, e.g. "view-title-changed".
+                callback: Callable receiving the event dict.
+                plugin_name: Optional name of the subscribing plugin.
+                coalesce: If True, bursts of this event for the same view are
+                    merged and only the latest payload is delivered once per
+                    coalescing window. Ignored for ordering-sensitive events.
+                priority: "ui", "normal" or "background". Subscribers run in
+                    that order; "ui" is never offloaded and "background" is
+                    always run from a low-priority idle after the burst.
+                budget_ms: Time budget per call; defaults to the
+                    subscriber_budget_ms setting. A subscriber that keeps
+                    exceeding it is moved off the dispatch path, keeping the
+                    order of its own events.
+                thread_safe: If True, an offloaded subscriber runs on a worker
+                    thread instead of a low-priority GTK idle. Only set this
+                    for callbacks that do not touch GTK.
+                where: Optional predicates on the event's view, e.g.
+                    {"role": "toplevel", "app-id": ["kitty", "foot"]}.
+                    "role", "app-id" and "output-id" take a value or a list
+                    of accepted values; "changed" takes a list of view
+                    fields of which at least one must differ from the
+                    previous event for that view. Events that do not match
+                    never reach the callback.
+
+            Raises:
+                ValueError: On an unknown priority or where key.
+            """
+            if priority not in PRIORITY_CLASSES:
+                raise ValueError(f"Unknown subscriber priority: {priority}")
+            where = dict(where or {})
+            fields = where.pop("changed", None)
+            unknown = set(where) - set(FIELD_PREDICATES)
+            if unknown:
+                raise ValueError(f"Unknown where keys: {', '.join(sorted(unknown))}")
+            event_filter = EventFilter(predicates=where) if where else None
+            if isinstance(fields, str):
+                fields = [fields]
+            changed = frozenset(fields) if fields else None
+            budget = self.subscriber_budget_ms if budget_ms is None else budget_ms
+            sub = _Subscriber(
+                event_type,
+                callback,
+                plugin_name,
+                priority,
+                int(budget * 1e6),
+                thread_safe,
+                event_filter,
+                changed,
+            )
+            if coalesce and event_type not in ORDERING_SENSITIVE:
+                subs = self.coalesced_subscribers[event_type]
+            else:
+                subs = self.event_subscribers[event_type]
+            subs.append(sub)
+            # stable: registration order is kept within a priority class
+            subs.sort(key=lambda s: s.rank)
+            self._subscriptions_changed(event_type)
+
+        def _subscriptions_changed(self, event_type) -> None:
+            """Drop the compiled tables of an event type and the field watch set."""
+            self._tables.pop(event_type, None)
+            self._coalesced_tables.pop(event_type, None)
+            self._watched_fields = frozenset(
+                field
+                for table in (self.event_subscribers, self.coalesced_subscribers)
+                for subs in table.values()
+                for sub in subs
+                if sub.changed
+                for field in sub.changed
+            )
+            if not self._watched_fields:
+                self._last_views.clear()
 
         def unsubscribe_from_event(self, event_type, callback) -> None:
-            if event_type in self.event_subscribers:
-                self.event_subscribers[event_type] = [
-                    s for s in self.event_subscribers[event_type] if s[0] != callback
-                ]
+            for table in (self.event_subscribers, self.coalesced_subscribers):
+                if event_type in table:
+                    table[event_type] = [
+                        s for s in table[event_type] if s.callback != callback
+                    ]
+                    if not table[event_type]:
+                        del table[event_type]
+            self._subscriptions_changed(event_type)
 
         def on_view_focused(self, v):
             self.logger.debug(f"Focus: {v.get('app-id')}")
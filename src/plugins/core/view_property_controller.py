@@ -63,7 +63,7 @@ def get_plugin_class():
             try:
                 event_manager.subscribe_to_event("view-mapped", self._on_view_event)
                 event_manager.subscribe_to_event(
-                    "view-title-changed", self._on_view_event
+                    "view-title-changed", self._on_view_event, coalesce=True
                 )
                 self.logger.info(
                     "View Property Controller successfully subscribed to view events."
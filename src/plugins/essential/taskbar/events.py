@@ -23,7 +23,19 @@ class TaskbarEvents:
             "view-title-changed",
         ]
         for ev in events:
-            mgr.subscribe_to_event(ev, self._handle_view_event, "taskbar")
+            if ev == "view-focused":
+                # focus highlighting must not wait behind slower subscribers
+                mgr.subscribe_to_event(
+                    ev, self._handle_view_event, "taskbar", priority="ui"
+                )
+            else:
+                # only toplevels get buttons; skip popups, panels and the like
+                mgr.subscribe_to_event(
+                    ev,
+                    self._handle_view_event,
+                    "taskbar",
+                    where={"role": "toplevel"},
+                )
 
         mgr.subscribe_to_event(
             "plugin-activation-state-changed", self._handle_plugin_event, "taskbar"
@@ -32,7 +44,9 @@ class TaskbarEvents:
     def _handle_view_event(self, msg: dict):
         """Routes view events to the appropriate plugin logic."""
         ev, v = msg.get("event"), msg.get("view")
-        if not v:
+        if not v or msg.get("replayed"):
+            # replayed next to a live compositor, these views are not on
+            # screen; the taskbar shows live state
             return
 
         if ev in (
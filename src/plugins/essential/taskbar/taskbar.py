@@ -121,8 +121,8 @@ def get_plugin_class():
                 for key in list(self.in_use_buttons.keys()):
                     if key not in grouped_data:
                         self.remove_button(key)
+                representatives = {}
                 for app_id, app_views in grouped_data.items():
-                    is_focused = any(v.get("id") == focused_id for v in app_views)
                     representative = next(
                         (v for v in app_views if v.get("id") == focused_id), None
                     )
@@ -132,16 +132,24 @@ def get_plugin_class():
                             (v for v in app_views if v.get("id") == last_id),
                             app_views[0],
                         )
+                    representatives[app_id] = representative
+                # only the view shown on each group button needs its icon
+                icons = self._fetch_icons(list(representatives.values()))
+                for app_id, app_views in grouped_data.items():
+                    is_focused = any(v.get("id") == focused_id for v in app_views)
+                    representative = representatives[app_id]
                     if app_id in self.in_use_buttons:
                         self.update_button(
                             self.in_use_buttons[app_id],
                             representative,
                             len(app_views),
                             is_focused,
+                            icons,
                         )
                     else:
-                        self.add_button_to_taskbar(representative, app_id)
+                        self.add_button_to_taskbar(representative, app_id, icons)
             else:
+                icons = self._fetch_icons(views)
                 current_ids = {v.get("id") for v in views}
                 for vid in list(self.in_use_buttons.keys()):
                     if vid not in current_ids:
@@ -150,12 +158,23 @@ def get_plugin_class():
                     vid = v.get("id")
                     if vid in self.in_use_buttons:
                         self.update_button(
-                            self.in_use_buttons[vid], v, 1, vid == focused_id
+                            self.in_use_buttons[vid], v, 1, vid == focused_id, icons
                         )
                     else:
-                        self.add_button_to_taskbar(v, vid)
+                        self.add_button_to_taskbar(v, vid, icons)
 
-        def add_button_to_taskbar(self, view: dict, identifier: str):
+        def _fetch_icons(self, views: list) -> dict:
+            """Read the icon property of the given views in one pipelined batch."""
+            with self.ipc.batch() as batch:
+                replies = {
+                    v.get("id"): batch.get_view_property(v.get("id"), "icon")
+                    for v in views
+                }
+            return {view_id: reply.value for view_id, reply in replies.items()}
+
+        def add_button_to_taskbar(
+            self, view: dict, identifier: str, icons: dict | None = None
+        ):
             button = next(
                 (i["button"] for i in self.button_pool if i["view_id"] == "available"),
                 None,
@@ -172,7 +191,7 @@ def get_plugin_class():
             self.taskbar.append(button)  # pyright: ignore
 
             self.in_use_buttons[identifier] = button
-            self.update_button(button, view)
+            self.update_button(button, view, icons=icons)
             button.set_visible(True)
 
             # Use the method directly from the instance to maintain signal connection integrity
@@ -251,12 +270,20 @@ def get_plugin_class():
                 gc.collect()
 
         def update_button(
-            self, btn, view: dict, count: int = 1, is_focused: bool = False
+            self,
+            btn,
+            view: dict,
+            count: int = 1,
+            is_focused: bool = False,
+            icons: dict | None = None,
         ) -> None:
             raw_title = view.get("title", "")
             btn.set_tooltip_text(raw_title)
             btn.view_id = view.get("id")
-            ico = self.ipc.get_view_property(btn.view_id, "icon")
+            if icons is not None and btn.view_id in icons:
+                ico = icons[btn.view_id]
+            else:
+                ico = self.ipc.get_view_property(btn.view_id, "icon")
             if not isinstance(ico, str):
                 ico = self.gtk_helper.icon_exist(view.get("app-id"))  # pyright: ignore
             btn.icon.set_from_icon_name(ico)
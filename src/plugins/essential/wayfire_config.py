@@ -90,9 +90,7 @@ def get_plugin_class():
                 config (dict): The new configuration to apply.
             """
             try:
-                response = await self.asyncio.to_thread(
-                    self.ipc.sock.list_config_options
-                )
+                response = await self.aipc.list_config_options()
                 if response.get("result") != "ok":
                     self.logger.warning("Failed to fetch runtime config")
                     return
@@ -158,9 +156,7 @@ def get_plugin_class():
                 update_successful = False
                 while retry_count < max_retries:
                     try:
-                        await self.asyncio.to_thread(
-                            self.ipc.set_option_values, batch_updates
-                        )
+                        await self.aipc.set_option_values(batch_updates)
                         update_successful = True
                         break
                     except Exception as e:
@@ -187,9 +183,7 @@ def get_plugin_class():
                         individual_update_successful = False
                         while individual_retry_count < max_retries:
                             try:
-                                await self.asyncio.to_thread(
-                                    self.ipc.set_option_values, {key: value}
-                                )
+                                await self.aipc.set_option_values({key: value})
                                 self.logger.info(
                                     f"Updated (individual) '{key}' → '{value}'"
                                 )
@@ -235,9 +229,7 @@ def get_plugin_class():
                 update_successful = False
                 while retry_count < max_retries:
                     try:
-                        await self.asyncio.to_thread(
-                            self.ipc.set_option_values, payload
-                        )
+                        await self.aipc.set_option_values(payload)
                         update_successful = True
                         break
                     except Exception as e:
@@ -270,9 +262,7 @@ def get_plugin_class():
                 update_successful = False
                 while retry_count < max_retries:
                     try:
-                        await self.asyncio.to_thread(
-                            self.ipc.set_option_values, payload
-                        )
+                        await self.aipc.set_option_values(payload)
                         update_successful = True
                         break
                     except Exception as e:
@@ -15,6 +15,8 @@ def get_plugin_metadata(_):
         "container": "top-panel-systray",
         "index": 5,
         "deps": ["clipboard_server", "css_generator"],
+        "lazy": True,
+        "icon": "edit-paste-symbolic",
         "description": about,
     }
 
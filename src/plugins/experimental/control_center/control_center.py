@@ -6,6 +6,7 @@ def get_plugin_metadata(_):
         "enabled": True,
         "priority": 99,
         "deps": ["css_generator"],
+        "lazy": True,
         "description": "Plugin Control Center for Waypanel",
     }
 
@@ -33,6 +34,8 @@ def get_plugin_class():
             super().__init__(panel_instance)
 
         def delay_on_start(self):
+            if getattr(self, "logic", None) is not None:
+                return False
             self.config = {}
             self.widget_map = {}
             self.ui_key_to_plugin_id_map: Dict[str, str] = {}
@@ -71,6 +74,8 @@ def get_plugin_class():
 
         def do_activate(self):
             """Initializes and presents the Control Center window."""
+            # created lazily on first use, possibly before delay_on_start ran
+            self.delay_on_start()
             if not self.win:
                 self.win = self.ui.create_window()
                 self.win.connect("close-request", self.on_close_request)
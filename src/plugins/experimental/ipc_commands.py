@@ -58,7 +58,7 @@ def get_plugin_class():
             self._panel_instance = panel_instance
 
         def on_start(self):
-            """Registers synchronous IPC commands when the panel starts."""
+            """Registers the IPC commands when the panel starts."""
             self.data_store = _DevDataStore()
             if hasattr(self.ipc_server, "register_command"):
                 self.ipc_server.register_command(
@@ -163,8 +163,13 @@ def get_plugin_class():
                     "message": str(e),
                 }
 
-        def _handle_plugin_control(self, args):
-            """Handler for 'plugin_control' command: enables or disables a plugin."""
+        async def _handle_plugin_control(self, args):
+            """
+            Handler for 'plugin_control' command: enables or disables a plugin.
+
+            Plugins build and tear down GTK widgets, so the work runs on the
+            main thread while the IPC server keeps serving other requests.
+            """
             command_name = "plugin_control"
             if len(args) < 2:
                 return {
@@ -186,9 +191,13 @@ def get_plugin_class():
                 metadata = plugin_loader.plugin_metadata_map[plugin_name]["metadata"]
                 print(metadata)
                 if action == "disable":
-                    plugin_loader.disable_plugin(plugin_name)
+                    await self.ipc_server.run_on_main_thread(
+                        plugin_loader.disable_plugin, plugin_name
+                    )
                 else:
-                    plugin_loader.enable_plugin(plugin_name, metadata)
+                    await self.ipc_server.run_on_main_thread(
+                        plugin_loader.enable_plugin, plugin_name, metadata
+                    )
                 return {
                     "status": "ok",
                     "command": command_name,
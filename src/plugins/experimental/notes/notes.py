@@ -13,6 +13,8 @@ def get_plugin_metadata(panel):
         "index": 1,
         "container": container,
         "deps": ["css_generator"],
+        "lazy": True,
+        "icon": "ymuse-replace-queue-symbolic",
         "description": about,
     }
 
@@ -15,6 +15,8 @@ def get_plugin_metadata(panel):
         "priority": 987,
         "container": CONTAINER,
         "deps": ["css_generator"],
+        "lazy": True,
+        "icon": "start-here",
         "description": about,
     }
 
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Any, List, Optional, Dict, Tuple, Union
 from wayfire import WayfireSocket
 from gi.repository import Gio  # pyright: ignore
+from src.core import startup_trace
 from src.shared import config_template
 
 
@@ -181,7 +182,10 @@ class ConfigHandler:
         """
         if self._cached_config and not force_reload:
             return self._cached_config
+        with startup_trace.span("ConfigHandler.load_config", plugin=self.plugin_id):
+            return self._load_config_file()
 
+    def _load_config_file(self) -> Dict[str, Any]:
         config_from_file: Dict[str, Any] = {}
         file_path = Path(self.config_file)
         file_must_be_created = not file_path.exists()
@@ -0,0 +1,24 @@
+import logging
+import os
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def env_number(name: str, default: Any, kind: Callable[[str], Any]) -> Any:
+    """
+    Read a numeric environment setting, keeping default when invalid.
+
+    Args:
+        name: The environment variable, e.g. "WAYPANEL_IPC_POOL_SIZE".
+        default: Returned when the variable is unset or does not parse.
+        kind: The conversion, usually int or float.
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return kind(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={value!r}; using {default}")
+        return default
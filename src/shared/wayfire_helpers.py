@@ -446,13 +446,15 @@ class WayfireHelpers:
         )
         self.ipc.move_cursor(cursor_x, cursor_y)
 
-    def list_app_ids(self) -> list[str]:
+    def list_app_ids(self, fresh: bool = False) -> list[str]:
         """
         Get a list of lowercase app IDs from all views currently managed by the compositor.
+        Args:
+            fresh (bool): Query the compositor instead of the view store.
         Returns:
             List[str]: A list of lowercase app IDs (excluding "nil").
         """
-        views = self.ipc.list_views()
+        views = self.ipc.list_views(fresh=fresh)
         return [i["app-id"].lower() for i in views if i["app-id"] != "nil"]
 
     def focus_view_when_ready(self, view: dict) -> bool:
@@ -739,9 +741,16 @@ class WayfireHelpers:
         workspace_ids = self.ipc.get_views_from_active_workspace()
         if not workspace_ids:
             return None
+        if self.ipc.views.ready():
+            views = [self.ipc.get_view(view_id, fresh=False) for view_id in workspace_ids]
+        else:
+            with self.ipc.batch() as batch:
+                replies = [batch.get_view(view_id) for view_id in workspace_ids]
+            views = [reply.value for reply in replies]
         active_views_data = []
-        for view_id in workspace_ids:
-            view_data = self.ipc.get_view(view_id)
+        for view_id, view_data in zip(workspace_ids, views):
+            if not view_data:
+                continue
             is_minimized = view_data.get("minimized", False)
             timestamp = view_data.get("last-focus-timestamp")
             if timestamp is None:
@@ -772,12 +781,13 @@ class WayfireHelpers:
         views = self.ipc.list_views()
         return max(views, key=lambda x: x.get("last-focus-timestamp", 0))
 
-    def get_view_by_pid(self, pid: int) -> dict | None:
+    def get_view_by_pid(self, pid: int, fresh: bool = False) -> dict | None:
         """
         Retrieves detailed Wayfire view metadata for a specific Process ID.
 
         Args:
             pid (int): The process ID to search for.
+            fresh (bool): Query the compositor instead of the view store.
 
         Returns:
             dict | None: The view metadata dictionary if found, otherwise None.
@@ -785,6 +795,9 @@ class WayfireHelpers:
         if not pid:
             return None
 
+        if not fresh and self.ipc.views.ready():
+            return self.ipc.views.get_view_by_pid(pid)
+
         try:
             # Accessing the IPC socket (sock) and listing all active views
             all_views = self.ipc.list_views()
@@ -796,8 +809,8 @@ class WayfireHelpers:
             self.logger.error(f"Failed to resolve view for PID {pid}: {e}")
             return None
 
-    def get_view_by_title(self, title):
-        all_views = self.ipc.list_views()
+    def get_view_by_title(self, title, fresh=False):
+        all_views = self.ipc.list_views(fresh=fresh)
         return next(
             (view for view in all_views if title.lower() in view.get("title").lower()),
             None,
@@ -0,0 +1,105 @@
+"""
+Replays an event burst into the NDJSON receive path of WayfireClientIPC.
+
+A writer thread sends a burst of events over a Unix socket pair while the
+reader consumes it the way the client does on each GLib wakeup:
+
+  - legacy: recv() into an immutable bytes buffer and split(b"\\n", 1) per
+    line, which copies the rest of the buffer for every event,
+  - framer: FrameDecoder.recv_into() into a reusable bytearray and one
+    drain() pass per wakeup.
+
+Both are run with the old 4 KiB reads and with 64 KiB reads; the larger the
+burst held in the buffer, the more the legacy split loop copies.
+
+Run from the project root: python3 tools/bench_client_framer.py
+"""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+import orjson as json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ipc.framing import NDJSON  # noqa: E402
+from tools.bench_framing import make_events  # noqa: E402
+
+
+def legacy(sock, count, read_size):
+    buffer = b""
+    received = 0
+    while received < count:
+        chunk = sock.recv(read_size)
+        if not chunk:
+            break
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            line = line.strip()
+            if not line:
+                continue
+            json.loads(line)
+            received += 1
+    return received
+
+
+def framer(sock, count, read_size):
+    decoder = NDJSON.decoder(size=read_size)
+    received = 0
+    while received < count:
+        if not decoder.recv_into(sock, read_size):
+            break
+        received += len(decoder.drain())
+    return received
+
+
+def replay(reader, payload, count, read_size):
+    """Send the burst and time how long the reader takes to decode it."""
+    send, recv = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    # let the whole burst queue up, as when the GTK loop was busy
+    send.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, len(payload))
+    try:
+        writer = threading.Thread(target=send.sendall, args=(payload,))
+        start = time.perf_counter()
+        writer.start()
+        received = reader(recv, count, read_size)
+        elapsed = time.perf_counter() - start
+        writer.join()
+    finally:
+        send.close()
+        recv.close()
+    assert received == count, f"{reader.__name__} decoded {received}/{count}"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    payload = b"".join(NDJSON.encode(e) for e in events)
+    print(
+        f"burst: {args.events} events, {len(payload) / 1024:.0f} KiB\n"
+        f"{'reader':<10}{'read size':>10}{'ms':>10}{'events/s':>14}"
+    )
+    for read_size in (4096, 65536):
+        for reader in (legacy, framer):
+            elapsed = min(
+                replay(reader, payload, args.events, read_size)
+                for _ in range(args.repeat)
+            )
+            print(
+                f"{reader.__name__:<10}{read_size:>10}{elapsed * 1000:>10.1f}"
+                f"{args.events / elapsed:>14,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Micro-benchmark for the argument validation applied to IPC methods.
+
+Compares the per-call overhead of:
+  - the plain function,
+  - the previous strategy (typing.get_type_hints + validate_type per call),
+  - type_checked with compiled validators.
+
+Run from the project root: python3 tools/bench_type_checked.py
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import typing
+from functools import wraps
+from typing import Any, Union, get_args, get_origin
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.compositor.ipc import type_checked  # noqa: E402
+
+
+# copied unchanged so the baseline column measures the original strategy;
+# the current validate_type compiles a validator on every call
+def legacy_validate_type(
+    value: Any,
+    expected_type: Any,
+    name: str = "value",
+    allow_none: bool = False,
+    optional: bool = False,
+) -> bool:
+    """validate_type as it was before validators were compiled."""
+    current_type = expected_type
+
+    if optional:
+        allow_none = True
+
+    origin = get_origin(current_type)
+    args = get_args(current_type)
+
+    if origin is Union and type(None) in args:
+        allow_none = True
+        inner_types = tuple(t for t in args if t is not type(None))
+
+        if len(inner_types) == 1:
+            current_type = inner_types[0]
+        elif len(inner_types) > 1:
+            current_type = Union[inner_types]
+        else:
+            current_type = Any
+
+        origin = get_origin(current_type)
+        args = get_args(current_type)
+
+    if allow_none and value is None:
+        return True
+    if value is None:
+        raise TypeError(f"Invalid {name}: Expected {expected_type}, got None.")
+
+    if current_type is Any:
+        return True
+
+    if origin is Union:
+        for t in args:
+            try:
+                if legacy_validate_type(value, t, name=name, allow_none=False, optional=False):
+                    return True
+            except TypeError:
+                continue
+
+        type_names = ", ".join(t.__name__ for t in args if hasattr(t, "__name__"))
+        raise TypeError(
+            f"Invalid {name}: Expected one of ({type_names}), got {type(value).__name__}"
+        )
+
+    if origin is list or origin is list:
+        if not isinstance(value, list):
+            raise TypeError(
+                f"Invalid {name}: Expected list, got {type(value).__name__}"
+            )
+
+        if args:
+            element_type = args[0]
+            for idx, item in enumerate(value):
+                legacy_validate_type(item, element_type, name=f"{name}[{idx}]")
+        return True
+
+    if origin is tuple or origin is tuple:
+        if not isinstance(value, tuple):
+            raise TypeError(
+                f"Invalid {name}: Expected tuple, got {type(value).__name__}"
+            )
+
+        if args:
+            if len(args) == 2 and args[1] is Ellipsis:
+                element_type = args[0]
+                for idx, item in enumerate(value):
+                    legacy_validate_type(item, element_type, name=f"{name}[{idx}]")
+                return True
+
+            if len(args) != len(value):
+                raise TypeError(
+                    f"Length mismatch in {name}: Expected {len(args)} elements, "
+                    f"got {len(value)}"
+                )
+            for idx, (item, typ) in enumerate(zip(value, args)):
+                legacy_validate_type(item, typ, name=f"{name}[{idx}]")
+            return True
+
+        return True
+
+    if isinstance(current_type, list):
+        if not any(isinstance(value, t) for t in current_type):
+            type_names = ", ".join(t.__name__ for t in current_type)
+            raise TypeError(
+                f"Invalid {name}: Expected one of ({type_names}), got {type(value).__name__}"
+            )
+        return True
+
+    if isinstance(current_type, tuple):
+        if not isinstance(value, tuple):
+            raise TypeError(
+                f"Invalid {name}: Expected tuple, got {type(value).__name__}"
+            )
+        if len(current_type) != len(value):
+            raise TypeError(
+                f"Length mismatch in {name}: Expected {len(current_type)} elements, "
+                f"got {len(value)}"
+            )
+        for idx, (item, typ) in enumerate(zip(value, current_type)):
+            legacy_validate_type(item, typ, name=f"{name}[{idx}]")
+        return True
+
+    if not isinstance(current_type, type):
+        raise TypeError(
+            f"Invalid type hint: Could not resolve expected type {expected_type} for {name}"
+        )
+
+    if not isinstance(value, current_type):
+        raise TypeError(
+            f"Invalid {name}: Expected type {current_type.__name__}, "
+            f"got {type(value).__name__}"
+        )
+
+    return True
+
+
+def per_call_hints(func):
+    """The validation wrapper as it was before validators were compiled."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        annotations = typing.get_type_hints(func)
+        for arg_name, arg_value in kwargs.items():
+            expected_type = annotations.get(arg_name)
+            if expected_type:
+                legacy_validate_type(arg_value, expected_type, name=arg_name)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def get_view(self, id: int) -> dict[str, Any] | None:
+    return None
+
+
+def set_view_geometry(
+    self, view_id: int, geometry: tuple[int, int, int, int], animate: bool = False
+) -> None:
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    cases = {
+        "get_view(1)": (get_view, (None, 1), {}),
+        "get_view(id=1)": (get_view, (None,), {"id": 1}),
+        "set_view_geometry(kw)": (
+            set_view_geometry,
+            (None,),
+            {"view_id": 1, "geometry": (0, 0, 640, 480), "animate": True},
+        ),
+    }
+    print(f"{'call':<24}{'plain':>12}{'per-call':>12}{'compiled':>12}  (ns/call)")
+    for label, (func, call_args, call_kwargs) in cases.items():
+        row = []
+        for wrapped in (func, per_call_hints(func), type_checked(func)):
+            seconds = timeit.timeit(
+                lambda: wrapped(*call_args, **call_kwargs), number=args.number
+            )
+            row.append(seconds / args.number * 1e9)
+        print(f"{label:<24}" + "".join(f"{ns:>12.0f}" for ns in row))
+
+
+if __name__ == "__main__":
+    main()
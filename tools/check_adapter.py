@@ -0,0 +1,126 @@
+"""
+Conformance check for the compositor adapters in src/ipc/adapter.py.
+
+Each fixture in tools/fixtures/<compositor>_events.jsonl holds a raw event as
+the compositor sends it and the internal events it must translate to:
+
+  {"name": ..., "type": <sway event type>, "raw": {...}, "expected": [...]}
+
+Sway "raw" payloads are complete event bodies in the form sway 1.9 sends
+them, one line of
+
+  swaymsg -r -m -t subscribe '["window", "workspace", "output", "mode",
+      "barconfig_update", "binding", "shutdown", "tick", "bar_state_update",
+      "input"]'
+
+each, with full container and workspace nodes rather than the handful of
+fields the adapter reads. When the Sway IPC changes, replace them with lines
+captured that way and update "expected" to match.
+
+Every raw event is framed exactly as on the wire, decoded by the event
+reader's parser and translated by the adapter, so the frame type tagging and
+the translation table are checked together. The check also fails when a
+Sway (type, change) pair in SWAY_EVENT_TABLE has no fixture.
+
+Run from the project root: python3 tools/check_adapter.py
+"""
+
+import argparse
+import os
+import sys
+
+import orjson as json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ipc.adapter import (  # noqa: E402
+    SWAY_EVENT_BIT,
+    SWAY_EVENT_TABLE,
+    SWAY_EVENT_TYPES,
+    get_adapter,
+)
+from src.ipc.reader import (  # noqa: E402
+    SWAY_HEADER,
+    SWAY_MAGIC,
+    WAYFIRE_HEADER,
+    CompositorEventReader,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+SWAY_TYPE_CODES = {name: code for code, name in SWAY_EVENT_TYPES.items()}
+
+
+def load(compositor):
+    path = os.path.join(FIXTURES, f"{compositor}_events.jsonl")
+    with open(path, "rb") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def frame(compositor, fixture):
+    body = json.dumps(fixture["raw"])
+    if compositor == "wayfire":
+        return len(body).to_bytes(WAYFIRE_HEADER, "little") + body
+    code = SWAY_TYPE_CODES[fixture["type"]] | SWAY_EVENT_BIT
+    return SWAY_HEADER.pack(SWAY_MAGIC, len(body), code) + body
+
+
+def decode(compositor, data):
+    buffer = bytearray(data)
+    if compositor == "wayfire":
+        return CompositorEventReader._parse_wayfire(buffer)
+    return CompositorEventReader._parse_sway(buffer)
+
+
+def check(compositor, verbose=False):
+    """Run the fixtures of one compositor and return the number of failures."""
+    adapter = get_adapter(compositor)
+    fixtures = load(compositor)
+    failures = 0
+    covered = set()
+    for fixture in fixtures:
+        data = frame(compositor, fixture)
+        events, consumed = decode(compositor, data)
+        got = adapter.translate_batch(events)
+        if consumed != len(data) or got != fixture["expected"]:
+            failures += 1
+            print(f"FAIL {compositor}: {fixture['name']}")
+            print(f"  expected: {fixture['expected']}")
+            print(f"  got:      {got}")
+        elif verbose:
+            print(f"ok   {compositor}: {fixture['name']}")
+        if compositor == "sway":
+            change = fixture["raw"].get("change")
+            if (fixture["type"], None) in SWAY_EVENT_TABLE:
+                change = None
+            covered.add((fixture["type"], change))
+
+    # the whole stream in a single read must give the same result
+    data = b"".join(frame(compositor, f) for f in fixtures)
+    events, _ = decode(compositor, data)
+    expected = [e for f in fixtures for e in f["expected"]]
+    if adapter.translate_batch(events) != expected:
+        failures += 1
+        print(f"FAIL {compositor}: batched stream differs from single events")
+
+    if compositor == "sway":
+        for key in sorted(set(SWAY_EVENT_TABLE) - covered, key=str):
+            failures += 1
+            print(f"FAIL sway: no fixture for {key}")
+
+    print(f"{compositor}: {len(fixtures)} fixtures, {failures} failures")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "compositors", nargs="*", default=["wayfire", "sway"], metavar="compositor"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    failures = sum(check(c, args.verbose) for c in args.compositors)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
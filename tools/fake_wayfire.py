@@ -0,0 +1,402 @@
+"""
+Fake Wayfire IPC server for headless load testing.
+
+Speaks the Wayfire IPC protocol (4-byte little-endian length followed by a
+JSON body) on a unix socket and answers from an in-memory model of outputs,
+workspaces and views. Point WAYFIRE_SOCKET at it to run the IPC wrapper,
+EventServer, event_manager or the taskbar without a compositor or GPU.
+
+Run from the project root, e.g.:
+
+    python3 tools/fake_wayfire.py --views 2000 --title-storm 20000 --rate 5000
+
+It can also be driven from Python:
+
+    fake = FakeWayfire()
+    await fake.start("/tmp/fake-wayfire.sock")
+    fake.spawn_views(1000)
+    await fake.title_storm(count=10000, rate=0)
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import time
+from typing import Any
+
+import orjson
+
+HEADER = 4
+
+
+def frame(payload: Any) -> bytes:
+    body = orjson.dumps(payload)
+    return len(body).to_bytes(HEADER, "little") + body
+
+
+class FakeWayfire:
+    """
+    In-memory compositor model served over the Wayfire IPC protocol.
+
+    Mutating methods (spawn_view, close_view, focus_view, set_title,
+    switch_workspace, ...) update the model and emit the same events Wayfire
+    would to every connection that sent window-rules/events/watch.
+    """
+
+    def __init__(self, outputs: int = 1, grid: tuple[int, int] = (3, 3)):
+        """
+        Args:
+            outputs: Number of outputs to create, side by side.
+            grid: Workspace grid (columns, rows) of each output.
+        """
+        self._ids = itertools.count(1)
+        self.outputs: dict[int, dict[str, Any]] = {}
+        self.views: dict[int, dict[str, Any]] = {}
+        self.options: dict[str, Any] = {}
+        self.focused_view_id: int | None = None
+        self.focused_output_id: int | None = None
+        self.watchers: dict[asyncio.StreamWriter, frozenset | None] = {}
+        # every accepted connection, watching or not
+        self.connections: set[asyncio.StreamWriter] = set()
+        self.requests = 0
+        self.events = 0
+        self._server: asyncio.AbstractServer | None = None
+        self.path: str | None = None
+        for index in range(outputs):
+            self.add_output(f"FAKE-{index + 1}", grid=grid)
+
+    # -- model ------------------------------------------------------------
+
+    def add_output(
+        self, name: str, width: int = 1920, height: int = 1080, grid=(3, 3)
+    ) -> dict[str, Any]:
+        """Add an output placed right of the existing ones."""
+        output_id = next(self._ids)
+        x = sum(o["geometry"]["width"] for o in self.outputs.values())
+        output = {
+            "id": output_id,
+            "name": name,
+            "geometry": {"x": x, "y": 0, "width": width, "height": height},
+            "workarea": {"x": x, "y": 0, "width": width, "height": height},
+            "wset-index": output_id,
+            "workspace": {
+                "x": 0,
+                "y": 0,
+                "grid_width": grid[0],
+                "grid_height": grid[1],
+            },
+        }
+        self.outputs[output_id] = output
+        if self.focused_output_id is None:
+            self.focused_output_id = output_id
+        self.emit({"event": "output-added", "output": output})
+        return output
+
+    def spawn_view(
+        self,
+        app_id: str = "fake-app",
+        title: str | None = None,
+        output_id: int | None = None,
+        focus: bool = True,
+    ) -> dict[str, Any]:
+        """Map a new toplevel view on the given (default: focused) output."""
+        view_id = next(self._ids)
+        output = self.outputs[output_id or self.focused_output_id]  # pyright: ignore
+        size = output["geometry"]
+        view = {
+            "id": view_id,
+            "pid": 10000 + view_id,
+            "title": title if title is not None else f"{app_id} {view_id}",
+            "app-id": app_id,
+            "role": "toplevel",
+            "type": "toplevel",
+            "mapped": True,
+            "focusable": True,
+            "activated": False,
+            "minimized": False,
+            "fullscreen": False,
+            "sticky": False,
+            "tiled-edges": 0,
+            "layer": "workspace",
+            "output-id": output["id"],
+            "output-name": output["name"],
+            "wset-index": output["wset-index"],
+            "last-focus-timestamp": 0,
+            "geometry": {
+                "x": random.randrange(0, max(1, size["width"] - 640)),
+                "y": random.randrange(0, max(1, size["height"] - 480)),
+                "width": 640,
+                "height": 480,
+            },
+            "bbox": {},
+        }
+        view["bbox"] = dict(view["geometry"])
+        self.views[view_id] = view
+        self.emit({"event": "view-mapped", "view": view})
+        if focus:
+            self.focus_view(view_id)
+        return view
+
+    def spawn_views(self, count: int, app_ids: int = 20) -> list[dict[str, Any]]:
+        """Map count views spread over app_ids distinct app-ids."""
+        return [
+            self.spawn_view(f"fake-app-{i % app_ids}", focus=False)
+            for i in range(count)
+        ]
+
+    def close_view(self, view_id: int) -> None:
+        view = self.views.pop(view_id, None)
+        if view is None:
+            return
+        view["mapped"] = False
+        self.emit({"event": "view-unmapped", "view": view})
+        if self.focused_view_id == view_id:
+            self.focused_view_id = None
+            if self.views:
+                self.focus_view(next(reversed(self.views)))
+
+    def focus_view(self, view_id: int) -> None:
+        previous = self.views.get(self.focused_view_id)  # pyright: ignore
+        if previous is not None:
+            previous["activated"] = False
+        view = self.views[view_id]
+        view["activated"] = True
+        view["last-focus-timestamp"] = time.monotonic_ns()
+        self.focused_view_id = view_id
+        self.emit({"event": "view-focused", "view": view})
+
+    def set_title(self, view_id: int, title: str) -> None:
+        view = self.views[view_id]
+        view["title"] = title
+        self.emit({"event": "view-title-changed", "view": view})
+
+    def set_minimized(self, view_id: int, state: bool) -> None:
+        view = self.views[view_id]
+        view["minimized"] = state
+        self.emit({"event": "view-minimized", "view": view})
+
+    def switch_workspace(self, output_id: int, x: int, y: int) -> None:
+        output = self.outputs[output_id]
+        previous = {"x": output["workspace"]["x"], "y": output["workspace"]["y"]}
+        output["workspace"]["x"] = x
+        output["workspace"]["y"] = y
+        self.emit(
+            {
+                "event": "wset-workspace-changed",
+                "previous-workspace": previous,
+                "new-workspace": {"x": x, "y": y},
+                "output": output_id,
+                "wset": output["wset-index"],
+                "output-data": output,
+            }
+        )
+
+    async def title_storm(
+        self, count: int, rate: float = 0, view_ids: list[int] | None = None
+    ) -> float:
+        """
+        Emit count view-title-changed events round-robin over view_ids.
+
+        Args:
+            count: Number of title changes.
+            rate: Events per second; 0 emits as fast as possible.
+            view_ids: Views to retitle; all views when omitted.
+
+        Returns:
+            float: Seconds it took to emit the storm.
+        """
+        ids = view_ids or list(self.views)
+        if not ids:
+            return 0.0
+        start = time.monotonic()
+        for n in range(count):
+            view_id = ids[n % len(ids)]
+            if view_id in self.views:
+                self.set_title(view_id, f"title {n}")
+            if rate > 0:
+                delay = start + (n + 1) / rate - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif n % 256 == 255:
+                await self.drain()
+        await self.drain()
+        return time.monotonic() - start
+
+    # -- protocol ---------------------------------------------------------
+
+    def emit(self, event: dict[str, Any]) -> None:
+        """Send an event to every watching connection."""
+        self.events += 1
+        payload = None
+        for writer, wanted in list(self.watchers.items()):
+            if wanted is not None and event["event"] not in wanted:
+                continue
+            if payload is None:
+                payload = frame(event)
+            if writer.is_closing():
+                self.watchers.pop(writer, None)
+                continue
+            writer.write(payload)
+
+    async def drain(self) -> None:
+        """Wait until every watcher has accepted the queued events."""
+        for writer in list(self.watchers):
+            try:
+                await writer.drain()
+            except (ConnectionResetError, BrokenPipeError):
+                self.watchers.pop(writer, None)
+
+    def handle_request(
+        self, writer: asyncio.StreamWriter, method: str, data: dict[str, Any]
+    ) -> Any:
+        """Answer one request the way Wayfire's IPC plugins do."""
+        self.requests += 1
+        if method == "window-rules/events/watch":
+            events = data.get("events")
+            self.watchers[writer] = frozenset(events) if events else None
+            return {"result": "ok"}
+        if method == "window-rules/list-views":
+            return list(self.views.values())
+        if method == "window-rules/view-info":
+            view = self.views.get(data.get("id"))  # pyright: ignore
+            if view is None:
+                return {"error": "no such view"}
+            return {"result": "ok", "info": view}
+        if method == "window-rules/get-focused-view":
+            view = self.views.get(self.focused_view_id)  # pyright: ignore
+            return {"result": "ok", "info": view}
+        if method == "window-rules/list-outputs":
+            return list(self.outputs.values())
+        if method == "window-rules/output-info":
+            output = self.outputs.get(data.get("id"))  # pyright: ignore
+            return output if output is not None else {"error": "output not found"}
+        if method == "window-rules/get-focused-output":
+            output = self.outputs.get(self.focused_output_id)  # pyright: ignore
+            return {"result": "ok", "info": output}
+        if method == "window-rules/focus-view":
+            if data.get("id") not in self.views:
+                return {"error": "no such view"}
+            self.focus_view(data["id"])
+            return {"result": "ok"}
+        if method == "wm-actions/set-minimized":
+            if data.get("view_id") not in self.views:
+                return {"error": "no such view"}
+            self.set_minimized(data["view_id"], bool(data.get("state")))
+            return {"result": "ok"}
+        if method == "window-rules/close-view":
+            if data.get("id") not in self.views:
+                return {"error": "no such view"}
+            self.close_view(data["id"])
+            return {"result": "ok"}
+        if method == "wayfire/get-config-option":
+            option = data.get("option")
+            if option not in self.options:
+                return {"error": "option not found"}
+            return {"result": "ok", "value": self.options[option]}
+        if method == "wayfire/set-config-options":
+            self.options.update(data)
+            return {"result": "ok"}
+        if method == "wayfire/configuration":
+            return {"api-version": 1, "plugin-path": "", "plugin-xml-dir": ""}
+        return {"error": "No such method found!"}
+
+    async def _handle_connection(self, reader, writer) -> None:
+        self.connections.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(HEADER)
+                body = await reader.readexactly(int.from_bytes(header, "little"))
+                message = orjson.loads(body)
+                reply = self.handle_request(
+                    writer, message.get("method", ""), message.get("data") or {}
+                )
+                writer.write(frame(reply))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError, BrokenPipeError):
+            pass
+        except asyncio.CancelledError:
+            # server shutdown
+            pass
+        finally:
+            self.watchers.pop(writer, None)
+            self.connections.discard(writer)
+            writer.close()
+
+    async def start(self, path: str) -> None:
+        """Listen on path, replacing a stale socket file."""
+        if os.path.exists(path):
+            os.remove(path)
+        self.path = path
+        self._server = await asyncio.start_unix_server(self._handle_connection, path)
+
+    async def stop(self) -> None:
+        """
+        Stop listening and drop every client, as a compositor exit would, so
+        a later start() on the same path looks like a restart to clients.
+        """
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self.connections):
+            writer.close()
+        self.connections.clear()
+        self.watchers.clear()
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+async def _run(args) -> None:
+    fake = FakeWayfire(outputs=args.outputs)
+    await fake.start(args.socket)
+    print(f"export WAYFIRE_SOCKET={args.socket}", flush=True)
+    fake.spawn_views(args.views, app_ids=args.app_ids)
+    if args.wait_for_watcher:
+        while not fake.watchers:
+            await asyncio.sleep(0.05)
+    if args.title_storm:
+        elapsed = await fake.title_storm(args.title_storm, rate=args.rate)
+        print(
+            f"title storm: {args.title_storm} events in {elapsed:.3f}s "
+            f"to {len(fake.watchers)} watcher(s)",
+            flush=True,
+        )
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await fake.stop()
+
+
+def main():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", "/tmp")
+    parser = argparse.ArgumentParser(description="Fake Wayfire IPC server")
+    parser.add_argument(
+        "--socket", default=os.path.join(runtime_dir, "fake-wayfire.sock")
+    )
+    parser.add_argument("--outputs", type=int, default=1)
+    parser.add_argument("--views", type=int, default=0, help="views to spawn")
+    parser.add_argument("--app-ids", type=int, default=20)
+    parser.add_argument(
+        "--title-storm", type=int, default=0, help="title changes to emit"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=0, help="storm events per second, 0 = max"
+    )
+    parser.add_argument(
+        "--wait-for-watcher",
+        action="store_true",
+        help="start the storm only once a client watches events",
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()